@@ -0,0 +1,106 @@
+import numpy as np
+from config import Config
+
+# Timetable analytics computed once per published version and stored with
+# it in generations.analytics. Entries are scattered into class-count
+# tensors of shape (faculty or room) x day x slot, and every figure is a
+# reduction over one of their axes. Utilisation values are fractions.
+
+PEAK_POSITIONS = 3
+
+def _index(keys, ids):
+    """Row of each key in ids, -1 for keys not in ids"""
+    positions = {key: i for i, key in enumerate(ids)}
+    return np.fromiter((positions.get(key, -1) for key in keys), dtype=np.intp, count=len(keys))
+
+def _tensor(rows, day_idx, slot_idx, size):
+    """Classes per (entity, day, slot); entries with row -1 are left out"""
+    tensor = np.zeros((size, len(Config.DAYS), len(Config.TIME_SLOTS)), dtype=np.int32)
+    known = rows >= 0
+    np.add.at(tensor, (rows[known], day_idx[known], slot_idx[known]), 1)
+    return tensor
+
+def _idle_gaps(busy):
+    """Free slots between the first and last class of each (entity, day)"""
+    num_slots = busy.shape[-1]
+    first = busy.argmax(axis=-1)
+    last = num_slots - 1 - busy[..., ::-1].argmax(axis=-1)
+    return np.where(busy.any(axis=-1), last - first + 1 - busy.sum(axis=-1), 0)
+
+def _double_bookings(tensor):
+    return int(np.maximum(tensor - 1, 0).sum())
+
+def build(timetable, courses, faculty, rooms):
+    """Analytics of a list of timetable entries (faculty_id, room_id, day, slot)"""
+    days, slots = Config.DAYS, Config.TIME_SLOTS
+    num_positions = len(days) * len(slots)
+    day_index = {day: i for i, day in enumerate(days)}
+    slot_index = {slot: i for i, slot in enumerate(slots)}
+
+    entries = [e for e in timetable if e['day'] in day_index and e['slot'] in slot_index]
+    day_idx = np.fromiter((day_index[e['day']] for e in entries), dtype=np.intp, count=len(entries))
+    slot_idx = np.fromiter((slot_index[e['slot']] for e in entries), dtype=np.intp, count=len(entries))
+    faculty_classes = _tensor(_index([e['faculty_id'] for e in entries], [f['id'] for f in faculty]),
+                              day_idx, slot_idx, len(faculty))
+    room_classes = _tensor(_index([e['room_id'] for e in entries], [r['id'] for r in rooms]),
+                           day_idx, slot_idx, len(rooms))
+    faculty_busy = faculty_classes > 0
+    room_busy = room_classes > 0
+
+    faculty_hours = faculty_classes.sum(axis=(1, 2))
+    max_hours = np.array([f.get('max_hours', 20) for f in faculty], dtype=np.int32)
+    idle_gaps = _idle_gaps(faculty_busy).sum(axis=1)
+    busiest_day = faculty_classes.sum(axis=2).argmax(axis=1)
+    room_hours = room_classes.sum(axis=(1, 2))
+
+    # Share of rooms in use per (day, slot), and of all room slots per day
+    rooms_busy = room_busy.sum(axis=0)
+    congestion = rooms_busy / max(len(rooms), 1)
+    day_classes = room_classes.sum(axis=(0, 2))
+    day_utilization = room_busy.sum(axis=(0, 2)) / max(len(rooms) * len(slots), 1)
+
+    peak = np.argsort(-rooms_busy, axis=None, kind='stable')[:PEAK_POSITIONS]
+    faculty_teaching = faculty_busy.sum(axis=0)
+
+    return {
+        'totals': {
+            'classes': len(timetable),
+            'courses': len(courses),
+            'faculty': len(faculty),
+            'rooms': len(rooms),
+            'room_utilization': float(room_busy.sum() / max(len(rooms) * num_positions, 1)),
+            'idle_gaps': int(idle_gaps.sum()),
+            'overloaded_faculty': int((faculty_hours > max_hours).sum()),
+            'faculty_double_bookings': _double_bookings(faculty_classes),
+            'room_double_bookings': _double_bookings(room_classes),
+        },
+        'faculty': [
+            {'id': f['id'], 'name': f['name'], 'hours': int(faculty_hours[i]), 'max_hours': int(max_hours[i]),
+             'load': float(faculty_hours[i] / max_hours[i]) if max_hours[i] else None,
+             'idle_gaps': int(idle_gaps[i]),
+             'busiest_day': days[busiest_day[i]] if faculty_hours[i] else None}
+            for i, f in enumerate(faculty)
+        ],
+        'rooms': [
+            {'id': r['id'], 'name': r['name'], 'hours': int(room_hours[i]),
+             'utilization': float(room_busy[i].sum() / num_positions)}
+            for i, r in enumerate(rooms)
+        ],
+        'days': [
+            {'day': day, 'classes': int(day_classes[d]), 'room_utilization': float(day_utilization[d])}
+            for d, day in enumerate(days)
+        ],
+        'peak_slots': [
+            {'day': days[position // len(slots)], 'slot': slots[position % len(slots)],
+             'rooms_busy': int(rooms_busy.flat[position]), 'room_utilization': float(congestion.flat[position]),
+             'faculty_teaching': int(faculty_teaching.flat[position])}
+            for position in peak.tolist()
+        ],
+    }
+
+def workload(analytics):
+    """faculty_workload and room_usage statistics (classes per id, used ids only)"""
+    return {
+        'faculty_workload': {f['id']: f['hours'] for f in analytics['faculty'] if f['hours']},
+        'room_usage': {r['id']: r['hours'] for r in analytics['rooms'] if r['hours']},
+    }
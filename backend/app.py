@@ -4,17 +4,25 @@ from flask_jwt_extended import JWTManager
 from config import Config
 from routes import register_routes
 
-app = Flask(__name__)
-app.config.from_object(Config)
+jwt = JWTManager()
 
-CORS(app)
-jwt = JWTManager(app)
+def create_app(config=Config):
+    """Build the API app. The solver and exporters load on first use, not here."""
+    app = Flask(__name__)
+    app.config.from_object(config)
 
-register_routes(app)
+    CORS(app)
+    jwt.init_app(app)
 
-@app.route('/')
-def index():
-    return {'message': 'AI Timetable Generation API - NEP 2020', 'status': 'running'}
+    register_routes(app)
+
+    @app.route('/')
+    def index():
+        return {'message': 'AI Timetable Generation API - NEP 2020', 'status': 'running'}
+
+    return app
+
+app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
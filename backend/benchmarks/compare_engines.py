@@ -0,0 +1,56 @@
+"""Compare scheduler engines on the same input.
+
+Run from backend/:  python -m benchmarks.compare_engines [--max-time 60] [--generate 400x80x120]
+Uses the courses, faculty and rooms currently in the database, or a
+synthetic institution of the given COURSESxFACULTYxROOMS size.
+"""
+import argparse
+import json
+import time
+from models import Database, Course, Faculty, Room
+from engines import ENGINES
+from benchmarks.workload import generate_institution
+from benchmarks.scheduler_bench import parse_size
+
+def run_engine(engine, courses, faculty, rooms, solver_params):
+    scheduler = ENGINES[engine](courses, faculty, rooms, solver_params)
+    started = time.perf_counter()
+    scheduler.build_model()
+    built = time.perf_counter()
+    timetable = scheduler.solve()
+    solved = time.perf_counter()
+    return {
+        'engine': engine,
+        'status': scheduler.status_name(),
+        'variables': len(scheduler.model.Proto().variables),
+        'constraints': len(scheduler.model.Proto().constraints),
+        'build_time': built - started,
+        'solve_time': scheduler.timings.get('solve', solved - built),
+        'extract_time': scheduler.timings.get('extract'),
+        'objective_value': scheduler.objective_value() if timetable else None,
+        'classes': len(timetable) if timetable else 0
+    }
+
+def compare(courses, faculty, rooms, solver_params=None, engines=None):
+    return [run_engine(engine, courses, faculty, rooms, solver_params) for engine in engines or ENGINES]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-time', type=float, default=60)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--generate', help='synthetic COURSESxFACULTYxROOMS instead of the database')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.generate:
+        courses, faculty, rooms = generate_institution(*parse_size(args.generate), seed=args.seed)
+    else:
+        db = Database()
+        courses, faculty, rooms = Course.get_all(db), Faculty.get_all(db), Room.get_all(db)
+        db.close()
+
+    solver_params = {'max_time_seconds': args.max_time, 'num_workers': args.workers}
+    print(json.dumps(compare(courses, faculty, rooms, solver_params), indent=2))
+
+if __name__ == '__main__':
+    main()
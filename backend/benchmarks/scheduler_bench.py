@@ -0,0 +1,96 @@
+"""Scheduler benchmark over synthetic institutions of increasing size.
+
+Run from backend/:
+    python -m benchmarks.scheduler_bench --output benchmarks/results.json
+    python -m benchmarks.scheduler_bench --sizes 50x10x10,400x80x120 --engines grid,interval
+
+Each (size, engine) run happens in a fresh process so peak RSS is per run.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import time
+from benchmarks.workload import generate_institution
+from engines import ENGINES
+
+DEFAULT_SIZES = ['20x5x5', '50x12x10', '100x25x20', '200x50x40', '400x80x120']
+
+def parse_size(size):
+    """'COURSESxFACULTYxROOMS' -> (courses, faculty, rooms)"""
+    courses, faculty, rooms = (int(part) for part in size.lower().split('x'))
+    return courses, faculty, rooms
+
+def _run(queue, engine, size, density, seed, solver_params):
+    courses, faculty, rooms = generate_institution(*parse_size(size), availability_density=density, seed=seed)
+    scheduler = ENGINES[engine](courses, faculty, rooms, solver_params)
+
+    started = time.perf_counter()
+    scheduler.build_model()
+    build_time = time.perf_counter() - started
+    timetable = scheduler.solve()
+
+    queue.put({
+        'size': size,
+        'engine': engine,
+        'availability_density': density,
+        'seed': seed,
+        'status': scheduler.status_name(),
+        'classes': len(timetable) if timetable else 0,
+        'variables': len(scheduler.model.Proto().variables),
+        'constraints': len(scheduler.model.Proto().constraints),
+        'build_time': build_time,
+        'solve_time': scheduler.timings.get('solve'),
+        'extract_time': scheduler.timings.get('extract'),
+        'objective_value': scheduler.objective_value() if timetable else None,
+        'best_bound': scheduler.best_bound() if timetable else None,
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    })
+
+def run_benchmark(sizes, engines, density=0.8, seed=0, solver_params=None):
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size in sizes:
+        for engine in engines:
+            queue = context.Queue()
+            process = context.Process(target=_run, args=(queue, engine, size, density, seed, solver_params))
+            process.start()
+            process.join()
+            if queue.empty():
+                print(f"{size:>14} {engine:>9} crashed (exit code {process.exitcode})")
+                results.append({'size': size, 'engine': engine, 'status': 'CRASHED'})
+                continue
+            result = queue.get()
+            print(f"{size:>14} {engine:>9} {result['status']:>10} build={result['build_time']:.3f}s "
+                  f"solve={result['solve_time'] or 0:.3f}s rss={result['peak_rss_kb'] // 1024}MiB")
+            results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES),
+                        help='comma-separated COURSESxFACULTYxROOMS')
+    parser.add_argument('--engines', default='grid', help=f"comma-separated, from: {', '.join(ENGINES)}")
+    parser.add_argument('--density', type=float, default=0.8, help='faculty availability density')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-time', type=float, default=60)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--output', default='benchmarks/results.json')
+    args = parser.parse_args()
+
+    solver_params = {'max_time_seconds': args.max_time, 'num_workers': args.workers, 'random_seed': args.seed}
+    results = run_benchmark(args.sizes.split(','), args.engines.split(','), args.density, args.seed, solver_params)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'solver_params': solver_params,
+            'results': results
+        }, f, indent=2)
+    print(f'Wrote {len(results)} results to {args.output}')
+
+if __name__ == '__main__':
+    main()
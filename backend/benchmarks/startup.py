@@ -0,0 +1,101 @@
+"""API worker startup benchmark: import time, first request and RSS.
+
+Run from backend/:
+    python -m benchmarks.startup --output benchmarks/startup.json
+    python -m benchmarks.startup --runs 10 --stages app,solver,export
+
+Each run happens in a fresh process. Stages are cumulative: 'app' imports
+app.py (create_app and every blueprint) and serves GET /, 'solver' then
+imports the engines and NumPy analytics as the first solve does, 'export'
+the PDF and Excel libraries as the first export does. The 'heavy_modules'
+column shows which of OR-Tools, NumPy, ReportLab and openpyxl a stage left
+loaded.
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+
+STAGES = {
+    'app': ['app'],
+    'solver': ['engines', 'decomposition', 'conflicts', 'analytics'],
+    'export': ['reportlab.platypus', 'openpyxl'],
+}
+HEAVY_MODULES = ('ortools', 'numpy', 'reportlab', 'openpyxl')
+
+def _run(queue, stages):
+    result = {}
+    for stage in stages:
+        started = time.perf_counter()
+        for module in STAGES[stage]:
+            importlib.import_module(module)
+        if stage == 'app':
+            response = sys.modules['app'].app.test_client().get('/')
+            assert response.status_code == 200
+        result[stage] = {
+            'seconds': time.perf_counter() - started,
+            # ru_maxrss is in KiB on Linux
+            'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules]
+        }
+    queue.put(result)
+
+def run_benchmark(stages, runs):
+    context = multiprocessing.get_context('spawn')
+    samples = []
+    for run in range(runs):
+        queue = context.Queue()
+        process = context.Process(target=_run, args=(queue, stages))
+        process.start()
+        process.join()
+        if queue.empty():
+            print(f"run {run} crashed (exit code {process.exitcode})")
+            continue
+        samples.append(queue.get())
+
+    results = []
+    for stage in stages:
+        seconds = [sample[stage]['seconds'] for sample in samples]
+        if not seconds:
+            break
+        result = {
+            'stage': stage,
+            'runs': len(seconds),
+            'median_seconds': statistics.median(seconds),
+            'max_seconds': max(seconds),
+            'peak_rss_kb': max(sample[stage]['peak_rss_kb'] for sample in samples),
+            'heavy_modules': samples[-1][stage]['heavy_modules']
+        }
+        print(f"{stage:>8} median={result['median_seconds']:.3f}s max={result['max_seconds']:.3f}s "
+              f"rss={result['peak_rss_kb'] // 1024}MiB heavy={','.join(result['heavy_modules']) or '-'}")
+        results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"comma-separated, from: {', '.join(STAGES)}")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', default='benchmarks/startup.json')
+    args = parser.parse_args()
+
+    stages = args.stages.split(',')
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage: {unknown[0]}")
+    results = run_benchmark(stages, args.runs)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results
+        }, f, indent=2)
+    print(f'Wrote {len(results)} results to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Seeded synthetic institutions for scheduler benchmarks.
+
+Rows have the same shape as Course.get_all / Faculty.get_all / Room.get_all.
+"""
+import json
+import random
+from config import Config
+
+ROOM_TYPES = ['Classroom', 'Lab', 'Auditorium']
+COURSE_TYPES = ['Major', 'Minor', 'Multidisciplinary', 'Ability Enhancement',
+                'Skill Enhancement', 'Value-added']
+
+def generate_institution(num_courses, num_faculty, num_rooms, availability_density=0.8,
+                         lab_fraction=0.2, auditorium_fraction=0.05, seed=0):
+    """Return (courses, faculty, rooms) for a synthetic institution.
+
+    availability_density is the share of (day, slot) pairs each faculty member
+    is available for; lab_fraction and auditorium_fraction set both the room
+    mix and the share of courses that need such a room.
+    """
+    rng = random.Random(seed)
+
+    rooms = []
+    for r_id in range(1, num_rooms + 1):
+        roll = rng.random()
+        if roll < auditorium_fraction:
+            room_type, capacity = 'Auditorium', rng.choice([150, 200, 300])
+        elif roll < auditorium_fraction + lab_fraction:
+            room_type, capacity = 'Lab', rng.choice([30, 40, 60])
+        else:
+            room_type, capacity = 'Classroom', rng.choice([40, 60, 80, 120])
+        rooms.append({'id': r_id, 'name': f'{room_type} {r_id}', 'capacity': capacity, 'type': room_type})
+
+    faculty = []
+    for f_id in range(1, num_faculty + 1):
+        availability = {}
+        for day in Config.DAYS:
+            slots = [slot for slot in Config.TIME_SLOTS if rng.random() < availability_density]
+            availability[day] = True if len(slots) == len(Config.TIME_SLOTS) else slots
+        faculty.append({
+            'id': f_id,
+            'name': f'Faculty {f_id}',
+            'availability': json.dumps(availability),
+            'max_hours': rng.choice([16, 18, 20]),
+            'expertise': ''
+        })
+
+    lab_capacities = [r['capacity'] for r in rooms if r['type'] == 'Lab']
+    auditorium_capacities = [r['capacity'] for r in rooms if r['type'] == 'Auditorium']
+    courses = []
+    for c_id in range(1, num_courses + 1):
+        hours = rng.choice([2, 3, 3, 4])
+        roll = rng.random()
+        if roll < auditorium_fraction and auditorium_capacities:
+            room_type, enrollment, session_length = 'Auditorium', rng.randint(80, max(auditorium_capacities)), 1
+        elif roll < auditorium_fraction + lab_fraction and lab_capacities:
+            room_type, enrollment, session_length = 'Lab', rng.randint(10, max(lab_capacities)), 2
+        else:
+            room_type, enrollment, session_length = None, rng.randint(15, 80), 1
+        courses.append({
+            'id': c_id,
+            'code': f'C{c_id:04d}',
+            'name': f'Course {c_id}',
+            'credits': hours,
+            'type': rng.choice(COURSE_TYPES),
+            # Round-robin keeps faculty loads even
+            'faculty_id': (c_id - 1) % num_faculty + 1 if num_faculty else None,
+            'hours_per_week': hours,
+            'room_type': room_type,
+            'enrollment': enrollment,
+            'session_length': session_length
+        })
+
+    return courses, faculty, rooms
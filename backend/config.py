@@ -9,8 +9,56 @@ class Config:
     # SQLite Configuration (easier for Windows)
     DB_TYPE = 'sqlite'
     DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'timetable.db')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+    DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL')  # OFF, NORMAL, FULL
+    DB_CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE', -20000))  # negative = KiB
+    DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', 256 * 1024 * 1024))
+    DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 5000))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 256))
 
     # Timetable Configuration
     DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
     TIME_SLOTS = ['9:00-10:00', '10:00-11:00', '11:00-12:00', '12:00-1:00',
                   '1:00-2:00', '2:00-3:00', '3:00-4:00', '4:00-5:00']
+
+    # CP-SAT solver defaults (overridable per /generate-timetable request)
+    SOLVER_MAX_TIME_SECONDS = float(os.getenv('SOLVER_MAX_TIME_SECONDS', 60))
+    SOLVER_NUM_WORKERS = int(os.getenv('SOLVER_NUM_WORKERS', 8))
+    SOLVER_RANDOM_SEED = int(os.getenv('SOLVER_RANDOM_SEED', 0))
+    SOLVER_FIRST_FEASIBLE = os.getenv('SOLVER_FIRST_FEASIBLE', 'false').lower() == 'true'
+    # Time budget for finding the conflicting constraints of an infeasible input
+    # (explain_seconds on /generate-timetable overrides it per request)
+    CONFLICT_EXPLAIN_SECONDS = float(os.getenv('CONFLICT_EXPLAIN_SECONDS', 10))
+
+    # Background generation jobs (POST /generate-timetable?async=1)
+    MAX_CONCURRENT_SOLVES = int(os.getenv('MAX_CONCURRENT_SOLVES', 2))
+    MAX_PENDING_JOBS = int(os.getenv('MAX_PENDING_JOBS', 8))
+    JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', 3600))
+    # Progress events kept per job, and how often /jobs/<id>/events checks for new ones
+    JOB_EVENT_HISTORY = int(os.getenv('JOB_EVENT_HISTORY', 200))
+    JOB_EVENT_POLL_SECONDS = float(os.getenv('JOB_EVENT_POLL_SECONDS', 0.25))
+
+    # Parallel solving of independent sub-problems (decompose=1); 0 means one worker per CPU
+    DECOMPOSITION_WORKERS = int(os.getenv('DECOMPOSITION_WORKERS', 0))
+
+    # Rendered export documents kept in memory per timetable version
+    EXPORT_CACHE_MAX_BYTES = int(os.getenv('EXPORT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # Processes rendering per-faculty/per-room bundles; 0 means one per CPU
+    EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', 0))
+
+    # Timetable versions kept for /timetable/diff, including the current one
+    TIMETABLE_HISTORY_VERSIONS = int(os.getenv('TIMETABLE_HISTORY_VERSIONS', 5))
+
+    # Prometheus metrics on /metrics and request timing middleware
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # Largest page a list endpoint returns for ?limit=
+    PAGE_MAX_LIMIT = int(os.getenv('PAGE_MAX_LIMIT', 1000))
+
+    # Serialized GET /timetable, /faculty, /courses and /rooms responses kept in memory
+    READ_CACHE_MAX_ENTRIES = int(os.getenv('READ_CACHE_MAX_ENTRIES', 256))
+
+    # On-disk cache of solved timetables keyed by a hash of the scheduler inputs
+    SOLUTION_CACHE_DIR = os.getenv('SOLUTION_CACHE_DIR', os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'database', 'solution_cache'))
+    SOLUTION_CACHE_MAX_ENTRIES = int(os.getenv('SOLUTION_CACHE_MAX_ENTRIES', 32))
@@ -0,0 +1,123 @@
+import time
+from ortools.sat.python import cp_model
+from config import Config
+from feasibility import hours_per_week
+from scheduler import TimetableScheduler
+
+# Explanations for inputs CP-SAT proved infeasible: solve with one
+# assumption literal per constraint group and shrink the infeasible core
+# the solver reports.
+
+class ConflictExplainer(TimetableScheduler):
+    """Grid model with an assumption literal per constraint group.
+
+    Groups are each course's weekly hours, each faculty member's max_hours
+    and no-double-booking, and each room's no-double-booking; availability
+    and room fit stay in the variable domains as in the grid engine.
+    """
+
+    def build_model(self):
+        self.groups = []  # (literal, description)
+        positions = [(d, s) for d in range(len(self.days)) for s in range(len(self.slots))]
+        course_vars, faculty_vars, faculty_slot, room_slot = {}, {}, {}, {}
+        for course in self.courses:
+            c_id, f_id = course['id'], course['faculty_id']
+            allowed = set(self._allowed_slots(f_id))
+            course_vars[c_id] = []
+            for d_idx, s_idx in positions:
+                if (d_idx, s_idx) not in allowed:
+                    continue
+                for r_id, room in self.rooms.items():
+                    if not self.room_fits(course, room):
+                        continue
+                    var = self.model.NewBoolVar(f'c{c_id}_d{d_idx}_s{s_idx}_r{r_id}')
+                    course_vars[c_id].append(var)
+                    room_slot.setdefault((r_id, d_idx, s_idx), []).append(var)
+                    if f_id in self.faculty:
+                        faculty_vars.setdefault(f_id, []).append(var)
+                        faculty_slot.setdefault((f_id, d_idx, s_idx), []).append(var)
+
+        for course in self.courses:
+            literal = self._group({'type': 'course_hours', 'course_id': course['id'],
+                                   'message': f"{course['code']} needs {hours_per_week(course)} hours per week"})
+            self.model.Add(sum(course_vars[course['id']]) == hours_per_week(course)).OnlyEnforceIf(literal)
+
+        single_booking = {}
+        for f_id, f in self.faculty.items():
+            if f_id not in faculty_vars:
+                continue
+            literal = self._group({'type': 'faculty_max_hours', 'faculty_id': f_id,
+                                   'message': f"{f['name']} teaches at most {f.get('max_hours', 20)} hours"})
+            self.model.Add(sum(faculty_vars[f_id]) <= f.get('max_hours', 20)).OnlyEnforceIf(literal)
+            single_booking[('faculty', f_id)] = self._group({
+                'type': 'faculty_single_booking', 'faculty_id': f_id,
+                'message': f"{f['name']} teaches one class at a time"})
+        for r_id, room in self.rooms.items():
+            single_booking[('room', r_id)] = self._group({
+                'type': 'room_single_booking', 'room_id': r_id,
+                'message': f"{room['name']} holds one class at a time"})
+
+        for kind, slot_vars_by_key in (('faculty', faculty_slot), ('room', room_slot)):
+            for (key, _, _), slot_vars in slot_vars_by_key.items():
+                if len(slot_vars) > 1:
+                    self.model.Add(sum(slot_vars) <= 1).OnlyEnforceIf(single_booking[(kind, key)])
+
+    def _group(self, description):
+        literal = self.model.NewBoolVar(f"assume_{len(self.groups)}")
+        self.groups.append((literal, description))
+        return literal
+
+    def _infeasible_with(self, indices, time_limit):
+        self.model.ClearAssumptions()
+        self.model.AddAssumptions([self.groups[i][0] for i in indices])
+        self.solver.parameters.max_time_in_seconds = time_limit
+        self.status = self.solver.Solve(self.model)
+        return self.status == cp_model.INFEASIBLE
+
+    def _core(self):
+        positions = {literal.Index(): i for i, (literal, _) in enumerate(self.groups)}
+        return [positions[index] for index in self.solver.SufficientAssumptionsForInfeasibility()
+                if index in positions]
+
+    def explain(self, time_limit):
+        """Indices of a small infeasible subset of the groups, or None if none was found"""
+        deadline = time.perf_counter() + time_limit
+        if not self._infeasible_with(range(len(self.groups)), time_limit):
+            return None
+        core = self._core()
+        if not core and self.solver.parameters.num_workers != 1:
+            # A portfolio proof may come from a worker that does not track
+            # assumptions; the single-worker search always reports a core
+            self.solver.parameters.num_workers = 1
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self._infeasible_with(range(len(self.groups)), remaining):
+                return None
+            core = self._core()
+        if not core:
+            return None
+
+        # Deletion pass: drop every group the conflict does not need
+        for i in list(core):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            trial = [j for j in core if j != i]
+            if trial and self._infeasible_with(trial, remaining):
+                core = trial
+        return core
+
+def explain_conflict(courses, faculty, rooms, solver_params=None, time_limit=None):
+    """Conflicting constraint groups of an infeasible input.
+
+    Searches for up to time_limit seconds (default CONFLICT_EXPLAIN_SECONDS)
+    with the request's solver workers. When no conflict is found in time the
+    result is a single {'type': 'unexplained'} entry rather than a guess.
+    """
+    time_limit = time_limit or Config.CONFLICT_EXPLAIN_SECONDS
+    explainer = ConflictExplainer(courses, faculty, rooms, solver_params)
+    explainer.build_model()
+    core = explainer.explain(time_limit)
+    if core is None:
+        return [{'type': 'unexplained',
+                 'message': f'no conflicting constraints found within {time_limit:g} seconds'}]
+    return [explainer.groups[i][1] for i in sorted(core)]
@@ -0,0 +1,202 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from config import Config
+from scheduler import TimetableScheduler, solver_params_from
+from engines import ENGINES
+
+def split_components(courses, faculty, rooms):
+    """Split the input into independent sub-problems.
+
+    Two courses interact when they share a faculty member or can use a common
+    room. Returns a list of (courses, faculty, rooms) tuples, one per connected
+    component; rooms no course can use are dropped.
+    """
+    parent = {c['id']: c['id'] for c in courses}
+
+    def find(c_id):
+        while parent[c_id] != c_id:
+            parent[c_id] = parent[parent[c_id]]
+            c_id = parent[c_id]
+        return c_id
+
+    def union(ids):
+        roots = {find(c_id) for c_id in ids}
+        if len(roots) > 1:
+            root = roots.pop()
+            for other in roots:
+                parent[other] = root
+
+    by_faculty = {}
+    for course in courses:
+        if course['faculty_id'] is not None:
+            by_faculty.setdefault(course['faculty_id'], []).append(course['id'])
+    for course_ids in by_faculty.values():
+        union(course_ids)
+
+    eligible = {}
+    for room in rooms:
+        fitting = [c['id'] for c in courses if TimetableScheduler.room_fits(c, room)]
+        eligible[room['id']] = fitting
+        union(fitting)
+
+    components = {}
+    for course in courses:
+        components.setdefault(find(course['id']), []).append(course)
+
+    faculty_by_id = {f['id']: f for f in faculty}
+    result = []
+    for component_courses in components.values():
+        course_ids = {c['id'] for c in component_courses}
+        faculty_ids = {c['faculty_id'] for c in component_courses}
+        result.append((
+            component_courses,
+            [faculty_by_id[f_id] for f_id in faculty_ids if f_id in faculty_by_id],
+            [r for r in rooms if course_ids.intersection(eligible[r['id']])]
+        ))
+    # Largest first so the longest solves start early
+    result.sort(key=lambda component: len(component[0]), reverse=True)
+    return result
+
+# Set in each worker process by the pool initializer; DecomposedScheduler.stop sets it
+_stop_event = None
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+def _watch_stop(scheduler, done):
+    while not done.is_set():
+        if _stop_event.wait(0.2):
+            scheduler.stop()
+            return
+
+def _solve_component(engine, courses, faculty, rooms, solver_params, previous):
+    """Process pool entry point: solve one component"""
+    started = time.time()
+    scheduler = ENGINES[engine](courses, faculty, rooms, solver_params)
+    if previous is not None:
+        scheduler.set_previous_solution(*previous)
+    scheduler.build_model()
+    built = time.time()
+    done = threading.Event()
+    threading.Thread(target=_watch_stop, args=(scheduler, done), daemon=True).start()
+    try:
+        timetable = scheduler.solve()
+    finally:
+        done.set()
+    solved = time.time()
+    return {
+        'timetable': timetable,
+        'status': scheduler.status_name(),
+        'objective_value': scheduler.objective_value() if timetable else None,
+        'best_bound': scheduler.best_bound() if timetable else None,
+        'courses': len(courses),
+        'faculty': len(faculty),
+        'rooms': len(rooms),
+        'variables': scheduler.num_variables,
+        'pruned_variables': scheduler.pruned_variables,
+        'build_time': built - started,
+        'solve_time': solved - built
+    }
+
+class DecomposedScheduler:
+    """Solves independent components in parallel worker processes.
+
+    Exposes the same build_model / solve / get_statistics interface as
+    TimetableScheduler and merges the component results into one timetable.
+    """
+
+    def __init__(self, courses, faculty, rooms, solver_params=None, engine='grid'):
+        self.engine = engine
+        self.courses = courses
+        self.faculty = faculty
+        self.rooms = rooms
+        self.solver_params = solver_params_from(solver_params)
+        self.previous = None
+        self.components = []
+        self.results = []
+        self.status = None
+        self.wall_time = 0.0
+        self._futures = []
+        self._stop_event = None
+
+    def set_previous_solution(self, entries, changed_course_ids=None, pin_unchanged=False,
+                              minimize_moves=True):
+        self.previous = (entries, changed_course_ids, pin_unchanged, minimize_moves)
+
+    def generate_timetable(self):
+        self.build_model()
+        return self.solve()
+
+    def build_model(self):
+        """Split the input; each worker builds its own component model"""
+        self.components = split_components(self.courses, self.faculty, self.rooms)
+
+    def _component_previous(self, component_courses):
+        if self.previous is None:
+            return None
+        entries, changed_course_ids, pin_unchanged, minimize_moves = self.previous
+        course_ids = {c['id'] for c in component_courses}
+        return ([e for e in entries if e['course_id'] in course_ids], changed_course_ids, pin_unchanged,
+                minimize_moves)
+
+    def _component_params(self, workers):
+        """Solver parameters with the CP-SAT threads split between the worker processes"""
+        threads = self.solver_params['num_workers'] or os.cpu_count() or 1
+        return dict(self.solver_params, num_workers=max(1, threads // workers))
+
+    def solve(self):
+        started = time.time()
+        workers = max(1, min(len(self.components), Config.DECOMPOSITION_WORKERS or os.cpu_count() or 1))
+        context = multiprocessing.get_context('spawn')
+        # Passed at process start: synchronisation primitives cannot be sent with each task
+        self._stop_event = context.Event()
+        component_params = self._component_params(workers)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(self._stop_event,)) as executor:
+            self._futures = [
+                executor.submit(_solve_component, self.engine, courses, faculty, rooms, component_params,
+                                self._component_previous(courses))
+                for courses, faculty, rooms in self.components
+            ]
+            self.results = []
+            for future in self._futures:
+                try:
+                    self.results.append(future.result())
+                except CancelledError:
+                    pass
+        self.wall_time = time.time() - started
+
+        if len(self.results) < len(self.components) or any(r['timetable'] is None for r in self.results):
+            failed = [r['status'] for r in self.results if r['timetable'] is None]
+            self.status = failed[0] if failed else 'UNKNOWN'
+            return None
+
+        self.status = 'OPTIMAL' if all(r['status'] == 'OPTIMAL' for r in self.results) else 'FEASIBLE'
+        return [entry for r in self.results for entry in r['timetable']]
+
+    def status_name(self):
+        return self.status
+
+    def stop(self):
+        """Drop components that have not started and stop the running solves"""
+        for future in self._futures:
+            future.cancel()
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def get_statistics(self, timetable):
+        return {
+            'total_classes': len(timetable),
+            'solver_time': self.wall_time,
+            'solver_status': self.status,
+            'objective_value': sum(r['objective_value'] or 0 for r in self.results),
+            'best_bound': sum(r['best_bound'] or 0 for r in self.results),
+            'solver_params': self.solver_params,
+            'variables': sum(r['variables'] for r in self.results),
+            'pruned_variables': sum(r['pruned_variables'] for r in self.results),
+            'components': [{k: v for k, v in r.items() if k != 'timetable'} for r in self.results]
+        }
@@ -0,0 +1,12 @@
+from scheduler import TimetableScheduler
+from interval_scheduler import IntervalScheduler
+from heuristic import HeuristicScheduler
+
+# Scheduler engines selectable with engine= on /generate-timetable.
+# All share the TimetableScheduler interface and timetable entry format.
+# Keep the keys in step with solver_input.ENGINE_NAMES.
+ENGINES = {
+    'grid': TimetableScheduler,
+    'interval': IntervalScheduler,
+    'heuristic': HeuristicScheduler,
+}
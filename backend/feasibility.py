@@ -0,0 +1,88 @@
+from config import Config
+from solver_input import parse_availability, allowed_positions, room_fits
+
+# Reasons an input cannot be scheduled, found before the solver runs by a
+# counting pass over courses, faculty and rooms. Needs no solver, so the
+# API can answer /timetable/precheck without loading OR-Tools; proven
+# infeasible solves are explained by conflicts.explain_conflict().
+
+def hours_per_week(course):
+    return course.get('hours_per_week', course['credits'])
+
+def precheck(courses, faculty, rooms):
+    """Problems that make the input infeasible for every engine, as dicts with a message"""
+    problems = []
+    days, slots = Config.DAYS, Config.TIME_SLOTS
+    num_positions = len(days) * len(slots)
+    faculty_by_id = {f['id']: f for f in faculty}
+
+    allowed = {}
+    for f_id, f in faculty_by_id.items():
+        availability = parse_availability(f.get('availability', {}))
+        allowed[f_id] = len(allowed_positions(availability, days, slots))
+
+    load = {}
+    fitting_sets = {}
+    for course in courses:
+        hours = hours_per_week(course)
+        f_id = course['faculty_id']
+        fitting = frozenset(r['id'] for r in rooms if room_fits(course, r))
+        if not fitting:
+            problems.append({
+                'type': 'no_fitting_room', 'course_id': course['id'],
+                'message': f"{course['code']}: no room of type {course.get('room_type') or 'any'} "
+                           f"holds {course.get('enrollment') or 0} students"
+            })
+        else:
+            fitting_sets.setdefault(fitting, []).append(course)
+        if f_id in faculty_by_id:
+            load[f_id] = load.get(f_id, 0) + hours
+            if hours > allowed[f_id]:
+                problems.append({
+                    'type': 'course_exceeds_availability', 'course_id': course['id'], 'faculty_id': f_id,
+                    'message': f"{course['code']} needs {hours} hours but {faculty_by_id[f_id]['name']} "
+                               f"is available for {allowed[f_id]} slots"
+                })
+        elif hours > num_positions:
+            problems.append({
+                'type': 'course_exceeds_week', 'course_id': course['id'],
+                'message': f"{course['code']} needs {hours} hours but the week has {num_positions} slots"
+            })
+
+    for f_id, hours in load.items():
+        f = faculty_by_id[f_id]
+        max_hours = f.get('max_hours', 20)
+        if hours > max_hours:
+            problems.append({
+                'type': 'faculty_overloaded', 'faculty_id': f_id, 'hours': hours, 'max_hours': max_hours,
+                'message': f"{f['name']} is assigned {hours} hours but max_hours is {max_hours}"
+            })
+        if hours > allowed[f_id]:
+            problems.append({
+                'type': 'faculty_availability', 'faculty_id': f_id, 'hours': hours, 'available_slots': allowed[f_id],
+                'message': f"{f['name']} is assigned {hours} hours but is available for {allowed[f_id]} slots"
+            })
+
+    total = sum(hours_per_week(c) for c in courses)
+    if total > len(rooms) * num_positions:
+        problems.append({
+            'type': 'room_capacity', 'hours': total, 'room_slots': len(rooms) * num_positions,
+            'message': f"{total} class hours do not fit in {len(rooms)} rooms x {num_positions} slots"
+        })
+
+    # Courses that can only use a set of rooms must fit in that set's slots
+    # (courses whose fitting rooms are a subset compete for the same rooms)
+    groups = sorted(fitting_sets.items(), key=lambda item: len(item[0]))
+    for room_ids, group in groups:
+        if len(room_ids) == len(rooms):
+            continue
+        hours = sum(hours_per_week(c) for subset, members in groups if subset <= room_ids for c in members)
+        if hours > len(room_ids) * num_positions:
+            problems.append({
+                'type': 'room_type_capacity', 'room_ids': sorted(room_ids),
+                'course_ids': sorted(c['id'] for subset, members in groups if subset <= room_ids for c in members),
+                'hours': hours, 'room_slots': len(room_ids) * num_positions,
+                'message': f"{hours} hours of courses limited to {len(room_ids)} suitable rooms "
+                           f"exceed their {len(room_ids) * num_positions} slots"
+            })
+    return problems
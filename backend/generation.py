@@ -0,0 +1,221 @@
+from models import Database, Timetable, Course, Faculty, Room, Generation
+from feasibility import precheck
+import solution_cache
+import time
+
+GENERATION_MODES = ('full', 'incremental')
+
+class GenerationProgress:
+    """Hooks run_generation calls as it moves through its phases.
+
+    The default does nothing; background jobs subclass it to publish
+    progress and to stop the solver on cancellation.
+    """
+
+    def phase(self, name, progress):
+        pass
+
+    def attach(self, scheduler):
+        pass
+
+    def solution(self, event):
+        """Improving solution found: objective_value, best_bound, gap, elapsed"""
+        pass
+
+    def cancelled(self):
+        return False
+
+def _entry_key(entry):
+    return (entry['course_id'], entry['room_id'], entry['day'], entry['slot'])
+
+def _changed_entries(previous, timetable):
+    """Entries added to and removed from the stored timetable"""
+    old_keys = {_entry_key(e) for e in previous}
+    new_keys = {_entry_key(e) for e in timetable}
+    return {
+        'added': [e for e in timetable if _entry_key(e) not in old_keys],
+        'removed': [e for e in previous if _entry_key(e) not in new_keys]
+    }
+
+def run_generation(options=None, progress=None):
+    """Fetch data, build and solve the model, and persist the timetable.
+
+    options: 'solver' (solver parameters), 'mode' ('full' or 'incremental'),
+    'pin_unchanged' (incremental mode only), 'engine' (a key of engines.ENGINES),
+    'decompose' (solve independent components in parallel), 'use_cache'
+    (reuse solutions of identical full-mode inputs, default True),
+    'warm_start' (hint the solver with a heuristic draft, full mode only) and
+    'precheck' (reject inputs that fail the counting checks in
+    feasibility.precheck before solving, default True) and 'explain_seconds'
+    (budget for explaining an infeasible solve, default
+    Config.CONFLICT_EXPLAIN_SECONDS).
+    Proven infeasible solves report the conflicting constraints.
+    Statistics include per-phase wall times in seconds under 'timings'.
+    The engines (and OR-Tools) are imported on the first solve, so importing
+    this module stays cheap for API workers that only submit jobs.
+    Returns a (response_body, http_status) tuple.
+    """
+    options = options or {}
+    mode = options.get('mode', 'full')
+    progress = progress or GenerationProgress()
+    timings = {}
+    db = Database()
+    try:
+        # Fetch all data
+        progress.phase('fetching', 0.05)
+        clock = time.perf_counter()
+        started_at = Generation.now(db)
+        courses = Course.get_all(db)
+        faculty = Faculty.get_all(db)
+        rooms = Room.get_all(db)
+        timings['fetch'] = time.perf_counter() - clock
+
+        if not courses or not faculty or not rooms:
+            return {
+                'success': False,
+                'message': 'Insufficient data. Add courses, faculty, and rooms first.'
+            }, 400
+
+        if options.get('precheck', True):
+            clock = time.perf_counter()
+            problems = precheck(courses, faculty, rooms)
+            timings['precheck'] = time.perf_counter() - clock
+            if problems:
+                return {
+                    'success': False,
+                    'message': 'Timetable cannot be generated: ' + problems[0]['message'],
+                    'solver_status': 'PRECHECK_FAILED',
+                    'problems': problems
+                }, 400
+
+        # Generate timetable using AI scheduler
+        from decomposition import DecomposedScheduler
+        from engines import ENGINES
+        from heuristic import HeuristicScheduler
+        import analytics
+        progress.phase('building', 0.15)
+        engine = options.get('engine', 'grid')
+        if options.get('decompose'):
+            scheduler = DecomposedScheduler(courses, faculty, rooms, options.get('solver'), engine)
+        else:
+            scheduler = ENGINES[engine](courses, faculty, rooms, options.get('solver'))
+        progress.attach(scheduler)
+        scheduler.on_solution = progress.solution
+
+        previous = None
+        cache_key = None
+        cached = None
+        if mode == 'incremental':
+            previous = Timetable.get_all(db) or []
+            last = Generation.latest(db)
+            # Without a previous run every course counts as changed
+            changed = Generation.changed_course_ids(db, last['created_at']) if last else None
+            scheduler.set_previous_solution(previous, changed, options.get('pin_unchanged', False))
+        elif options.get('use_cache', True):
+            cache_key = solution_cache.input_hash(courses, faculty, rooms, options)
+            cached = solution_cache.get(cache_key)
+
+        if cached is not None:
+            # Identical inputs were solved before
+            timetable = cached['timetable']
+            stats = dict(cached['statistics'], cache_hit=True, timings=timings)
+        else:
+            if cache_key is not None:
+                # Inputs changed since the last cached solve: use it as hints only
+                seed = solution_cache.latest()
+                if seed is not None:
+                    scheduler.set_previous_solution(seed['timetable'], minimize_moves=False)
+
+            draft_stats = None
+            if options.get('warm_start') and engine != 'heuristic' and previous is None:
+                # A heuristic draft for the current inputs beats a cached solution of older ones
+                progress.phase('drafting', 0.2)
+                clock = time.perf_counter()
+                drafter = HeuristicScheduler(courses, faculty, rooms, options.get('solver'))
+                drafter.build_model()
+                draft = drafter.solve()
+                timings['draft'] = time.perf_counter() - clock
+                draft_stats = {'status': drafter.status_name(), 'time': drafter.timings.get('solve'),
+                               'objective_value': drafter.objective_value() if draft else None}
+                if draft:
+                    scheduler.set_previous_solution(draft, minimize_moves=False)
+
+            clock = time.perf_counter()
+            scheduler.build_model()
+            timings['build'] = time.perf_counter() - clock
+
+            if progress.cancelled():
+                return {'success': False, 'message': 'Generation cancelled'}, 409
+
+            progress.phase('solving', 0.3)
+            clock = time.perf_counter()
+            timetable = scheduler.solve()
+            solve_time = time.perf_counter() - clock
+            # Engines split their own solve and _extract_solution times; decomposed runs only have the total
+            scheduler_timings = getattr(scheduler, 'timings', {})
+            timings['solve'] = scheduler_timings.get('solve', solve_time)
+            if 'extract' in scheduler_timings:
+                timings['extract'] = scheduler_timings['extract']
+
+            if progress.cancelled():
+                return {'success': False, 'message': 'Generation cancelled'}, 409
+
+            if not timetable:
+                body = {
+                    'success': False,
+                    'message': 'Could not generate feasible timetable. Check constraints.',
+                    'solver_status': scheduler.status_name()
+                }
+                if scheduler.status_name() == 'INFEASIBLE':
+                    progress.phase('explaining', 0.9)
+                    from conflicts import explain_conflict
+                    conflicts = explain_conflict(courses, faculty, rooms, options.get('solver'),
+                                                 options.get('explain_seconds'))
+                    body['message'] = 'No feasible timetable: ' + '; '.join(c['message'] for c in conflicts)
+                    body['conflicts'] = conflicts
+                return body, 400
+
+            stats = scheduler.get_statistics(timetable)
+            stats['timings'] = timings
+            if draft_stats is not None:
+                stats['warm_start'] = draft_stats
+            if cache_key is not None:
+                solution_cache.put(cache_key, timetable, stats)
+
+        # Workload, utilisation and congestion, stored with the version
+        clock = time.perf_counter()
+        summary = analytics.build(timetable, courses, faculty, rooms)
+        stats.update(analytics.workload(summary))
+        timings['analytics'] = time.perf_counter() - clock
+
+        # Publish the new timetable as a new version in one transaction
+        progress.phase('saving', 0.9)
+        timetable_data = [
+            (entry['course_id'], entry['faculty_id'], entry['room_id'],
+             entry['day'], entry['slot'])
+            for entry in timetable
+        ]
+
+        if previous is not None:
+            changes = _changed_entries(previous, timetable)
+            stats['moved_classes'] = len(changes['removed'])
+        clock = time.perf_counter()
+        version = Timetable.publish(db, timetable_data, mode, stats, started_at, analytics=summary)
+        # Not part of the statistics stored with the version, which are written by publish itself
+        timings['persist'] = time.perf_counter() - clock
+    finally:
+        db.close()
+
+    if version is None:
+        return {'success': False, 'message': 'Failed to save timetable'}, 500
+
+    progress.phase('done', 1.0)
+    if previous is not None:
+        # Incremental responses only carry the entries that moved
+        return {'success': True, 'version': version, 'changes': changes, 'statistics': stats}, 200
+    return {
+        'success': True,
+        'version': version,
+        'data': timetable,
+        'statistics': stats
+    }, 200
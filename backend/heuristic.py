@@ -0,0 +1,290 @@
+import random
+import time
+from scheduler import TimetableScheduler
+
+class HeuristicScheduler(TimetableScheduler):
+    """Greedy constructive scheduler with local-search repair.
+
+    Courses are placed most-constrained first (fewest allowed slot/room
+    pairs per required hour), one session at a time: session_length
+    consecutive slots of one day in one room, as in the interval engine.
+    Each session goes to the earliest free start and the smallest fitting
+    room. Sessions that do not fit are placed by moving one blocking
+    session elsewhere, then sessions are moved to earlier free starts to
+    reduce the lateness objective. Returns in milliseconds but proves
+    nothing: a failure does not mean the input is infeasible.
+    Same interface and entry format as the CP-SAT engines; its timetable
+    can be passed to their set_previous_solution as hints.
+    """
+
+    IMPROVEMENT_PASSES = 3
+
+    def build_model(self):
+        """Precompute allowed slots and fitting rooms as bitsets"""
+        num_slots = len(self.slots)
+        self.num_positions = len(self.days) * num_slots
+        # Earliest slot of the day first, then by day: the order that minimises lateness
+        self.order = sorted(range(self.num_positions), key=lambda p: (p % num_slots, p // num_slots))
+        # Rooms by capacity so the lowest set bit of a room mask is the smallest fitting room
+        self.room_ids = sorted(self.rooms, key=lambda r_id: (self.rooms[r_id].get('capacity') or 0, r_id))
+
+        self.courses_by_id = {c['id']: c for c in self.courses}
+        self.allowed = {}
+        self.fits = {}
+        allowed_by_faculty = {}
+        for course in self.courses:
+            f_id = course['faculty_id']
+            if f_id not in allowed_by_faculty:
+                allowed_by_faculty[f_id] = sum(1 << (d * num_slots + s) for d, s in self._allowed_slots(f_id))
+            self.allowed[course['id']] = allowed_by_faculty[f_id]
+            self.fits[course['id']] = sum(1 << k for k, r_id in enumerate(self.room_ids)
+                                          if self.room_fits(course, self.rooms[r_id]))
+        self.num_variables = 0
+        self.pruned_variables = 0
+        self._stopped = False
+
+    def _hours(self, course):
+        return course.get('hours_per_week', course['credits'])
+
+    def _span(self, start, length):
+        """Bitset of a session's positions, or 0 if it would run past the end of the day"""
+        if start % len(self.slots) + length > len(self.slots):
+            return 0
+        return ((1 << length) - 1) << start
+
+    def _reset(self):
+        self.placements = {}  # placement id -> (course id, start position, room index, length)
+        self.room_busy = [0] * self.num_positions  # room bitset per position
+        self.room_owner = {}  # (position, room index) -> placement id
+        self.faculty_busy = {}
+        self.faculty_owner = {}  # (faculty id, position) -> placement id
+        self.faculty_load = {}
+        self.course_busy = {}
+        self._next_id = 0
+
+    def _place(self, c_id, start, room, length):
+        f_id = self.courses_by_id[c_id]['faculty_id']
+        pid = self._next_id
+        self._next_id += 1
+        self.placements[pid] = (c_id, start, room, length)
+        for position in range(start, start + length):
+            self.room_busy[position] |= 1 << room
+            self.room_owner[(position, room)] = pid
+            if f_id in self.faculty:
+                self.faculty_owner[(f_id, position)] = pid
+        span = self._span(start, length)
+        self.course_busy[c_id] = self.course_busy.get(c_id, 0) | span
+        if f_id in self.faculty:
+            self.faculty_busy[f_id] = self.faculty_busy.get(f_id, 0) | span
+            self.faculty_load[f_id] = self.faculty_load.get(f_id, 0) + length
+        return pid
+
+    def _unplace(self, pid):
+        c_id, start, room, length = self.placements.pop(pid)
+        f_id = self.courses_by_id[c_id]['faculty_id']
+        for position in range(start, start + length):
+            self.room_busy[position] &= ~(1 << room)
+            del self.room_owner[(position, room)]
+            if f_id in self.faculty:
+                del self.faculty_owner[(f_id, position)]
+        span = self._span(start, length)
+        self.course_busy[c_id] &= ~span
+        if f_id in self.faculty:
+            self.faculty_busy[f_id] &= ~span
+            self.faculty_load[f_id] -= length
+        return c_id, start, room, length
+
+    def _free_positions(self, c_id):
+        """Bitset of positions where the course and its faculty member are free"""
+        f_id = self.courses_by_id[c_id]['faculty_id']
+        return self.allowed[c_id] & ~self.course_busy.get(c_id, 0) & ~self.faculty_busy.get(f_id, 0)
+
+    def _free_rooms(self, c_id, start, length):
+        """Bitset of fitting rooms free for the whole session"""
+        rooms = self.fits[c_id]
+        for position in range(start, start + length):
+            rooms &= ~self.room_busy[position]
+        return rooms
+
+    def _can_add(self, c_id, hours):
+        f_id = self.courses_by_id[c_id]['faculty_id']
+        if f_id not in self.faculty:
+            return True
+        return self.faculty_load.get(f_id, 0) + hours <= self.faculty[f_id].get('max_hours', 20)
+
+    def _first_fit(self, c_id, length, before=None):
+        """Earliest free (start, room), optionally only starts earlier in the day than `before`"""
+        free = self._free_positions(c_id)
+        num_slots = len(self.slots)
+        for start in self.order:
+            if before is not None and start % num_slots >= before:
+                break
+            span = self._span(start, length)
+            if span and free & span == span:
+                rooms = self._free_rooms(c_id, start, length)
+                if rooms:
+                    return start, (rooms & -rooms).bit_length() - 1
+        return None
+
+    def _place_with_repair(self, c_id, length):
+        """Place one session, moving a single blocking session if there is no free spot"""
+        spot = self._first_fit(c_id, length)
+        if spot is not None:
+            self._place(c_id, *spot, length)
+            return True
+
+        f_id = self.courses_by_id[c_id]['faculty_id']
+        course_free = self.allowed[c_id] & ~self.course_busy.get(c_id, 0)
+        for start in self.order:
+            if self._stopped:
+                return False
+            span = self._span(start, length)
+            if not span or course_free & span != span:
+                continue
+            positions = range(start, start + length)
+            faculty_blockers = {self.faculty_owner[(f_id, p)] for p in positions
+                                if (f_id, p) in self.faculty_owner}
+            if len(faculty_blockers) > 1:
+                continue
+            for room in range(len(self.room_ids)):
+                if not (self.fits[c_id] >> room) & 1:
+                    continue
+                blockers = faculty_blockers | {self.room_owner[(p, room)] for p in positions
+                                               if (p, room) in self.room_owner}
+                if len(blockers) == 1 and self._relocate(blockers.pop(), c_id, start, room, length):
+                    return True
+        return False
+
+    def _relocate(self, pid, c_id, start, room, length):
+        """Move placement pid elsewhere and put a session of c_id at (start, room)"""
+        moved = self._unplace(pid)
+        span = self._span(start, length)
+        if self._free_positions(c_id) & span == span and (self._free_rooms(c_id, start, length) >> room) & 1:
+            new_pid = self._place(c_id, start, room, length)
+            spot = self._first_fit(moved[0], moved[3])
+            if spot is not None:
+                self._place(moved[0], *spot, moved[3])
+                return True
+            self._unplace(new_pid)
+        self._place(*moved)
+        return False
+
+    def _improve(self):
+        """Move sessions to free starts earlier in the day until nothing improves"""
+        num_slots = len(self.slots)
+        for _ in range(self.IMPROVEMENT_PASSES):
+            improved = False
+            for pid in sorted(self.placements, key=lambda p: -(self.placements[p][1] % num_slots)):
+                if self._stopped:
+                    return
+                c_id, start, room, length = self.placements[pid]
+                if start % num_slots == 0:
+                    continue
+                self._unplace(pid)
+                spot = self._first_fit(c_id, length, before=start % num_slots)
+                self._place(c_id, *(spot or (start, room)), length)
+                improved = improved or spot is not None
+            if not improved:
+                return
+
+    def _order_courses(self):
+        """Most constrained first: fewest allowed (slot, room) pairs per required hour"""
+        rng = random.Random(self.solver_params['random_seed'])
+        keyed = []
+        for course in self.courses:
+            c_id = course['id']
+            options = bin(self.allowed[c_id]).count('1') * bin(self.fits[c_id]).count('1')
+            keyed.append((options / max(self._hours(course), 1), -self._hours(course), rng.random(), c_id))
+        return [c_id for *_, c_id in sorted(keyed)]
+
+    def _keep_previous(self, needed):
+        """Place stored classes that still form a valid session; removes them from needed"""
+        num_slots = len(self.slots)
+        room_index = {r_id: k for k, r_id in enumerate(self.room_ids)}
+        stored = {}
+        for c_id, d_idx, s_idx, r_id in self.previous:
+            if c_id in needed and r_id in room_index:
+                stored.setdefault(c_id, set()).add((d_idx * num_slots + s_idx, room_index[r_id]))
+        for c_id, hours in sorted(stored.items()):
+            for start, room in sorted(hours):
+                for length in sorted(set(needed[c_id]), reverse=True):
+                    block = {(start + k, room) for k in range(length)}
+                    if (block <= hours and self._span(start, length)
+                            and self._free_positions(c_id) & self._span(start, length) == self._span(start, length)
+                            and (self._free_rooms(c_id, start, length) >> room) & 1
+                            and self._can_add(c_id, length)):
+                        self._place(c_id, start, room, length)
+                        needed[c_id].remove(length)
+                        hours -= block
+                        break
+
+    def solve(self):
+        """Construct, repair and improve; returns the timetable or None"""
+        started = time.perf_counter()
+        self._reset()
+        needed = {c['id']: self._sessions(c) for c in self.courses}
+
+        if self.previous is not None:
+            self._keep_previous(needed)
+
+        self.unplaced = 0
+        for c_id in self._order_courses():
+            for length in needed[c_id]:
+                if (self._stopped or not self._can_add(c_id, length)
+                        or not self._place_with_repair(c_id, length)):
+                    self.unplaced += length
+
+        if not self.unplaced:
+            self._improve()
+        self.timings['solve'] = time.perf_counter() - started
+
+        if self.unplaced:
+            self.status = 'INCOMPLETE'
+            return None
+        self.status = 'FEASIBLE'
+        self.solutions_found = 1
+        if self.on_solution is not None:
+            self.on_solution({'solution': 1, 'objective_value': self.objective_value(), 'best_bound': None,
+                              'gap': None, 'elapsed': self.timings['solve']})
+        started = time.perf_counter()
+        timetable = self._extract_solution()
+        self.timings['extract'] = time.perf_counter() - started
+        return timetable
+
+    def _extract_solution(self):
+        num_slots = len(self.slots)
+        hours = sorted((position, c_id, room) for c_id, start, room, length in self.placements.values()
+                       for position in range(start, start + length))
+        return [self._make_entry(self.courses_by_id[c_id], position // num_slots, position % num_slots,
+                                 self.room_ids[room])
+                for position, c_id, room in hours]
+
+    def objective_value(self):
+        """Sum of slot indices, the lateness objective of the grid engine"""
+        num_slots = len(self.slots)
+        return sum(position % num_slots for _, start, _, length in self.placements.values()
+                   for position in range(start, start + length))
+
+    def best_bound(self):
+        return None
+
+    def status_name(self):
+        return self.status
+
+    def stop(self):
+        self._stopped = True
+
+    def get_statistics(self, timetable):
+        """Same keys as the CP-SAT engines, from the heuristic's own counters (self.solver never runs)"""
+        return {
+            'total_classes': len(timetable),
+            'solver_time': self.timings.get('solve'),
+            'solver_status': self.status_name(),
+            'objective_value': self.objective_value(),
+            'best_bound': None,
+            'solver_params': self.solver_params,
+            'variables': self.num_variables,
+            'pruned_variables': self.pruned_variables,
+            'constraints': 0,
+            'solutions_found': self.solutions_found
+        }
@@ -0,0 +1,182 @@
+from ortools.sat.python import cp_model
+from scheduler import TimetableScheduler
+
+class IntervalScheduler(TimetableScheduler):
+    """Session-based formulation using interval variables.
+
+    Each session of a course is a fixed-size interval on a week-long time axis
+    (t = day * len(slots) + slot) with one optional copy per fitting room.
+    Faculty and room exclusivity become one AddNoOverlap each, and sessions of
+    course['session_length'] hours stay contiguous within a day.
+    Previous solutions hint every session. With minimize_moves, sessions
+    kept at their stored start and room outweigh all lateness savings, and
+    pin_unchanged fixes the sessions of unchanged courses; a course whose
+    stored classes do not form its sessions (e.g. from the grid engine)
+    cannot be kept and counts as changed.
+    """
+
+    def _starts(self, allowed, length):
+        """Session start times whose slots are all within one day and allowed"""
+        num_slots = len(self.slots)
+        allowed = set(allowed)
+        starts = []
+        for d_idx in range(len(self.days)):
+            for s_idx in range(num_slots - length + 1):
+                if all((d_idx, s_idx + k) in allowed for k in range(length)):
+                    starts.append(d_idx * num_slots + s_idx)
+        return starts
+
+    def _previous_starts(self, c_id, sessions):
+        """Hint each session with a stored class time of the course, in time order"""
+        times = sorted((d * len(self.slots) + s, r) for (c, d, s, r) in self.previous if c == c_id)
+        hints = []
+        position = 0
+        for length in sessions:
+            if position >= len(times):
+                break
+            hints.append(times[position])
+            position += length
+        return hints
+
+    def _previous_layout(self, c_id, sessions):
+        """(start, room) per session if the stored classes of a course form exactly its sessions, else None"""
+        num_slots = len(self.slots)
+        times = sorted((d * num_slots + s, r) for (c, d, s, r) in self.previous if c == c_id)
+        if len(times) != sum(sessions):
+            return None
+        # Full-length sessions are ordered by start; a shorter last session may lie anywhere in time
+        orders = [sessions]
+        if len(sessions) > 1 and sessions[-1] != sessions[0]:
+            orders += [sessions[:k] + sessions[-1:] + sessions[k:-1] for k in range(len(sessions) - 1)]
+        for order in orders:
+            blocks = []
+            position = 0
+            for length in order:
+                block = times[position:position + length]
+                start, room = block[0]
+                if start % num_slots + length > num_slots or any(
+                        t != start + k or r != room for k, (t, r) in enumerate(block)):
+                    break
+                blocks.append((length, block[0]))
+                position += length
+            else:
+                # Back to session order: full-length sessions first, the shorter one last
+                return [start for length, start in sorted(blocks, key=lambda b: b[0] != sessions[0])]
+        return None
+
+    def build_model(self):
+        """Create interval variables, NoOverlap constraints and objective"""
+        num_slots = len(self.slots)
+        horizon = len(self.days) * num_slots
+        self.sessions = []
+        faculty_intervals = {}
+        room_intervals = {}
+        lateness = []
+        max_lateness = 0
+        kept_hours = []
+        allowed_by_faculty = {}
+        self.pruned_variables = 0
+        keep_moves = self.previous is not None and self.minimize_moves
+
+        for course in self.courses:
+            c_id = course['id']
+            f_id = course['faculty_id']
+            if f_id not in allowed_by_faculty:
+                allowed_by_faculty[f_id] = self._allowed_slots(f_id)
+            fitting_rooms = [r_id for r_id, room in self.rooms.items() if self.room_fits(course, room)]
+            sessions = self._sessions(course)
+            hints = self._previous_starts(c_id, sessions) if self.previous is not None else []
+            layout = self._previous_layout(c_id, sessions) if keep_moves else None
+            pinned = (layout is not None and self.pin_unchanged and self.changed_course_ids is not None
+                      and c_id not in self.changed_course_ids)
+
+            course_intervals = []
+            previous_start = None
+            for k, length in enumerate(sessions):
+                starts = self._starts(allowed_by_faculty[f_id], length)
+                if not starts or not fitting_rooms:
+                    # No legal placement: an empty clause makes the model infeasible
+                    self.model.AddBoolOr([])
+                    continue
+
+                # Room presence literals are only created for fitting rooms
+                self.pruned_variables += len(self.rooms) - len(fitting_rooms)
+                start = self.model.NewIntVarFromDomain(cp_model.Domain.FromValues(starts), f'start_c{c_id}_{k}')
+                interval = self.model.NewFixedSizeIntervalVar(start, length, f'session_c{c_id}_{k}')
+                course_intervals.append(interval)
+                faculty_intervals.setdefault(f_id, []).append(interval)
+
+                rooms = {}
+                for r_id in fitting_rooms:
+                    present = self.model.NewBoolVar(f'c{c_id}_{k}_r{r_id}')
+                    room_intervals.setdefault(r_id, []).append(
+                        self.model.NewOptionalFixedSizeIntervalVar(start, length, present, f'session_c{c_id}_{k}_r{r_id}'))
+                    rooms[r_id] = present
+                self.model.AddExactlyOne(list(rooms.values()))
+
+                # Sum of slot indices over the session, as in the grid objective
+                table = [length * (t % num_slots) + length * (length - 1) // 2 for t in range(horizon)]
+                late = self.model.NewIntVar(0, max(table), f'late_c{c_id}_{k}')
+                self.model.AddElement(start, table, late)
+                lateness.append(late)
+                max_lateness += max(table)
+
+                # Equal-length sessions of a course are interchangeable: order them
+                if previous_start is not None and sessions[k - 1] == length:
+                    self.model.Add(previous_start + length <= start)
+                previous_start = start
+
+                if k < len(hints):
+                    hint_time, hint_room = hints[k]
+                    self.model.AddHint(start, hint_time)
+                    if hint_room in rooms:
+                        self.model.AddHint(rooms[hint_room], 1)
+
+                if layout is not None and layout[k][0] in starts and layout[k][1] in rooms:
+                    stored_time, stored_room = layout[k]
+                    if pinned:
+                        self.model.Add(start == stored_time)
+                        self.model.Add(rooms[stored_room] == 1)
+                    kept = self.model.NewBoolVar(f'kept_c{c_id}_{k}')
+                    self.model.Add(start == stored_time).OnlyEnforceIf(kept)
+                    self.model.AddImplication(kept, rooms[stored_room])
+                    kept_hours.append(length * kept)
+
+                self.sessions.append((course, length, start, rooms))
+
+            if f_id not in self.faculty and len(course_intervals) > 1:
+                self.model.AddNoOverlap(course_intervals)
+
+        # No faculty or room double-booking
+        for f_id, intervals in faculty_intervals.items():
+            if f_id in self.faculty and len(intervals) > 1:
+                self.model.AddNoOverlap(intervals)
+        for intervals in room_intervals.values():
+            if len(intervals) > 1:
+                self.model.AddNoOverlap(intervals)
+
+        # Faculty workload limits: total session hours are fixed by the course list
+        for f_id, faculty_data in self.faculty.items():
+            hours = sum(course.get('hours_per_week', course['credits'])
+                        for course in self.courses if course['faculty_id'] == f_id)
+            if hours > faculty_data.get('max_hours', 20):
+                self.model.AddBoolOr([])
+
+        if keep_moves:
+            # Stored classes not kept, ranked above all lateness savings
+            moved = len(self.previous) - sum(kept_hours)
+            self.model.Minimize((1 + max_lateness) * moved + sum(lateness))
+        else:
+            self.model.Minimize(sum(lateness))
+        self.num_variables = len(self.model.Proto().variables)
+
+    def _extract_solution(self):
+        """Expand each solved session into one entry per covered slot"""
+        num_slots = len(self.slots)
+        timetable = []
+        for course, length, start, rooms in self.sessions:
+            t = self.solver.Value(start)
+            r_id = next(r_id for r_id, present in rooms.items() if self.solver.BooleanValue(present))
+            for k in range(length):
+                timetable.append(self._make_entry(course, (t + k) // num_slots, (t + k) % num_slots, r_id))
+        return timetable
@@ -0,0 +1,188 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+from generation import GenerationProgress, run_generation
+import metrics
+
+# Background timetable generation. Solves run in a process pool capped at
+# Config.MAX_CONCURRENT_SOLVES; job state lives in a multiprocessing manager
+# so the API process can poll progress, follow its events and signal
+# cancellation. Jobs are tracked per API process.
+
+_lock = threading.Lock()
+_jobs = {}
+_executor = None
+_manager = None
+
+class TooManyJobs(Exception):
+    pass
+
+class _JobProgress(GenerationProgress):
+    """Publishes phases and solutions to the shared job state and stops the solver on cancel"""
+
+    def __init__(self, state, cancel_event, stop_event):
+        self.state = state
+        self.cancel_event = cancel_event
+        self.stop_event = stop_event
+        self.scheduler = None
+        self.finished = False
+        self.started = time.perf_counter()
+        self.events = []
+        threading.Thread(target=self._watch_cancel, daemon=True).start()
+
+    def _publish(self, event_type, data, **state):
+        # This process is the only writer, so the local list is authoritative
+        event = dict(data, seq=len(self.events) + 1, type=event_type,
+                     time=time.perf_counter() - self.started)
+        self.events.append(event)
+        self.state.update(state, events=self.events[-Config.JOB_EVENT_HISTORY:])
+
+    def phase(self, name, progress):
+        self._publish('phase', {'phase': name, 'progress': progress}, phase=name, progress=progress)
+
+    def solution(self, event):
+        self._publish('solution', event, best_solution=event)
+
+    def attach(self, scheduler):
+        self.scheduler = scheduler
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _watch_cancel(self):
+        # Keep signalling until the solve returns, in case it had not started yet.
+        # A stop keeps the best solution so far; a cancel discards it.
+        while not self.finished:
+            if self.scheduler is None:
+                # Still fetching or prechecking: a set event would make wait() return at once
+                time.sleep(0.2)
+            elif self.cancel_event.wait(0.2) or self.stop_event.is_set():
+                self.scheduler.stop()
+                time.sleep(0.2)
+
+def _run_job(state, cancel_event, stop_event, options):
+    """Process pool entry point"""
+    progress = _JobProgress(state, cancel_event, stop_event)
+    state.update({'status': 'running', 'started_at': time.time()})
+    try:
+        body, http_status = run_generation(options, progress)
+    except Exception as e:
+        body, http_status = {'success': False, 'message': f'Generation error: {e}'}, 500
+    finally:
+        progress.finished = True
+
+    if http_status == 409:
+        status = 'cancelled'
+    else:
+        status = 'succeeded' if body.get('success') else 'failed'
+    state.update({
+        'status': status,
+        'result': body,
+        'http_status': http_status,
+        'finished_at': time.time()
+    })
+
+def _record_metrics(future, state, options):
+    """Solver metrics are kept by the API process, so record finished jobs here"""
+    if future.cancelled():
+        return
+    try:
+        if 'result' in state:
+            metrics.record_generation(state['result'], state.get('http_status'), options)
+    except Exception as e:
+        print(f"Job metrics error: {e}")
+
+def _get_pool():
+    global _executor, _manager
+    if _executor is None:
+        context = multiprocessing.get_context('spawn')
+        _manager = context.Manager()
+        _executor = ProcessPoolExecutor(max_workers=Config.MAX_CONCURRENT_SOLVES, mp_context=context)
+    return _executor, _manager
+
+def _prune_finished():
+    cutoff = time.time() - Config.JOB_RETENTION_SECONDS
+    for job_id in [j for j, job in _jobs.items() if (job['state'].get('finished_at') or cutoff) < cutoff]:
+        del _jobs[job_id]
+
+def submit(options=None):
+    """Queue a generation job and return its id.
+
+    Raises TooManyJobs when Config.MAX_PENDING_JOBS are already queued or running.
+    """
+    with _lock:
+        _prune_finished()
+        active = sum(1 for job in _jobs.values()
+                     if job['state'].get('status') in ('queued', 'running'))
+        if active >= Config.MAX_PENDING_JOBS:
+            raise TooManyJobs(f'{active} generation jobs already pending')
+
+        executor, manager = _get_pool()
+        job_id = uuid.uuid4().hex
+        state = manager.dict({
+            'status': 'queued',
+            'phase': 'queued',
+            'progress': 0.0,
+            'created_at': time.time()
+        })
+        cancel_event = manager.Event()
+        stop_event = manager.Event()
+        future = executor.submit(_run_job, state, cancel_event, stop_event, options)
+        future.add_done_callback(lambda f: _record_metrics(f, state, options))
+        _jobs[job_id] = {'state': state, 'cancel': cancel_event, 'stop': stop_event, 'future': future}
+    return job_id
+
+def get(job_id):
+    """Snapshot of a job's state, or None if unknown"""
+    job = _jobs.get(job_id)
+    if job is None:
+        return None
+    state = dict(job['state'])
+    future = job['future']
+    if (future.done() and not future.cancelled() and future.exception() is not None
+            and state['status'] in ('queued', 'running')):
+        # Worker process died before reporting back
+        state.update({'status': 'failed', 'result': {'success': False, 'message': str(future.exception())}})
+    state['id'] = job_id
+    return state
+
+def follow(job_id, after=0):
+    """Yield a job's events with seq > after as they appear, then its final state.
+
+    Yields None while waiting so callers can send keep-alives; ends with
+    {'type': 'done', ...} once the job finishes, or stops if it is pruned.
+    """
+    while True:
+        job = get(job_id)
+        if job is None:
+            return
+        for event in job.get('events', []):
+            if event['seq'] > after:
+                after = event['seq']
+                yield event
+        if job['status'] not in ('queued', 'running'):
+            yield {'type': 'done', 'status': job['status'], 'result': job.get('result')}
+            return
+        yield None
+        time.sleep(Config.JOB_EVENT_POLL_SECONDS)
+
+def stop(job_id):
+    """Stop a running solver early and keep its best solution; returns False if unknown"""
+    job = _jobs.get(job_id)
+    if job is None:
+        return False
+    job['stop'].set()
+    return True
+
+def cancel(job_id):
+    """Cancel a queued job or stop a running solver; returns False if unknown"""
+    job = _jobs.get(job_id)
+    if job is None:
+        return False
+    job['cancel'].set()
+    if job['future'].cancel():
+        job['state'].update({'status': 'cancelled', 'finished_at': time.time()})
+    return True
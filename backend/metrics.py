@@ -0,0 +1,162 @@
+import bisect
+import functools
+import re
+import threading
+import time
+from flask import g, request
+
+# In-process metrics rendered in the Prometheus text format on /metrics.
+# Each observation is a dict lookup and an add under one lock, so the
+# instrumentation can stay on in production. Values are per process.
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SOLVER_BUCKETS = (0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_lock = threading.Lock()
+_metrics = []
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, labels
+        self.values = {}
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield f'{self.name}{_format_labels(self.labels, labels)} {value}'
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, *labels, value):
+        with _lock:
+            self.values[labels] = value
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, labels
+        self.buckets = buckets
+        self.values = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        _metrics.append(self)
+
+    def observe(self, *labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            counts = self.values.get(labels)
+            if counts is None:
+                counts = self.values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        for labels, counts in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                yield f'{self.name}_bucket{_format_labels(self.labels, labels, [("le", bound)])} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(self.labels, labels)} {counts[-1]}'
+            yield f'{self.name}_count{_format_labels(self.labels, labels)} {cumulative}'
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        for metric in _metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+http_requests = Counter('http_requests_total', 'HTTP requests by route and status', ('method', 'route', 'status'))
+http_latency = Histogram('http_request_duration_seconds', 'HTTP request latency', ('method', 'route'))
+
+db_latency = Histogram('db_query_duration_seconds', 'SQLite statement latency', ('operation', 'table'))
+db_rows = Counter('db_rows_total', 'Rows returned or written by SQLite statements', ('operation', 'table'))
+db_errors = Counter('db_errors_total', 'Failed SQLite statements', ('operation', 'table'))
+db_skipped = Counter('db_skipped_writes_total', 'Conditional writes skipped because the data changed first',
+                     ('operation', 'table'))
+
+generations = Counter('timetable_generations_total', 'Timetable generations by engine and outcome',
+                      ('engine', 'mode', 'status'))
+generation_phase = Histogram('timetable_generation_phase_seconds', 'Generation wall time per phase',
+                             ('phase',), SOLVER_BUCKETS)
+solver_wall = Histogram('solver_wall_seconds', 'Solver wall time', ('engine',), SOLVER_BUCKETS)
+solver_variables = Gauge('solver_variables', 'Decision variables in the last model built', ('engine',))
+solver_constraints = Gauge('solver_constraints', 'Constraints in the last model built', ('engine',))
+solver_gap = Gauge('solver_relative_gap', 'Relative optimality gap of the last solve', ('engine',))
+
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE)\s+(\w+)', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=512)
+def query_labels(query):
+    """(operation, table) labels for a SQL statement"""
+    words = query.split(None, 1)
+    match = _TABLE.search(query)
+    return (words[0].upper() if words else 'UNKNOWN', match.group(1).lower() if match else '')
+
+def observe_query(query, started, rows=0, failed=False, skipped=False):
+    """Record one statement that began at time.perf_counter() value `started`"""
+    labels = query_labels(query)
+    db_latency.observe(*labels, value=time.perf_counter() - started)
+    if failed:
+        db_errors.inc(*labels)
+    elif skipped:
+        db_skipped.inc(*labels)
+    elif rows > 0:
+        db_rows.inc(*labels, amount=rows)
+
+def record_generation(body, http_status, options=None):
+    """Solver and phase metrics from a run_generation result"""
+    options = options or {}
+    engine = options.get('engine', 'grid')
+    stats = body.get('statistics') or {}
+    if http_status == 409:
+        outcome = 'cancelled'
+    else:
+        outcome = stats.get('solver_status') or body.get('solver_status') or ('OK' if body.get('success') else 'ERROR')
+    generations.inc(engine, options.get('mode', 'full'), outcome)
+
+    for phase, seconds in (stats.get('timings') or {}).items():
+        if seconds is not None:
+            generation_phase.observe(phase, value=seconds)
+    if stats.get('cache_hit'):
+        return
+    if stats.get('solver_time') is not None:
+        solver_wall.observe(engine, value=stats['solver_time'])
+    if stats.get('variables') is not None:
+        solver_variables.set(engine, value=stats['variables'])
+    if stats.get('constraints') is not None:
+        solver_constraints.set(engine, value=stats['constraints'])
+    objective, bound = stats.get('objective_value'), stats.get('best_bound')
+    if objective is not None and bound is not None:
+        solver_gap.set(engine, value=abs(objective - bound) / max(1.0, abs(objective)))
+
+def init_app(app):
+    """Time every request by its URL rule"""
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            http_latency.observe(request.method, route, value=time.perf_counter() - started)
+            http_requests.inc(request.method, route, str(response.status_code))
+        return response
@@ -1,43 +1,308 @@
 import sqlite3
 import json
+import queue
+import threading
+import time
+from flask import g
 from config import Config
+import metrics
+
+def _index_case(column, values):
+    """SQL CASE mapping a text column to its position in a Config list"""
+    return "CASE " + column + " " + " ".join(f"WHEN '{v}' THEN {i}" for i, v in enumerate(values)) + " END"
+
+def _counter_triggers(table):
+    """Triggers bumping change_counters on every update and delete of a table"""
+    return [
+        f"""CREATE TRIGGER {table}_{event.lower()}_counter AFTER {event} ON {table}
+            BEGIN UPDATE change_counters SET version = version + 1 WHERE table_name = '{table}'; END"""
+        for event in ('UPDATE', 'DELETE')
+    ]
+
+COUNTED_TABLES = ('faculty', 'courses', 'rooms', 'timetable')
+
+# Inserts and timetable writes bump their counter once per transaction instead
+# of through per-row triggers, which would run once for every row of a bulk
+# import or a regenerated timetable. Single-row updates and deletes of the
+# reference tables keep the triggers.
+BUMP_COUNTER = "UPDATE change_counters SET version = version + 1 WHERE table_name = ?"
+# The published timetable version is the latest generation; 0 before the first one
+CURRENT_VERSION = "(SELECT COALESCE(MAX(id), 0) FROM generations)"
+
+# Schema migrations, applied in order on top of database/schema.sql.
+# PRAGMA user_version records how many have run; schema.sql sets it for fresh databases.
+MIGRATIONS = [
+    # 1: room requirements used by the scheduler to prune room assignments
+    [
+        "ALTER TABLE courses ADD COLUMN room_type TEXT",
+        "ALTER TABLE courses ADD COLUMN enrollment INTEGER DEFAULT 0",
+    ],
+    # 2: edit tracking and generation history for incremental re-solves
+    [
+        "ALTER TABLE faculty ADD COLUMN updated_at DATETIME",
+        "ALTER TABLE courses ADD COLUMN updated_at DATETIME",
+        "ALTER TABLE rooms ADD COLUMN updated_at DATETIME",
+        """CREATE TABLE generations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mode TEXT NOT NULL,
+            statistics TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )""",
+    ],
+    # 3: contiguous multi-hour sessions (labs) for the interval engine
+    [
+        "ALTER TABLE courses ADD COLUMN session_length INTEGER DEFAULT 1",
+    ],
+    # 4: integer day/slot positions (Config.DAYS / Config.TIME_SLOTS) and covering indexes
+    [
+        "ALTER TABLE timetable ADD COLUMN day_idx INTEGER",
+        "ALTER TABLE timetable ADD COLUMN slot_idx INTEGER",
+        f"UPDATE timetable SET day_idx = {_index_case('day', Config.DAYS)}, "
+        f"slot_idx = {_index_case('slot', Config.TIME_SLOTS)}",
+        "CREATE INDEX idx_timetable_slot ON timetable (day_idx, slot_idx)",
+        "CREATE INDEX idx_timetable_faculty ON timetable (faculty_id, day_idx, slot_idx, room_id, course_id)",
+        "CREATE INDEX idx_timetable_room ON timetable (room_id, day_idx, slot_idx, faculty_id, course_id)",
+        "CREATE INDEX idx_timetable_course ON timetable (course_id, day_idx, slot_idx)",
+    ],
+    # 5: per-table change counters for ETags and the read cache
+    [
+        "CREATE TABLE change_counters (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)",
+        "INSERT INTO change_counters (table_name) VALUES " + ", ".join(f"('{t}')" for t in COUNTED_TABLES),
+    ] + [trigger for table in ('faculty', 'courses', 'rooms') for trigger in _counter_triggers(table)],
+    # 6: indexes for filtered, keyset-paginated list endpoints
+    [
+        "CREATE INDEX idx_courses_faculty ON courses (faculty_id)",
+        "CREATE INDEX idx_courses_type ON courses (type)",
+        "CREATE INDEX idx_rooms_type ON rooms (type)",
+    ],
+    # 7: versioned timetable rows, published atomically with their generation
+    [
+        "ALTER TABLE timetable ADD COLUMN version INTEGER NOT NULL DEFAULT 0",
+        f"UPDATE timetable SET version = {CURRENT_VERSION}",
+        "DROP INDEX idx_timetable_slot",
+        "DROP INDEX idx_timetable_faculty",
+        "DROP INDEX idx_timetable_room",
+        "DROP INDEX idx_timetable_course",
+        "CREATE INDEX idx_timetable_slot ON timetable (version, day_idx, slot_idx)",
+        "CREATE INDEX idx_timetable_faculty ON timetable (version, faculty_id, day_idx, slot_idx, room_id, course_id)",
+        "CREATE INDEX idx_timetable_room ON timetable (version, room_id, day_idx, slot_idx, faculty_id, course_id)",
+        "CREATE INDEX idx_timetable_course ON timetable (version, course_id, day_idx, slot_idx, room_id, faculty_id)",
+    ],
+    # 8: analytics computed when a version is published (see analytics.build)
+    [
+        "ALTER TABLE generations ADD COLUMN analytics TEXT",
+    ],
+]
+
+_migrated = False
+_migrate_lock = threading.Lock()
+
+def _open_connection():
+    """Open a SQLite connection with WAL and the configured pragmas"""
+    conn = sqlite3.connect(Config.DB_PATH, check_same_thread=False,
+                           cached_statements=Config.DB_STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row  # Enable column access by name
+    # WAL lets dashboard readers proceed while a new timetable is written
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {Config.DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {int(Config.DB_CACHE_SIZE)}")
+    conn.execute(f"PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA busy_timeout = {int(Config.DB_BUSY_TIMEOUT_MS)}")
+    return conn
+
+class ConnectionPool:
+    """Long-lived connections reused across requests (and their statement caches)"""
+
+    def __init__(self, size):
+        self.size = size
+        self._idle = queue.LifoQueue()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return _open_connection()
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._idle.qsize() < self.size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(Config.DB_POOL_SIZE)
+    return _pool
+
+def get_db():
+    """Pooled Database for the current app context, released by close_db on teardown"""
+    if 'db' not in g:
+        g.db = Database(pool=_get_pool())
+    return g.db
+
+def close_db(exception=None):
+    db = g.pop('db', None)
+    if db is not None:
+        db.close()
 
 class Database:
-    def __init__(self):
+    def __init__(self, pool=None):
         self.conn = None
+        self.pool = pool
         self.connect()
 
     def connect(self):
         try:
-            self.conn = sqlite3.connect(Config.DB_PATH)
-            self.conn.row_factory = sqlite3.Row  # Enable column access by name
+            self.conn = self.pool.acquire() if self.pool else _open_connection()
+            self.migrate()
         except Exception as e:
             print(f"Database connection error: {e}")
 
+    def migrate(self):
+        """Apply pending schema migrations (once per process)"""
+        global _migrated
+        if _migrated:
+            return
+        with _migrate_lock:
+            if _migrated:
+                return
+            while True:
+                # One transaction per step: sqlite3 does not open one for DDL by itself,
+                # and the step must commit together with its user_version bump
+                self.conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Read under the write lock, another process may have migrated meanwhile
+                    version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+                    if version >= len(MIGRATIONS):
+                        self.conn.rollback()
+                        break
+                    for statement in MIGRATIONS[version]:
+                        self.conn.execute(statement)
+                    self.conn.execute(f"PRAGMA user_version = {version + 1}")
+                    self.conn.commit()
+                except Exception:
+                    self.conn.rollback()
+                    raise
+            _migrated = True
+
     def execute_query(self, query, params=None, fetch=True):
+        started = time.perf_counter()
         try:
             cursor = self.conn.cursor()
             cursor.execute(query, params or ())
             if fetch:
                 rows = cursor.fetchall()
+                metrics.observe_query(query, started, len(rows))
                 # Convert to dict-like objects
                 return [dict(row) for row in rows]
             self.conn.commit()
+            # rowcount is -1 for statements that do not change rows (DDL, PRAGMA)
+            metrics.observe_query(query, started, max(cursor.rowcount, 0))
             return True
         except Exception as e:
             self.conn.rollback()
+            metrics.observe_query(query, started, failed=True)
             print(f"Query execution error: {e}")
             return None
 
+    def execute_insert(self, query, params, table=None):
+        """Run an INSERT and return the new row id (no second round trip).
+
+        table is the COUNTED_TABLES entry whose change counter to bump.
+        """
+        started = time.perf_counter()
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(query, params)
+            row_id = cursor.lastrowid
+            if table is not None:
+                cursor.execute(BUMP_COUNTER, (table,))
+            self.conn.commit()
+            metrics.observe_query(query, started, 1)
+            return row_id
+        except Exception as e:
+            self.conn.rollback()
+            metrics.observe_query(query, started, failed=True)
+            print(f"Insert error: {e}")
+            return None
+
+    def insert_many(self, table, query, rows):
+        """executemany in a single transaction; returns the new ids in row order.
+
+        BEGIN IMMEDIATE holds the write lock, so with AUTOINCREMENT the new
+        rows are exactly those above the previous maximum id.
+        """
+        started = time.perf_counter()
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            before = cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+            cursor.executemany(query, rows)
+            ids = [row[0] for row in cursor.execute(f"SELECT id FROM {table} WHERE id > ? ORDER BY id", (before,))]
+            if table in COUNTED_TABLES:
+                cursor.execute(BUMP_COUNTER, (table,))
+            self.conn.commit()
+            metrics.observe_query(query, started, len(ids))
+            return ids
+        except Exception as e:
+            self.conn.rollback()
+            metrics.observe_query(query, started, failed=True)
+            print(f"Bulk insert error: {e}")
+            return None
+
     def close(self):
         if self.conn:
-            self.conn.close()
+            if self.pool:
+                self.pool.release(self.conn)
+            else:
+                self.conn.close()
+            self.conn = None
+
+def _list_query(db, columns, from_clause, conditions=(), params=(), order='id',
+                after_condition=None, after=None, limit=None, fields=None):
+    """Run a list query with keyset pagination and a column projection.
+
+    columns maps output names to SQL expressions; fields selects a subset
+    (id is always included so it can be used as the next cursor).
+    Rows strictly after the row with id `after` in `order` are returned.
+    """
+    names = ['id'] + [name for name in fields if name != 'id'] if fields else list(columns)
+    select = ", ".join(f"{columns[name]} AS {name}" for name in names)
+    conditions, params = list(conditions), list(params)
+    if after is not None:
+        conditions.append(after_condition or f"{columns['id']} > ?")
+        params.append(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"SELECT {select} FROM {from_clause} {where} ORDER BY {order}"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return db.execute_query(query, params)
+
+class ChangeCounter:
+    @staticmethod
+    def versions(db, tables):
+        """Change counters for the given tables, in the same order"""
+        placeholders = ", ".join("?" for _ in tables)
+        query = f"SELECT table_name, version FROM change_counters WHERE table_name IN ({placeholders})"
+        result = db.execute_query(query, tuple(tables)) or []
+        versions = {row['table_name']: row['version'] for row in result}
+        return tuple(versions.get(table, 0) for table in tables)
 
 class Faculty:
+    COLUMNS = {name: name for name in
+               ('id', 'name', 'availability', 'max_hours', 'expertise', 'created_at', 'updated_at')}
+
     @staticmethod
-    def get_all(db):
-        query = "SELECT * FROM faculty ORDER BY id"
-        return db.execute_query(query)
+    def get_all(db, after=None, limit=None, fields=None):
+        return _list_query(db, Faculty.COLUMNS, "faculty", after=after, limit=limit, fields=fields)
     
     @staticmethod
     def get_by_id(db, faculty_id):
@@ -51,16 +316,20 @@ class Faculty:
             INSERT INTO faculty (name, availability, max_hours, expertise)
             VALUES (?, ?, ?, ?)
         """
-        db.execute_query(query, (name, availability, max_hours, expertise), fetch=False)
-        # Get the last inserted row id
-        result = db.execute_query("SELECT last_insert_rowid() as id")
-        return result[0]['id'] if result else None
+        return db.execute_insert(query, (name, availability, max_hours, expertise), 'faculty')
     
+    @staticmethod
+    def bulk_create(db, rows):
+        """Insert (name, availability, max_hours, expertise) rows; returns their ids"""
+        query = "INSERT INTO faculty (name, availability, max_hours, expertise) VALUES (?, ?, ?, ?)"
+        return db.insert_many('faculty', query, rows)
+
     @staticmethod
     def update(db, faculty_id, name, availability, max_hours, expertise):
         query = """
             UPDATE faculty
-            SET name = ?, availability = ?, max_hours = ?, expertise = ?
+            SET name = ?, availability = ?, max_hours = ?, expertise = ?,
+                updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """
         return db.execute_query(query, (name, availability, max_hours, expertise, faculty_id), fetch=False)
@@ -71,35 +340,56 @@ class Faculty:
         return db.execute_query(query, (faculty_id,), fetch=False)
 
 class Course:
+    COLUMNS = dict({name: f"c.{name}" for name in
+                    ('id', 'code', 'name', 'credits', 'type', 'faculty_id', 'hours_per_week', 'room_type',
+                     'enrollment', 'session_length', 'created_at', 'updated_at')},
+                   faculty_name="f.name")
+
+    @staticmethod
+    def get_all(db, faculty_id=None, course_type=None, room_type=None, after=None, limit=None, fields=None):
+        conditions, params = [], []
+        for column, value in (("c.faculty_id", faculty_id), ("c.type", course_type), ("c.room_type", room_type)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        from_clause = "courses c"
+        if not fields or 'faculty_name' in fields:
+            from_clause += " LEFT JOIN faculty f ON c.faculty_id = f.id"
+        return _list_query(db, Course.COLUMNS, from_clause, conditions, params, "c.id",
+                           after=after, limit=limit, fields=fields)
+    
     @staticmethod
-    def get_all(db):
+    def create(db, code, name, credits, course_type, faculty_id, hours_per_week,
+               room_type=None, enrollment=0, session_length=1):
         query = """
-            SELECT c.*, f.name as faculty_name 
-            FROM courses c
-            LEFT JOIN faculty f ON c.faculty_id = f.id
-            ORDER BY c.id
+            INSERT INTO courses (code, name, credits, type, faculty_id, hours_per_week, room_type, enrollment,
+                                 session_length)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return db.execute_query(query)
-    
+        return db.execute_insert(query, (code, name, credits, course_type, faculty_id, hours_per_week,
+                                         room_type, enrollment, session_length), 'courses')
+
     @staticmethod
-    def create(db, code, name, credits, course_type, faculty_id, hours_per_week):
+    def bulk_create(db, rows):
+        """Insert rows in Course.create argument order; returns their ids"""
         query = """
-            INSERT INTO courses (code, name, credits, type, faculty_id, hours_per_week)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO courses (code, name, credits, type, faculty_id, hours_per_week, room_type, enrollment,
+                                 session_length)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
-        db.execute_query(query, (code, name, credits, course_type, faculty_id, hours_per_week), fetch=False)
-        # Get the last inserted row id
-        result = db.execute_query("SELECT last_insert_rowid() as id")
-        return result[0]['id'] if result else None
+        return db.insert_many('courses', query, rows)
 
     @staticmethod
-    def update(db, course_id, code, name, credits, course_type, faculty_id, hours_per_week):
+    def update(db, course_id, code, name, credits, course_type, faculty_id, hours_per_week,
+               room_type=None, enrollment=0, session_length=1):
         query = """
             UPDATE courses
-            SET code = ?, name = ?, credits = ?, type = ?, faculty_id = ?, hours_per_week = ?
+            SET code = ?, name = ?, credits = ?, type = ?, faculty_id = ?, hours_per_week = ?,
+                room_type = ?, enrollment = ?, session_length = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """
-        return db.execute_query(query, (code, name, credits, course_type, faculty_id, hours_per_week, course_id), fetch=False)
+        return db.execute_query(query, (code, name, credits, course_type, faculty_id, hours_per_week,
+                                        room_type, enrollment, session_length, course_id), fetch=False)
 
     @staticmethod
     def delete(db, course_id):
@@ -107,10 +397,19 @@ class Course:
         return db.execute_query(query, (course_id,), fetch=False)
 
 class Room:
+    COLUMNS = {name: name for name in ('id', 'name', 'capacity', 'type', 'created_at', 'updated_at')}
+
     @staticmethod
-    def get_all(db):
-        query = "SELECT * FROM rooms ORDER BY id"
-        return db.execute_query(query)
+    def get_all(db, room_type=None, min_capacity=None, after=None, limit=None, fields=None):
+        conditions, params = [], []
+        if room_type is not None:
+            conditions.append("type = ?")
+            params.append(room_type)
+        if min_capacity is not None:
+            conditions.append("capacity >= ?")
+            params.append(min_capacity)
+        return _list_query(db, Room.COLUMNS, "rooms", conditions, params,
+                           after=after, limit=limit, fields=fields)
     
     @staticmethod
     def create(db, name, capacity, room_type):
@@ -118,16 +417,19 @@ class Room:
             INSERT INTO rooms (name, capacity, type)
             VALUES (?, ?, ?)
         """
-        db.execute_query(query, (name, capacity, room_type), fetch=False)
-        # Get the last inserted row id
-        result = db.execute_query("SELECT last_insert_rowid() as id")
-        return result[0]['id'] if result else None
+        return db.execute_insert(query, (name, capacity, room_type), 'rooms')
+
+    @staticmethod
+    def bulk_create(db, rows):
+        """Insert (name, capacity, type) rows; returns their ids"""
+        query = "INSERT INTO rooms (name, capacity, type) VALUES (?, ?, ?)"
+        return db.insert_many('rooms', query, rows)
 
     @staticmethod
     def update(db, room_id, name, capacity, room_type):
         query = """
             UPDATE rooms
-            SET name = ?, capacity = ?, type = ?
+            SET name = ?, capacity = ?, type = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """
         return db.execute_query(query, (name, capacity, room_type, room_id), fetch=False)
@@ -138,8 +440,111 @@ class Room:
         return db.execute_query(query, (room_id,), fetch=False)
 
 class Timetable:
+    COLUMNS = dict({name: f"t.{name}" for name in
+                    ('id', 'course_id', 'faculty_id', 'room_id', 'day', 'slot', 'created_at', 'day_idx', 'slot_idx',
+                     'version')},
+                   course_code="c.code", course_name="c.name", faculty_name="f.name", room_name="r.name")
+    JOINS = {
+        'c': "JOIN courses c ON t.course_id = c.id",
+        'f': "JOIN faculty f ON t.faculty_id = f.id",
+        'r': "JOIN rooms r ON t.room_id = r.id",
+    }
+
+    @staticmethod
+    def get_all(db, faculty_id=None, room_id=None, day=None, course_id=None, course_type=None,
+                after=None, limit=None, fields=None, version=None):
+        """Entries of a timetable version, the published one by default"""
+        if version is None:
+            conditions, params = [f"t.version = {CURRENT_VERSION}"], []
+        else:
+            conditions, params = ["t.version = ?"], [version]
+        for column, value in (("t.faculty_id", faculty_id), ("t.room_id", room_id),
+                              ("t.course_id", course_id), ("c.type", course_type)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if day is not None:
+            conditions.append("t.day_idx = ?")
+            params.append(Config.DAYS.index(day) if day in Config.DAYS else -1)
+
+        # Always joined, so rows whose course, faculty member or room was deleted
+        # are left out whatever the projection
+        from_clause = " ".join(["timetable t"] + list(Timetable.JOINS.values()))
+
+        # Keyset cursor: rows after the (day_idx, slot_idx, id) position of row `after`
+        after_condition = ("(t.day_idx, t.slot_idx, t.id) > "
+                           "(SELECT day_idx, slot_idx, id FROM timetable WHERE id = ?)")
+        return _list_query(db, Timetable.COLUMNS, from_clause, conditions, params,
+                           "t.day_idx, t.slot_idx, t.id", after_condition, after, limit, fields)
+
+    @staticmethod
+    def get_by_id(db, entry_id):
+        query = "SELECT * FROM timetable WHERE id = ?"
+        result = db.execute_query(query, (entry_id,))
+        return result[0] if result else None
+    
+    @staticmethod
+    def publish(db, timetable_data, mode, statistics, started_at, base_version=None, analytics=None):
+        """Store (course_id, faculty_id, room_id, day, slot) rows as a new version.
+
+        The rows, the generations row that makes them current and the pruning
+        of versions beyond Config.TIMETABLE_HISTORY_VERSIONS commit in one
+        transaction, so readers see either the old or the new timetable.
+        With base_version nothing is written unless that version is still the
+        current one. analytics (see analytics.build) is stored with the
+        generations row. Returns the new version, or None on failure.
+        """
+        query = """
+            INSERT INTO timetable (course_id, faculty_id, room_id, day, slot, day_idx, slot_idx, version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        day_index = {day: i for i, day in enumerate(Config.DAYS)}
+        slot_index = {slot: i for i, slot in enumerate(Config.TIME_SLOTS)}
+        started = time.perf_counter()
+        try:
+            cursor = db.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            if base_version is not None:
+                current = cursor.execute(f"SELECT {CURRENT_VERSION}").fetchone()[0]
+                if current != base_version:
+                    db.conn.rollback()
+                    metrics.observe_query(query, started, skipped=True)
+                    print(f"Timetable publish skipped: version {base_version} is no longer current")
+                    return None
+            # created_at is when the input data was read, so edits made during the solve count as changes next time
+            cursor.execute("INSERT INTO generations (mode, statistics, analytics, created_at) VALUES (?, ?, ?, ?)",
+                           (mode, json.dumps(statistics), json.dumps(analytics) if analytics else None, started_at))
+            version = cursor.lastrowid
+            cursor.executemany(query, (
+                (c_id, f_id, r_id, day, slot, day_index.get(day), slot_index.get(slot), version)
+                for c_id, f_id, r_id, day, slot in timetable_data
+            ))
+            cursor.execute(BUMP_COUNTER, ('timetable',))
+            cursor.execute("""
+                DELETE FROM timetable WHERE version < (
+                    SELECT MIN(id) FROM (SELECT id FROM generations ORDER BY id DESC LIMIT ?)
+                )
+            """, (max(1, Config.TIMETABLE_HISTORY_VERSIONS),))
+            db.conn.commit()
+            cursor.close()  # Close cursor after use
+            metrics.observe_query(query, started, len(timetable_data))
+            return version
+        except Exception as e:
+            db.conn.rollback()
+            metrics.observe_query(query, started, failed=True)
+            print(f"Timetable publish error: {e}")
+            return None
+
+    @staticmethod
+    def retained_versions(db):
+        """Versions whose entries are still stored, newest first"""
+        query = "SELECT id FROM generations ORDER BY id DESC LIMIT ?"
+        result = db.execute_query(query, (max(1, Config.TIMETABLE_HISTORY_VERSIONS),)) or []
+        return [row['id'] for row in result]
+
     @staticmethod
-    def get_all(db):
+    def diff(db, from_version, to_version):
+        """Entries of to_version missing from from_version ('added') and vice versa ('removed')"""
         query = """
             SELECT t.*, c.code as course_code, c.name as course_name,
                    f.name as faculty_name, r.name as room_name
@@ -147,32 +552,68 @@ class Timetable:
             JOIN courses c ON t.course_id = c.id
             JOIN faculty f ON t.faculty_id = f.id
             JOIN rooms r ON t.room_id = r.id
-            ORDER BY 
-                CASE t.day
-                    WHEN 'Monday' THEN 1
-                    WHEN 'Tuesday' THEN 2
-                    WHEN 'Wednesday' THEN 3
-                    WHEN 'Thursday' THEN 4
-                    WHEN 'Friday' THEN 5
-                END, t.slot
+            WHERE t.version = ? AND NOT EXISTS (
+                SELECT 1 FROM timetable o
+                WHERE o.version = ? AND o.course_id = t.course_id AND o.day_idx = t.day_idx
+                  AND o.slot_idx = t.slot_idx AND o.room_id = t.room_id AND o.faculty_id = t.faculty_id
+            )
+            ORDER BY t.day_idx, t.slot_idx, t.id
         """
-        return db.execute_query(query)
-    
+        added = db.execute_query(query, (to_version, from_version))
+        removed = db.execute_query(query, (from_version, to_version))
+        if added is None or removed is None:
+            return None
+        return {'added': added, 'removed': removed}
+
+class Generation:
     @staticmethod
-    def clear_all(db):
-        query = "DELETE FROM timetable"
-        return db.execute_query(query, fetch=False)
-    
+    def now(db):
+        """Database clock, in the same format as the created_at/updated_at columns"""
+        result = db.execute_query("SELECT CURRENT_TIMESTAMP as now")
+        return result[0]['now'] if result else None
+
     @staticmethod
-    def bulk_insert(db, timetable_data):
-        query = "INSERT INTO timetable (course_id, faculty_id, room_id, day, slot) VALUES (?, ?, ?, ?, ?)"
-        try:
-            cursor = db.conn.cursor()
-            cursor.executemany(query, timetable_data)
-            db.conn.commit()
-            cursor.close()  # Close cursor after use
-            return True
-        except Exception as e:
-            db.conn.rollback()
-            print(f"Bulk insert error: {e}")
-            return False
+    def current_version(db):
+        """Version of the stored timetable (0 before the first generation)"""
+        result = db.execute_query("SELECT COALESCE(MAX(id), 0) as version FROM generations")
+        return result[0]['version'] if result else 0
+
+    @staticmethod
+    def latest(db):
+        query = "SELECT * FROM generations ORDER BY id DESC LIMIT 1"
+        result = db.execute_query(query)
+        return result[0] if result else None
+
+    @staticmethod
+    def get_analytics(db, version):
+        """Stored analytics of a version: a dict, {} if none were stored, None if no such version"""
+        result = db.execute_query("SELECT analytics FROM generations WHERE id = ?", (version,))
+        if not result:
+            return None
+        return json.loads(result[0]['analytics']) if result[0]['analytics'] else {}
+
+    @staticmethod
+    def set_analytics(db, version, analytics):
+        query = "UPDATE generations SET analytics = ? WHERE id = ?"
+        return db.execute_query(query, (json.dumps(analytics), version), fetch=False)
+
+    @staticmethod
+    def changed_course_ids(db, since):
+        """Courses that need re-planning after edits made since a timestamp.
+
+        Covers courses created or edited, courses whose faculty member was
+        edited or deleted, and courses scheduled in a room that was edited
+        or deleted.
+        """
+        query = f"""
+            SELECT c.id FROM courses c
+            LEFT JOIN faculty f ON c.faculty_id = f.id
+            WHERE c.created_at >= ? OR c.updated_at >= ?
+               OR f.id IS NULL OR f.updated_at >= ?
+            UNION
+            SELECT t.course_id FROM timetable t
+            LEFT JOIN rooms r ON t.room_id = r.id
+            WHERE t.version = {CURRENT_VERSION} AND (r.id IS NULL OR r.updated_at >= ?)
+        """
+        result = db.execute_query(query, (since, since, since, since))
+        return {row['id'] for row in result} if result is not None else None
@@ -0,0 +1,226 @@
+import bisect
+import threading
+from config import Config
+from models import ChangeCounter, COUNTED_TABLES, Timetable, Course, Faculty, Room, Generation
+from solver_input import parse_availability, allowed_positions, room_fits
+
+# Bitset occupancy of the stored timetable. Bit d_idx * len(TIME_SLOTS) + s_idx
+# of an int is set when a faculty member, room or course has a class at that
+# (day, slot), so every clash check is a shift and an AND. The index of the
+# published timetable is refreshed incrementally from version diffs.
+
+def _count(bits):
+    return bin(bits).count('1')
+
+class OccupancyIndex:
+    """Faculty x slot, room x slot and course x slot bitsets over a set of entries.
+
+    Each position holds at most one class per faculty member, room and
+    course, so remove() assumes the indexed entries are clash-free.
+    """
+
+    def __init__(self, entries, courses, faculty, rooms, version=0):
+        self.version = version
+        self.num_slots = len(Config.TIME_SLOTS)
+        self.all_positions = (1 << (len(Config.DAYS) * self.num_slots)) - 1
+        self.day_index = {day: i for i, day in enumerate(Config.DAYS)}
+        self.slot_index = {slot: i for i, slot in enumerate(Config.TIME_SLOTS)}
+        self.set_reference(courses, faculty, rooms)
+        self.busy = {'faculty': {}, 'room': {}, 'course': {}}
+        for entry in entries:
+            self.add(entry)
+
+    def set_reference(self, courses, faculty, rooms):
+        """(Re)load course, faculty and room rows and the faculty availability bitsets"""
+        self.courses = {c['id']: c for c in courses}
+        self.faculty = {f['id']: f for f in faculty}
+        self.rooms = {r['id']: r for r in rooms}
+        self.available = {f_id: self.availability_bits(f.get('availability', {}))
+                          for f_id, f in self.faculty.items()}
+        # Rooms by capacity so capacity searches skip smaller rooms
+        self.rooms_by_capacity = sorted(self.rooms.values(), key=lambda r: r.get('capacity') or 0)
+        self.capacities = [r.get('capacity') or 0 for r in self.rooms_by_capacity]
+
+    def copy(self):
+        """Copy that can be updated without affecting readers of this index"""
+        index = object.__new__(OccupancyIndex)
+        index.__dict__.update(self.__dict__)
+        index.busy = {kind: dict(bits) for kind, bits in self.busy.items()}
+        return index
+
+    def availability_bits(self, availability):
+        """Bitset of positions allowed by a faculty availability value"""
+        bits = 0
+        allowed = allowed_positions(parse_availability(availability), Config.DAYS, Config.TIME_SLOTS)
+        for d_idx, s_idx in allowed:
+            bits |= 1 << (d_idx * self.num_slots + s_idx)
+        return bits
+
+    def position(self, day, slot):
+        """Bit position of a (day, slot) pair, or None if either is unknown"""
+        if day not in self.day_index or slot not in self.slot_index:
+            return None
+        return self.day_index[day] * self.num_slots + self.slot_index[slot]
+
+    def _faculty_id(self, entry):
+        if entry.get('faculty_id') is not None:
+            return entry['faculty_id']
+        return self.courses.get(entry.get('course_id'), {}).get('faculty_id')
+
+    def _keys(self, entry):
+        return (('faculty', self._faculty_id(entry)), ('room', entry.get('room_id')), ('course', entry.get('course_id')))
+
+    def add(self, entry):
+        position = self.position(entry.get('day'), entry.get('slot'))
+        if position is None:
+            return
+        for kind, key in self._keys(entry):
+            self.busy[kind][key] = self.busy[kind].get(key, 0) | (1 << position)
+
+    def remove(self, entry):
+        position = self.position(entry.get('day'), entry.get('slot'))
+        if position is None:
+            return
+        for kind, key in self._keys(entry):
+            self.busy[kind][key] = self.busy[kind].get(key, 0) & ~(1 << position)
+
+    def is_free(self, kind, key, position, ignore=None):
+        """Whether a faculty member, room or course is free, treating entry `ignore` as removed"""
+        if (ignore is not None and self.position(ignore.get('day'), ignore.get('slot')) == position
+                and dict(self._keys(ignore))[kind] == key):
+            return True
+        return not (self.busy[kind].get(key, 0) >> position) & 1
+
+    def conflicts(self, entry, ignore=None):
+        """Reasons an entry cannot be placed in the indexed timetable; empty if it fits.
+
+        ignore is an indexed entry to leave out, e.g. the one being moved.
+        """
+        position = self.position(entry.get('day'), entry.get('slot'))
+        if position is None:
+            return [{'type': 'invalid_slot', 'message': f"Unknown day or slot {entry.get('day')} {entry.get('slot')}"}]
+
+        course = self.courses.get(entry.get('course_id'))
+        room = self.rooms.get(entry.get('room_id'))
+        f_id = self._faculty_id(entry)
+        if course is None:
+            return [{'type': 'unknown_course', 'message': f"Unknown course {entry.get('course_id')}"}]
+        if room is None:
+            return [{'type': 'unknown_room', 'message': f"Unknown room {entry.get('room_id')}"}]
+
+        conflicts = []
+        if not self.is_free('faculty', f_id, position, ignore):
+            conflicts.append({'type': 'faculty_busy', 'faculty_id': f_id,
+                              'message': 'Faculty member already teaches at this time'})
+        if not self.is_free('room', room['id'], position, ignore):
+            conflicts.append({'type': 'room_busy', 'room_id': room['id'],
+                              'message': 'Room is already booked at this time'})
+        if not self.is_free('course', course['id'], position, ignore):
+            conflicts.append({'type': 'course_busy', 'course_id': course['id'],
+                              'message': 'Course already has a class at this time'})
+        if f_id in self.available and not (self.available[f_id] >> position) & 1:
+            conflicts.append({'type': 'faculty_unavailable', 'faculty_id': f_id,
+                              'message': 'Faculty member is not available at this time'})
+        if not room_fits(course, room):
+            conflicts.append({'type': 'room_unsuitable', 'room_id': room['id'],
+                              'message': 'Room type or capacity does not fit the course'})
+        return conflicts
+
+    def free_rooms(self, position, min_capacity=0, room_type=None):
+        """Rooms of at least min_capacity (and of room_type) with no class at a position"""
+        start = bisect.bisect_left(self.capacities, min_capacity)
+        return [room for room in self.rooms_by_capacity[start:]
+                if (room_type is None or room.get('type') == room_type)
+                and not (self.busy['room'].get(room['id'], 0) >> position) & 1]
+
+    def free_faculty(self, position):
+        """Faculty members available and not teaching at a position"""
+        return [f for f_id, f in self.faculty.items()
+                if (self.available[f_id] >> position) & 1
+                and not (self.busy['faculty'].get(f_id, 0) >> position) & 1]
+
+    def free_positions(self, faculty_id=None, room_id=None):
+        """(day, slot) pairs where the given faculty member and/or room are both free"""
+        free = self.all_positions
+        if faculty_id is not None:
+            free &= self.available.get(faculty_id, 0) & ~self.busy['faculty'].get(faculty_id, 0)
+        if room_id is not None:
+            free &= ~self.busy['room'].get(room_id, 0)
+        return [(Config.DAYS[position // self.num_slots], Config.TIME_SLOTS[position % self.num_slots])
+                for position in range(self.all_positions.bit_length()) if (free >> position) & 1]
+
+    def overloaded_faculty(self):
+        """Faculty members scheduled above their max_hours"""
+        return [
+            {'type': 'faculty_overloaded', 'faculty_id': f_id, 'hours': _count(bits),
+             'max_hours': self.faculty[f_id].get('max_hours', 20),
+             'message': 'Faculty member is scheduled above max_hours'}
+            for f_id, bits in self.busy['faculty'].items()
+            if f_id in self.faculty and _count(bits) > self.faculty[f_id].get('max_hours', 20)
+        ]
+
+def validate(entries, courses, faculty, rooms):
+    """Check entries one by one against those before them.
+
+    Returns a list of {'entry': position in entries, 'conflicts': [...]} plus
+    workload violations as {'entry': None, 'conflicts': [...]}.
+    """
+    index = OccupancyIndex([], courses, faculty, rooms)
+    problems = []
+    for number, entry in enumerate(entries):
+        conflicts = index.conflicts(entry)
+        if conflicts:
+            problems.append({'entry': number, 'conflicts': conflicts})
+        index.add(entry)
+    overloaded = index.overloaded_faculty()
+    if overloaded:
+        problems.append({'entry': None, 'conflicts': overloaded})
+    return problems
+
+_cached = {'key': None, 'index': None}
+_lock = threading.Lock()
+
+def _build(db):
+    version = Generation.current_version(db)
+    entries = Timetable.get_all(db, version=version, fields=['faculty_id', 'room_id', 'course_id', 'day', 'slot'])
+    return OccupancyIndex(entries or [], Course.get_all(db) or [], Faculty.get_all(db) or [],
+                          Room.get_all(db) or [], version)
+
+def _refresh(db, cached, changed):
+    """Apply a timetable diff to a cached index, or None if only a rebuild will do"""
+    # A deleted course, faculty member or room drops its rows from every
+    # (joined) timetable query without a new version to diff against
+    if changed != {'timetable'}:
+        return None
+    version = Generation.current_version(db)
+    if version == cached.version or cached.version not in Timetable.retained_versions(db):
+        return None
+    changes = Timetable.diff(db, cached.version, version)
+    if changes is None:
+        return None
+    index = cached.copy()
+    for entry in changes['removed']:
+        index.remove(entry)
+    for entry in changes['added']:
+        index.add(entry)
+    index.version = version
+    return index
+
+def current_index(db):
+    """Index of the published timetable, kept in step with the change counters"""
+    key = ChangeCounter.versions(db, COUNTED_TABLES)
+    with _lock:
+        cached, cached_key = _cached['index'], _cached['key']
+    if cached_key == key:
+        return cached
+
+    index = None
+    if cached is not None:
+        changed = {table for table, old, new in zip(COUNTED_TABLES, cached_key, key) if old != new}
+        index = _refresh(db, cached, changed)
+    if index is None:
+        index = _build(db)
+    with _lock:
+        _cached['key'] = key
+        _cached['index'] = index
+    return index
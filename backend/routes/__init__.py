@@ -1,14 +1,29 @@
 from flask import Blueprint
+from models import close_db
+from config import Config
+# Not `import metrics`: importing .metrics below rebinds that name to the routes submodule
+from metrics import init_app as init_metrics
 
 def register_routes(app):
+    # Return pooled database connections at the end of every request
+    app.teardown_appcontext(close_db)
+
     from .auth import auth_bp
     from .faculty import faculty_bp
     from .courses import courses_bp
     from .rooms import rooms_bp
     from .timetable import timetable_bp
+    from .jobs import jobs_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(faculty_bp, url_prefix='/api')
     app.register_blueprint(courses_bp, url_prefix='/api')
     app.register_blueprint(rooms_bp, url_prefix='/api')
     app.register_blueprint(timetable_bp, url_prefix='/api')
+    app.register_blueprint(jobs_bp, url_prefix='/api')
+
+    # Request latency and counts, exposed for Prometheus on /metrics (outside /api)
+    if Config.METRICS_ENABLED:
+        from .metrics import metrics_bp
+        init_metrics(app)
+        app.register_blueprint(metrics_bp)
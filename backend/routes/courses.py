@@ -1,22 +1,34 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from models import Database, Course
+from models import get_db, Course
+from utils.bulk import import_rows, course_validator
+from utils.read_cache import cached_list_response
+from utils.pagination import list_args
 
 courses_bp = Blueprint('courses', __name__)
 
+COURSE_FILTERS = {
+    'faculty_id': ('faculty_id', int),
+    'type': ('course_type', str),
+    'room_type': ('room_type', str),
+}
+
 @courses_bp.route('/courses', methods=['GET'])
 @jwt_required()
 def get_courses():
-    db = Database()
-    courses = Course.get_all(db)
-    db.close()
-    return jsonify({'success': True, 'data': courses}), 200
+    """Course list; supports filters, ?after=&limit= and fields="""
+    try:
+        kwargs = list_args(request.args, Course.COLUMNS, COURSE_FILTERS)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    db = get_db()
+    return cached_list_response(db, ('courses', 'faculty'), lambda: Course.get_all(db, **kwargs), kwargs['limit'])
 
 @courses_bp.route('/courses', methods=['POST'])
 @jwt_required()
 def create_course():
     data = request.get_json()
-    db = Database()
+    db = get_db()
     
     course_id = Course.create(
         db,
@@ -25,19 +37,29 @@ def create_course():
         data['credits'],
         data['type'],
         data['faculty_id'],
-        data.get('hours_per_week', data['credits'])
+        data.get('hours_per_week', data['credits']),
+        data.get('room_type'),
+        data.get('enrollment', 0),
+        data.get('session_length', 1)
     )
-    db.close()
     
     if course_id:
         return jsonify({'success': True, 'id': course_id}), 201
     return jsonify({'success': False, 'message': 'Failed to create course'}), 500
 
+@courses_bp.route('/courses/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_courses():
+    """Create many rows from a JSON array, CSV or NDJSON body"""
+    db = get_db()
+    body, status = import_rows(request, course_validator(db), lambda rows: Course.bulk_create(db, rows))
+    return jsonify(body), status
+
 @courses_bp.route('/courses/<int:course_id>', methods=['PUT'])
 @jwt_required()
 def update_course(course_id):
     data = request.get_json()
-    db = Database()
+    db = get_db()
     
     success = Course.update(
         db,
@@ -47,9 +69,11 @@ def update_course(course_id):
         data['credits'],
         data['type'],
         data['faculty_id'],
-        data.get('hours_per_week', data['credits'])
+        data.get('hours_per_week', data['credits']),
+        data.get('room_type'),
+        data.get('enrollment', 0),
+        data.get('session_length', 1)
     )
-    db.close()
     
     if success:
         return jsonify({'success': True}), 200
@@ -58,9 +82,8 @@ def update_course(course_id):
 @courses_bp.route('/courses/<int:course_id>', methods=['DELETE'])
 @jwt_required()
 def delete_course(course_id):
-    db = Database()
+    db = get_db()
     success = Course.delete(db, course_id)
-    db.close()
     
     if success:
         return jsonify({'success': True}), 200
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from models import Database, Faculty
+from models import get_db, Faculty
+from utils.bulk import import_rows, faculty_row
+from utils.read_cache import cached_list_response
+from utils.pagination import list_args
 import json
 
 faculty_bp = Blueprint('faculty', __name__)
@@ -8,17 +11,27 @@ faculty_bp = Blueprint('faculty', __name__)
 @faculty_bp.route('/faculty', methods=['GET'])
 @jwt_required()
 def get_faculty():
-    db = Database()
-    faculty_list = Faculty.get_all(db)
-    db.close()
-    return jsonify({'success': True, 'data': faculty_list}), 200
+    """Faculty list; supports ?after=&limit= and fields="""
+    try:
+        kwargs = list_args(request.args, Faculty.COLUMNS)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    db = get_db()
+    return cached_list_response(db, ('faculty',), lambda: Faculty.get_all(db, **kwargs), kwargs['limit'])
+
+@faculty_bp.route('/faculty/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_faculty():
+    """Create many rows from a JSON array, CSV or NDJSON body"""
+    db = get_db()
+    body, status = import_rows(request, faculty_row, lambda rows: Faculty.bulk_create(db, rows))
+    return jsonify(body), status
 
 @faculty_bp.route('/faculty/<int:faculty_id>', methods=['GET'])
 @jwt_required()
 def get_faculty_by_id(faculty_id):
-    db = Database()
+    db = get_db()
     faculty = Faculty.get_by_id(db, faculty_id)
-    db.close()
     if faculty:
         return jsonify({'success': True, 'data': faculty}), 200
     return jsonify({'success': False, 'message': 'Faculty not found'}), 404
@@ -27,7 +40,7 @@ def get_faculty_by_id(faculty_id):
 @jwt_required()
 def create_faculty():
     data = request.get_json()
-    db = Database()
+    db = get_db()
     
     availability = json.dumps(data.get('availability', {}))
     faculty_id = Faculty.create(
@@ -37,7 +50,6 @@ def create_faculty():
         data.get('max_hours', 20),
         data.get('expertise', '')
     )
-    db.close()
     
     if faculty_id:
         return jsonify({'success': True, 'id': faculty_id}), 201
@@ -47,7 +59,7 @@ def create_faculty():
 @jwt_required()
 def update_faculty(faculty_id):
     data = request.get_json()
-    db = Database()
+    db = get_db()
     
     availability = json.dumps(data.get('availability', {}))
     success = Faculty.update(
@@ -58,7 +70,6 @@ def update_faculty(faculty_id):
         data.get('max_hours', 20),
         data.get('expertise', '')
     )
-    db.close()
     
     if success:
         return jsonify({'success': True}), 200
@@ -67,9 +78,8 @@ def update_faculty(faculty_id):
 @faculty_bp.route('/faculty/<int:faculty_id>', methods=['DELETE'])
 @jwt_required()
 def delete_faculty(faculty_id):
-    db = Database()
+    db = get_db()
     success = Faculty.delete(db, faculty_id)
-    db.close()
     
     if success:
         return jsonify({'success': True}), 200
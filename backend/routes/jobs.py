@@ -0,0 +1,59 @@
+from flask import Blueprint, Response, request, jsonify
+from flask_jwt_extended import jwt_required
+import jobs
+import json
+import time
+
+jobs_bp = Blueprint('jobs', __name__)
+
+# Comment line sent while a job is quiet so proxies keep the stream open
+KEEPALIVE_SECONDS = 15
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, 'data': job}), 200
+
+@jobs_bp.route('/jobs/<job_id>/events', methods=['GET'])
+@jwt_required()
+def stream_job_events(job_id):
+    """Server-Sent Events: phase and improving-solution events, then done.
+
+    Resumes after the Last-Event-ID header (or ?after=) on reconnect.
+    """
+    if jobs.get(job_id) is None:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    after = request.headers.get('Last-Event-ID', type=int) or request.args.get('after', 0, type=int)
+
+    def stream():
+        quiet_since = time.monotonic()
+        for event in jobs.follow(job_id, after):
+            if event is None:
+                if time.monotonic() - quiet_since >= KEEPALIVE_SECONDS:
+                    quiet_since = time.monotonic()
+                    yield ': keep-alive\n\n'
+                continue
+            quiet_since = time.monotonic()
+            event_id = f"id: {event['seq']}\n" if 'seq' in event else ''
+            yield f"{event_id}event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@jobs_bp.route('/jobs/<job_id>/stop', methods=['POST'])
+@jwt_required()
+def stop_job(job_id):
+    """Stop the solver early and save the best timetable found so far"""
+    if not jobs.stop(job_id):
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True}), 200
+
+@jobs_bp.route('/jobs/<job_id>', methods=['DELETE'])
+@jwt_required()
+def cancel_job(job_id):
+    if not jobs.cancel(job_id):
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True}), 200
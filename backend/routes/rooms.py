@@ -1,38 +1,55 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from models import Database, Room
+from models import get_db, Room
+from utils.bulk import import_rows, room_row
+from utils.read_cache import cached_list_response
+from utils.pagination import list_args
 
 rooms_bp = Blueprint('rooms', __name__)
 
+ROOM_FILTERS = {
+    'type': ('room_type', str),
+    'min_capacity': ('min_capacity', int),
+}
+
 @rooms_bp.route('/rooms', methods=['GET'])
 @jwt_required()
 def get_rooms():
-    db = Database()
-    rooms = Room.get_all(db)
-    db.close()
-    return jsonify({'success': True, 'data': rooms}), 200
+    """Room list; supports filters, ?after=&limit= and fields="""
+    try:
+        kwargs = list_args(request.args, Room.COLUMNS, ROOM_FILTERS)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    db = get_db()
+    return cached_list_response(db, ('rooms',), lambda: Room.get_all(db, **kwargs), kwargs['limit'])
 
 @rooms_bp.route('/rooms', methods=['POST'])
 @jwt_required()
 def create_room():
     data = request.get_json()
-    db = Database()
+    db = get_db()
     
     room_id = Room.create(db, data['name'], data['capacity'], data['type'])
-    db.close()
     
     if room_id:
         return jsonify({'success': True, 'id': room_id}), 201
     return jsonify({'success': False, 'message': 'Failed to create room'}), 500
 
+@rooms_bp.route('/rooms/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_rooms():
+    """Create many rows from a JSON array, CSV or NDJSON body"""
+    db = get_db()
+    body, status = import_rows(request, room_row, lambda rows: Room.bulk_create(db, rows))
+    return jsonify(body), status
+
 @rooms_bp.route('/rooms/<int:room_id>', methods=['PUT'])
 @jwt_required()
 def update_room(room_id):
     data = request.get_json()
-    db = Database()
+    db = get_db()
     
     success = Room.update(db, room_id, data['name'], data['capacity'], data['type'])
-    db.close()
     
     if success:
         return jsonify({'success': True}), 200
@@ -41,9 +58,8 @@ def update_room(room_id):
 @rooms_bp.route('/rooms/<int:room_id>', methods=['DELETE'])
 @jwt_required()
 def delete_room(room_id):
-    db = Database()
+    db = get_db()
     success = Room.delete(db, room_id)
-    db.close()
     
     if success:
         return jsonify({'success': True}), 200
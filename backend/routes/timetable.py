@@ -1,102 +1,358 @@
 from flask import Blueprint, request, jsonify, send_file
 from flask_jwt_extended import jwt_required
-from models import Database, Timetable, Course, Faculty, Room
-from scheduler import TimetableScheduler
-from utils.export import export_to_pdf, export_to_excel
+from models import get_db, Timetable, Course, Faculty, Room, Generation
+from solver_input import solver_params_from, ENGINE_NAMES
+from generation import run_generation, GENERATION_MODES
+import jobs
+from utils.export import (EXPORTERS, BUNDLE_KEYS, PDF_MIMETYPE, EXCEL_MIMETYPE, ZIP_MIMETYPE,
+                          export_bundle)
 from utils.ai_summary import generate_ai_summary
+from utils.export_cache import export_cache
+from utils.read_cache import cached_list_response
+from utils.pagination import list_args
+from feasibility import precheck
+import occupancy
+import metrics
+import io
+import math
+from config import Config
 
 timetable_bp = Blueprint('timetable', __name__)
 
+TIMETABLE_FILTERS = {
+    'faculty_id': ('faculty_id', int),
+    'room_id': ('room_id', int),
+    'course_id': ('course_id', int),
+    'day': ('day', str),
+    'course_type': ('course_type', str),
+    'version': ('version', int),
+}
+
 @timetable_bp.route('/timetable', methods=['GET'])
 @jwt_required()
 def get_timetable():
-    db = Database()
-    timetable = Timetable.get_all(db)
-    db.close()
-    return jsonify({'success': True, 'data': timetable}), 200
+    """Timetable entries; supports filters, ?after=&limit= and fields="""
+    try:
+        kwargs = list_args(request.args, Timetable.COLUMNS, TIMETABLE_FILTERS)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    db = get_db()
+    # The cursor is a row position; once its version is pruned there is nothing to continue from
+    if kwargs['after'] is not None and Timetable.get_by_id(db, kwargs['after']) is None:
+        return jsonify({'success': False, 'message': 'Cursor expired; restart from the first page'}), 400
+    return cached_list_response(db, ('timetable', 'courses', 'faculty', 'rooms'),
+                                lambda: Timetable.get_all(db, **kwargs), kwargs['limit'])
 
-@timetable_bp.route('/generate-timetable', methods=['POST'])
+@timetable_bp.route('/timetable/diff', methods=['GET'])
 @jwt_required()
-def generate_timetable():
-    db = Database()
-    
-    # Fetch all data
-    courses = Course.get_all(db)
-    faculty = Faculty.get_all(db)
-    rooms = Room.get_all(db)
-    
-    if not courses or not faculty or not rooms:
-        db.close()
-        return jsonify({
-            'success': False, 
-            'message': 'Insufficient data. Add courses, faculty, and rooms first.'
-        }), 400
-    
-    # Generate timetable using AI scheduler
-    scheduler = TimetableScheduler(courses, faculty, rooms)
-    timetable = scheduler.generate_timetable()
-    
-    if not timetable:
-        db.close()
+def get_timetable_diff():
+    """Entries added and removed between two retained versions (?from=&to=, to defaults to current)"""
+    db = get_db()
+    retained = Timetable.retained_versions(db)
+    try:
+        from_version = int(request.args['from'])
+        to_version = int(request.args.get('to') or Generation.current_version(db))
+    except (KeyError, ValueError):
+        return jsonify({'success': False, 'message': 'from (and optional to) must be version numbers'}), 400
+
+    missing = [v for v in (from_version, to_version) if v not in retained]
+    if missing:
         return jsonify({
             'success': False,
-            'message': 'Could not generate feasible timetable. Check constraints.'
-        }), 400
-    
-    # Clear existing timetable and insert new one
-    Timetable.clear_all(db)
-    
-    timetable_data = [
-        (entry['course_id'], entry['faculty_id'], entry['room_id'], 
-         entry['day'], entry['slot'])
-        for entry in timetable
-    ]
-    
-    success = Timetable.bulk_insert(db, timetable_data)
-    stats = scheduler.get_statistics(timetable)
-    
-    db.close()
-    
-    if success:
-        return jsonify({
-            'success': True,
-            'data': timetable,
-            'statistics': stats
-        }), 200
-    
-    return jsonify({'success': False, 'message': 'Failed to save timetable'}), 500
+            'message': f"Version {missing[0]} is not retained",
+            'retained_versions': retained
+        }), 404
+
+    changes = Timetable.diff(db, from_version, to_version)
+    if changes is None:
+        return jsonify({'success': False, 'message': 'Failed to compute diff'}), 500
+    return jsonify({'success': True, 'from': from_version, 'to': to_version, **changes}), 200
+
+@timetable_bp.route('/timetable/validate', methods=['POST'])
+@jwt_required()
+def validate_timetable():
+    """Clash check of {"entries": [...]} (course_id, room_id, day, slot), or of the stored timetable"""
+    data = request.get_json(silent=True) or {}
+    db = get_db()
+    entries = data.get('entries')
+    if entries is None:
+        entries = Timetable.get_all(db) or []
+    elif not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+        return jsonify({'success': False, 'message': 'entries must be a list of objects'}), 400
+
+    problems = occupancy.validate(entries, Course.get_all(db) or [], Faculty.get_all(db) or [],
+                                  Room.get_all(db) or [])
+    return jsonify({'success': True, 'valid': not problems, 'conflicts': problems}), 200
+
+@timetable_bp.route('/timetable/move', methods=['POST'])
+@jwt_required()
+def move_timetable_entry():
+    """Move one class to {"day", "slot"} and optionally {"room_id"}; publishes a new version.
+
+    ?dry_run=1 only reports whether the move fits.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        entry_id = int(data['entry_id'])
+        room_id = int(data['room_id']) if data.get('room_id') is not None else None
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'entry_id (and optional room_id) must be integers'}), 400
+
+    db = get_db()
+    index = occupancy.current_index(db)
+    entry = Timetable.get_by_id(db, entry_id)
+    if entry is None or entry['version'] != index.version:
+        return jsonify({'success': False, 'message': 'Entry not found in the current timetable'}), 404
+
+    target = dict(entry, day=data.get('day', entry['day']), slot=data.get('slot', entry['slot']),
+                  room_id=room_id or entry['room_id'])
+    conflicts = index.conflicts(target, ignore=entry)
+    if conflicts:
+        return jsonify({'success': False, 'message': 'Move conflicts with the timetable', 'conflicts': conflicts}), 409
+    if request.args.get('dry_run') in ('1', 'true'):
+        return jsonify({'success': True, 'valid': True, 'conflicts': []}), 200
+
+    moved = {'entry_id': entry_id, 'course_id': entry['course_id'],
+             'from': {'day': entry['day'], 'slot': entry['slot'], 'room_id': entry['room_id']},
+             'to': {'day': target['day'], 'slot': target['slot'], 'room_id': target['room_id']}}
+    entries = Timetable.get_all(db, version=index.version,
+                                fields=['course_id', 'faculty_id', 'room_id', 'day', 'slot']) or []
+    entries = [target if e['id'] == entry_id else e for e in entries]
+    rows = [(e['course_id'], e['faculty_id'], e['room_id'], e['day'], e['slot']) for e in entries]
+    import analytics
+    summary = analytics.build(entries, list(index.courses.values()), list(index.faculty.values()),
+                              list(index.rooms.values()))
+    # Keep the last generation's timestamp so incremental runs still see edits made before the move
+    last = Generation.latest(db)
+    version = Timetable.publish(db, rows, 'move', {'moved': moved, 'total_classes': len(rows)},
+                                last['created_at'] if last else Generation.now(db), base_version=index.version,
+                                analytics=summary)
+    if version is None:
+        if Generation.current_version(db) != index.version:
+            return jsonify({'success': False, 'message': 'Timetable changed during the move; retry'}), 409
+        return jsonify({'success': False, 'message': 'Failed to save timetable'}), 500
+
+    export_cache.invalidate()
+    return jsonify({'success': True, 'version': version, 'moved': moved}), 200
+
+def _position_arg(index):
+    position = index.position(request.args.get('day'), request.args.get('slot'))
+    if position is None:
+        raise ValueError('day and slot must be one of the configured days and time slots')
+    return position
+
+@timetable_bp.route('/timetable/free-rooms', methods=['GET'])
+@jwt_required()
+def find_free_rooms():
+    """Rooms free at ?day=&slot=, optionally with ?min_capacity= and ?type="""
+    db = get_db()
+    index = occupancy.current_index(db)
+    try:
+        position = _position_arg(index)
+        min_capacity = int(request.args.get('min_capacity', 0))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    rooms = index.free_rooms(position, min_capacity, request.args.get('type') or None)
+    return jsonify({'success': True, 'version': index.version, 'data': rooms}), 200
+
+@timetable_bp.route('/timetable/free-faculty', methods=['GET'])
+@jwt_required()
+def find_free_faculty():
+    """Faculty members available and not teaching at ?day=&slot="""
+    db = get_db()
+    index = occupancy.current_index(db)
+    try:
+        position = _position_arg(index)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    faculty = [{'id': f['id'], 'name': f['name'], 'expertise': f.get('expertise')}
+               for f in index.free_faculty(position)]
+    return jsonify({'success': True, 'version': index.version, 'data': faculty}), 200
+
+@timetable_bp.route('/timetable/free-slots', methods=['GET'])
+@jwt_required()
+def find_free_slots():
+    """(day, slot) pairs where ?faculty_id= and/or ?room_id= are all free"""
+    try:
+        faculty_id = int(request.args['faculty_id']) if request.args.get('faculty_id') else None
+        room_id = int(request.args['room_id']) if request.args.get('room_id') else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'faculty_id and room_id must be integers'}), 400
+    if faculty_id is None and room_id is None:
+        return jsonify({'success': False, 'message': 'faculty_id or room_id is required'}), 400
+
+    db = get_db()
+    index = occupancy.current_index(db)
+    if (faculty_id is not None and faculty_id not in index.faculty) or (room_id is not None and room_id not in index.rooms):
+        return jsonify({'success': False, 'message': 'Faculty or room not found'}), 404
+    slots = [{'day': day, 'slot': slot} for day, slot in index.free_positions(faculty_id, room_id)]
+    return jsonify({'success': True, 'version': index.version, 'data': slots}), 200
+
+@timetable_bp.route('/timetable/precheck', methods=['GET'])
+@jwt_required()
+def precheck_timetable():
+    """Counting checks that prove the current courses, faculty and rooms cannot be scheduled"""
+    db = get_db()
+    problems = precheck(Course.get_all(db) or [], Faculty.get_all(db) or [], Room.get_all(db) or [])
+    return jsonify({'success': True, 'feasible': not problems, 'problems': problems}), 200
+
+@timetable_bp.route('/generate-timetable', methods=['POST'])
+@jwt_required()
+def generate_timetable():
+    # Solver budget: JSON body {"solver": {...}} and/or query args override Config defaults
+    data = request.get_json(silent=True) or {}
+    overrides = dict(data.get('solver', {}))
+    for key in ('max_time_seconds', 'num_workers', 'random_seed', 'first_feasible'):
+        if key in request.args:
+            overrides[key] = request.args[key]
+    try:
+        solver_params = solver_params_from(overrides)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'message': f'Invalid solver parameters: {e}'}), 400
+
+    mode = request.args.get('mode', data.get('mode', 'full'))
+    if mode not in GENERATION_MODES:
+        return jsonify({'success': False, 'message': f'Invalid mode: {mode}'}), 400
+    pin_unchanged = request.args.get('pin_unchanged', str(data.get('pin_unchanged', False))).lower() in ('1', 'true')
+    engine = request.args.get('engine', data.get('engine', 'grid'))
+    if engine not in ENGINE_NAMES:
+        return jsonify({'success': False, 'message': f'Invalid engine: {engine}'}), 400
+    decompose = request.args.get('decompose', str(data.get('decompose', False))).lower() in ('1', 'true')
+    use_cache = request.args.get('cache', str(data.get('cache', True))).lower() not in ('0', 'false')
+    warm_start = request.args.get('warm_start', str(data.get('warm_start', False))).lower() in ('1', 'true')
+    run_precheck = request.args.get('precheck', str(data.get('precheck', True))).lower() not in ('0', 'false')
+    explain_seconds = request.args.get('explain_seconds', data.get('explain_seconds'))
+    if explain_seconds is not None:
+        try:
+            explain_seconds = float(explain_seconds)
+        except (TypeError, ValueError):
+            explain_seconds = math.nan
+        if not math.isfinite(explain_seconds) or explain_seconds <= 0:
+            return jsonify({'success': False, 'message': 'explain_seconds must be a positive finite number'}), 400
+    options = {'solver': solver_params, 'mode': mode, 'pin_unchanged': pin_unchanged,
+               'engine': engine, 'decompose': decompose, 'use_cache': use_cache, 'warm_start': warm_start,
+               'precheck': run_precheck, 'explain_seconds': explain_seconds}
+
+    if request.args.get('async') in ('1', 'true'):
+        try:
+            job_id = jobs.submit(options)
+        except jobs.TooManyJobs as e:
+            return jsonify({'success': False, 'message': f'Too many generation jobs: {e}'}), 429
+        return jsonify({'success': True, 'job_id': job_id}), 202
+
+    body, status = run_generation(options)
+    metrics.record_generation(body, status, options)
+    if body.get('success'):
+        export_cache.invalidate()
+    return jsonify(body), status
+
+EXPORT_FORMATS = {
+    'pdf': (PDF_MIMETYPE, 'pdf'),
+    'excel': (EXCEL_MIMETYPE, 'xlsx'),
+}
+
+def _send_export(data, mimetype, download_name, version):
+    response = send_file(io.BytesIO(data), mimetype=mimetype, as_attachment=True, download_name=download_name)
+    response.headers['X-Timetable-Version'] = str(version)
+    return response
 
 @timetable_bp.route('/export', methods=['GET'])
 @jwt_required()
 def export_timetable():
+    """Export the whole timetable, or ?view=faculty|room&id= or ?view=day&day="""
     format_type = request.args.get('format', 'pdf')
-    
-    db = Database()
-    timetable = Timetable.get_all(db)
-    db.close()
-    
-    if not timetable:
-        return jsonify({'success': False, 'message': 'No timetable to export'}), 400
-    
-    if format_type == 'pdf':
-        file_path = export_to_pdf(timetable)
-        return send_file(file_path, as_attachment=True, download_name='timetable.pdf')
-    elif format_type == 'excel':
-        file_path = export_to_excel(timetable)
-        return send_file(file_path, as_attachment=True, download_name='timetable.xlsx')
-    
-    return jsonify({'success': False, 'message': 'Invalid format'}), 400
+    if format_type not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': 'Invalid format'}), 400
+    mimetype, extension = EXPORT_FORMATS[format_type]
+
+    view = request.args.get('view', 'all')
+    filters = {}
+    if view in ('faculty', 'room'):
+        filter_id = request.args.get('id', type=int)
+        if filter_id is None:
+            return jsonify({'success': False, 'message': f'id is required for the {view} view'}), 400
+        filters[f'{view}_id'] = filter_id
+        view_key = f'{view}:{filter_id}'
+    elif view == 'day':
+        day = request.args.get('day')
+        if day not in Config.DAYS:
+            return jsonify({'success': False, 'message': 'Invalid day'}), 400
+        filters['day'] = day
+        view_key = f'day:{day}'
+    elif view == 'all':
+        view_key = 'all'
+    else:
+        return jsonify({'success': False, 'message': 'Invalid view'}), 400
+
+    db = get_db()
+    version = Generation.current_version(db)
+    data = export_cache.get(version, format_type, view_key)
+
+    if data is None:
+        timetable = Timetable.get_all(db, version=version, **filters)
+        if not timetable:
+            return jsonify({'success': False, 'message': 'No timetable to export'}), 400
+        data = EXPORTERS[format_type](timetable, view).getvalue()
+        export_cache.put(version, format_type, view_key, data)
+
+    download_name = f"timetable-{view_key.replace(':', '-')}.{extension}" if view != 'all' else f'timetable.{extension}'
+    return _send_export(data, mimetype, download_name, version)
+
+@timetable_bp.route('/export/bundle', methods=['GET'])
+@jwt_required()
+def export_timetable_bundle():
+    """Zip of one document per faculty member (?by=faculty) or room (?by=room)"""
+    format_type = request.args.get('format', 'pdf')
+    if format_type not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': 'Invalid format'}), 400
+    by = request.args.get('by', 'faculty')
+    if by not in BUNDLE_KEYS:
+        return jsonify({'success': False, 'message': 'Invalid bundle type'}), 400
+    view_key = f'bundle:{by}'
+
+    db = get_db()
+    version = Generation.current_version(db)
+    data = export_cache.get(version, format_type, view_key)
+
+    if data is None:
+        timetable = Timetable.get_all(db, version=version)
+        if not timetable:
+            return jsonify({'success': False, 'message': 'No timetable to export'}), 400
+        data = export_bundle(timetable, by, format_type).getvalue()
+        export_cache.put(version, format_type, view_key, data)
+
+    return _send_export(data, ZIP_MIMETYPE, f'timetable-{by}-{format_type}.zip', version)
 
 @timetable_bp.route('/ai-summary', methods=['GET'])
 @jwt_required()
 def get_ai_summary():
-    db = Database()
-    timetable = Timetable.get_all(db)
-    faculty = Faculty.get_all(db)
-    courses = Course.get_all(db)
-    rooms = Room.get_all(db)
-    db.close()
-    
-    summary = generate_ai_summary(timetable, faculty, courses, rooms)
-    
-    return jsonify({'success': True, 'summary': summary}), 200
+    """Summary of the analytics stored with the current version (?version= for a retained one)"""
+    db = get_db()
+    requested = request.args.get('version')
+    if requested is None:
+        version = Generation.current_version(db)
+    else:
+        try:
+            version = int(requested)
+        except ValueError:
+            return jsonify({'success': False, 'message': 'version must be a version number'}), 400
+    stored = Generation.get_analytics(db, version) if version else None
+    if stored is None:
+        if requested is not None:
+            return jsonify({'success': False, 'message': f'Version {version} not found'}), 404
+        return jsonify({'success': True, 'version': 0, 'summary': generate_ai_summary(None)}), 200
+
+    if not stored:
+        # Published before analytics were stored: compute them once
+        if version not in Timetable.retained_versions(db):
+            return jsonify({'success': False, 'message': f'Version {version} is not retained'}), 404
+        timetable = Timetable.get_all(db, version=version, fields=['faculty_id', 'room_id', 'day', 'slot'])
+        if timetable is None:
+            return jsonify({'success': False, 'message': 'Failed to load timetable'}), 500
+        import analytics
+        stored = analytics.build(timetable, Course.get_all(db) or [], Faculty.get_all(db) or [],
+                                 Room.get_all(db) or [])
+        Generation.set_analytics(db, version, stored)
+
+    summary = generate_ai_summary(stored)
+    return jsonify({'success': True, 'version': version, 'summary': summary, 'analytics': stored}), 200
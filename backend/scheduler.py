@@ -1,9 +1,30 @@
 from ortools.sat.python import cp_model
 from config import Config
-import json
+from solver_input import solver_params_from, parse_availability, allowed_positions, room_fits
+import time
+
+class SolutionProgress(cp_model.CpSolverSolutionCallback):
+    """Reports every improving solution to a callable as the solver finds it"""
+
+    def __init__(self, publish):
+        super().__init__()
+        self.publish = publish
+        self.count = 0
+
+    def on_solution_callback(self):
+        self.count += 1
+        objective = self.ObjectiveValue()
+        bound = self.BestObjectiveBound()
+        self.publish({
+            'solution': self.count,
+            'objective_value': objective,
+            'best_bound': bound,
+            'gap': abs(objective - bound) / max(1.0, abs(objective)),
+            'elapsed': self.WallTime()
+        })
 
 class TimetableScheduler:
-    def __init__(self, courses, faculty, rooms):
+    def __init__(self, courses, faculty, rooms, solver_params=None):
         self.courses = courses
         self.faculty = {f['id']: f for f in faculty}
         self.rooms = {r['id']: r for r in rooms}
@@ -11,147 +32,222 @@ class TimetableScheduler:
         self.slots = Config.TIME_SLOTS
         self.model = cp_model.CpModel()
         self.solver = cp_model.CpSolver()
+        self.solver_params = solver_params_from(solver_params)
+        self._configure_solver()
+        self.status = None
+        self.x = {}
         self.schedule = {}
-        
+        self.num_variables = 0
+        self.pruned_variables = 0
+        self.previous = None
+        self.changed_course_ids = None
+        self.pin_unchanged = False
+        self.minimize_moves = True
+        self.timings = {}
+        self.on_solution = None  # Called with each improving solution (see SolutionProgress)
+        self.solutions_found = 0
+
+    # Input helpers, also importable from solver_input without loading OR-Tools
+    parse_availability = staticmethod(parse_availability)
+    allowed_positions = staticmethod(allowed_positions)
+    room_fits = staticmethod(room_fits)
+
+    def _sessions(self, course):
+        """Lengths of the contiguous sessions a course is split into (session_length hours each)"""
+        hours = course.get('hours_per_week', course['credits'])
+        length = max(1, min(course.get('session_length') or 1, len(self.slots)))
+        return [length] * (hours // length) + ([hours % length] if hours % length else [])
+
+    def _allowed_slots(self, f_id):
+        """(day, slot) index pairs in which a faculty member can teach"""
+        availability = {}
+        if f_id in self.faculty:
+            availability = self.parse_availability(self.faculty[f_id].get('availability', {}))
+        return self.allowed_positions(availability, self.days, self.slots)
+
+    def set_previous_solution(self, entries, changed_course_ids=None, pin_unchanged=False,
+                              minimize_moves=True):
+        """Warm-start from a stored timetable and minimise the number of moved classes.
+
+        changed_course_ids=None treats every course as changed. With pin_unchanged,
+        classes of unchanged courses keep their day, slot and room. With
+        minimize_moves=False the entries are only solver hints.
+        """
+        day_index = {day: i for i, day in enumerate(self.days)}
+        slot_index = {slot: i for i, slot in enumerate(self.slots)}
+        self.previous = set()
+        for entry in entries:
+            if entry['day'] in day_index and entry['slot'] in slot_index:
+                self.previous.add((entry['course_id'], day_index[entry['day']],
+                                   slot_index[entry['slot']], entry['room_id']))
+        self.changed_course_ids = changed_course_ids
+        self.pin_unchanged = pin_unchanged
+        self.minimize_moves = minimize_moves
+
+    def _configure_solver(self):
+        """Apply time limit, parallelism and seed to the CP-SAT solver"""
+        params = self.solver_params
+        self.solver.parameters.max_time_in_seconds = params['max_time_seconds']
+        self.solver.parameters.num_workers = params['num_workers']
+        self.solver.parameters.random_seed = params['random_seed']
+        self.solver.parameters.stop_after_first_solution = params['first_feasible']
+
     def generate_timetable(self):
         """Main function to generate optimized timetable"""
-        
-        # Decision variables: x[c, d, s, r] = 1 if course c scheduled on day d, slot s, room r
+        self.build_model()
+        return self.solve()
+
+    def build_model(self):
+        """Create decision variables, constraints and objective"""
+
+        # Decision variables: x[c, d, s, r] = 1 if course c scheduled on day d, slot s, room r.
+        # Only created where the room suits the course and the faculty member is available.
         x = {}
+        course_vars = {}
+        faculty_vars = {}
+        faculty_slot_vars = {}
+        room_slot_vars = {}
+        allowed_by_faculty = {}
+
         for course in self.courses:
             c_id = course['id']
-            for d_idx, day in enumerate(self.days):
-                for s_idx, slot in enumerate(self.slots):
-                    for r_id in self.rooms:
-                        var_name = f'c{c_id}_d{d_idx}_s{s_idx}_r{r_id}'
-                        x[(c_id, d_idx, s_idx, r_id)] = self.model.NewBoolVar(var_name)
-        
+            f_id = course['faculty_id']
+            if f_id not in allowed_by_faculty:
+                allowed_by_faculty[f_id] = self._allowed_slots(f_id)
+            fitting_rooms = [r_id for r_id, room in self.rooms.items() if self.room_fits(course, room)]
+
+            course_vars[c_id] = []
+            for d_idx, s_idx in allowed_by_faculty[f_id]:
+                for r_id in fitting_rooms:
+                    var = self.model.NewBoolVar(f'c{c_id}_d{d_idx}_s{s_idx}_r{r_id}')
+                    x[(c_id, d_idx, s_idx, r_id)] = var
+                    course_vars[c_id].append(var)
+                    room_slot_vars.setdefault((r_id, d_idx, s_idx), []).append(var)
+                    if f_id in self.faculty:
+                        faculty_vars.setdefault(f_id, []).append(var)
+                        faculty_slot_vars.setdefault((f_id, d_idx, s_idx), []).append(var)
+
+        self.num_variables = len(x)
+        self.pruned_variables = (len(self.courses) * len(self.days) * len(self.slots) * len(self.rooms)
+                                 - self.num_variables)
+
         # Constraint 1: Each course must be scheduled for required hours per week
         for course in self.courses:
             c_id = course['id']
             hours_needed = course.get('hours_per_week', course['credits'])
-            
-            self.model.Add(
-                sum(x[(c_id, d, s, r)] 
-                    for d in range(len(self.days))
-                    for s in range(len(self.slots))
-                    for r in self.rooms) == hours_needed
-            )
-        
+            self.model.Add(sum(course_vars[c_id]) == hours_needed)
+
         # Constraint 2: No faculty double-booking
-        for f_id in self.faculty:
-            faculty_courses = [c['id'] for c in self.courses if c['faculty_id'] == f_id]
-            for d in range(len(self.days)):
-                for s in range(len(self.slots)):
-                    self.model.Add(
-                        sum(x[(c_id, d, s, r)] 
-                            for c_id in faculty_courses
-                            for r in self.rooms) <= 1
-                    )
-        
+        for slot_vars in faculty_slot_vars.values():
+            if len(slot_vars) > 1:
+                self.model.AddAtMostOne(slot_vars)
+
         # Constraint 3: No room double-booking
-        for r_id in self.rooms:
-            for d in range(len(self.days)):
-                for s in range(len(self.slots)):
-                    self.model.Add(
-                        sum(x[(c_id, d, s, r_id)] 
-                            for c_id in [c['id'] for c in self.courses]
-                            for d_temp in [d]
-                            for s_temp in [s]) <= 1
-                    )
-        
+        for slot_vars in room_slot_vars.values():
+            if len(slot_vars) > 1:
+                self.model.AddAtMostOne(slot_vars)
+
         # Constraint 4: Faculty workload limits
         for f_id, faculty_data in self.faculty.items():
-            faculty_courses = [c['id'] for c in self.courses if c['faculty_id'] == f_id]
             max_hours = faculty_data.get('max_hours', 20)
-            
-            self.model.Add(
-                sum(x[(c_id, d, s, r)] 
-                    for c_id in faculty_courses
-                    for d in range(len(self.days))
-                    for s in range(len(self.slots))
-                    for r in self.rooms) <= max_hours
-            )
-        
-        # Constraint 5: Faculty availability (if specified in JSON)
-        for course in self.courses:
-            c_id = course['id']
-            f_id = course['faculty_id']
-            if f_id in self.faculty:
-                availability = self.faculty[f_id].get('availability', {})
-                if isinstance(availability, str):
-                    try:
-                        availability = json.loads(availability)
-                    except:
-                        availability = {}
-                
-                for d_idx, day in enumerate(self.days):
-                    if day in availability and not availability[day]:
-                        # Faculty not available on this day
-                        for s in range(len(self.slots)):
-                            for r in self.rooms:
-                                self.model.Add(x[(c_id, d_idx, s, r)] == 0)
-        
+            if f_id in faculty_vars:
+                self.model.Add(sum(faculty_vars[f_id]) <= max_hours)
+
+        # Constraint 5: Faculty availability is enforced by the variable domains above
+
         # Objective: Minimize idle time (balance schedule)
         # Prefer to schedule classes earlier in the day
-        objective_terms = []
-        for course in self.courses:
-            c_id = course['id']
-            for d in range(len(self.days)):
-                for s in range(len(self.slots)):
-                    for r in self.rooms:
-                        # Penalty increases with later time slots
-                        objective_terms.append(x[(c_id, d, s, r)] * s)
-        
-        self.model.Minimize(sum(objective_terms))
-        
-        # Solve
-        status = self.solver.Solve(self.model)
-        
-        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            return self._extract_solution(x)
+        lateness = sum(var * s for (c_id, d, s, r), var in x.items())
+
+        if self.previous is not None:
+            for key, var in x.items():
+                self.model.AddHint(var, int(key in self.previous))
+
+        if self.previous is None or not self.minimize_moves:
+            self.model.Minimize(lateness)
+        else:
+            # Incremental re-solve: optionally pin unchanged courses, and rank
+            # any moved class above all lateness savings
+            kept = []
+            for key in self.previous:
+                if key not in x:
+                    continue
+                kept.append(x[key])
+                unchanged = self.changed_course_ids is not None and key[0] not in self.changed_course_ids
+                if self.pin_unchanged and unchanged:
+                    self.model.Add(x[key] == 1)
+            move_weight = 1 + (len(self.slots) - 1) * sum(
+                course.get('hours_per_week', course['credits']) for course in self.courses)
+            self.model.Minimize(move_weight * (len(self.previous) - sum(kept)) + lateness)
+        self.x = x
+
+    def solve(self):
+        """Solve the built model; returns the timetable or None"""
+        started = time.perf_counter()
+        callback = SolutionProgress(self.on_solution) if self.on_solution is not None else None
+        self.status = self.solver.Solve(self.model, callback)
+        if callback is not None:
+            self.solutions_found = callback.count
+        self.timings['solve'] = time.perf_counter() - started
+
+        if self.status == cp_model.OPTIMAL or self.status == cp_model.FEASIBLE:
+            started = time.perf_counter()
+            timetable = self._extract_solution()
+            self.timings['extract'] = time.perf_counter() - started
+            return timetable
         else:
             return None
-    
-    def _extract_solution(self, x):
+
+    def status_name(self):
+        return self.solver.StatusName(self.status) if self.status is not None else None
+
+    def objective_value(self):
+        return self.solver.ObjectiveValue()
+
+    def best_bound(self):
+        return self.solver.BestObjectiveBound()
+
+    def stop(self):
+        """Interrupt a running solve (from another thread)"""
+        self.solver.StopSearch()
+
+    def _extract_solution(self):
         """Extract timetable from solved model"""
         timetable = []
-        
-        for course in self.courses:
-            c_id = course['id']
-            for d_idx, day in enumerate(self.days):
-                for s_idx, slot in enumerate(self.slots):
-                    for r_id in self.rooms:
-                        if self.solver.Value(x[(c_id, d_idx, s_idx, r_id)]) == 1:
-                            timetable.append({
-                                'course_id': c_id,
-                                'course_code': course['code'],
-                                'course_name': course['name'],
-                                'faculty_id': course['faculty_id'],
-                                'faculty_name': self.faculty[course['faculty_id']]['name'],
-                                'room_id': r_id,
-                                'room_name': self.rooms[r_id]['name'],
-                                'day': day,
-                                'slot': slot
-                            })
-        
+        courses = {c['id']: c for c in self.courses}
+
+        for (c_id, d_idx, s_idx, r_id), var in self.x.items():
+            if self.solver.Value(var) == 1:
+                timetable.append(self._make_entry(courses[c_id], d_idx, s_idx, r_id))
+
         return timetable
-    
+
+    def _make_entry(self, course, d_idx, s_idx, r_id):
+        """Timetable entry in the format returned by every engine"""
+        faculty = self.faculty.get(course['faculty_id'], {})
+        return {
+            'course_id': course['id'],
+            'course_code': course['code'],
+            'course_name': course['name'],
+            'faculty_id': course['faculty_id'],
+            'faculty_name': faculty.get('name'),
+            'room_id': r_id,
+            'room_name': self.rooms[r_id]['name'],
+            'day': self.days[d_idx],
+            'slot': self.slots[s_idx]
+        }
+
     def get_statistics(self, timetable):
-        """Generate statistics about the timetable"""
-        faculty_load = {}
-        room_utilization = {}
-        
-        for entry in timetable:
-            f_id = entry['faculty_id']
-            r_id = entry['room_id']
-            
-            faculty_load[f_id] = faculty_load.get(f_id, 0) + 1
-            room_utilization[r_id] = room_utilization.get(r_id, 0) + 1
-        
+        """Solver statistics; workload and room usage come from analytics.build"""
         return {
-            'faculty_workload': faculty_load,
-            'room_usage': room_utilization,
             'total_classes': len(timetable),
-            'solver_time': self.solver.WallTime()
+            'solver_time': self.solver.WallTime(),
+            'solver_status': self.status_name(),
+            'objective_value': self.solver.ObjectiveValue(),
+            'best_bound': self.solver.BestObjectiveBound(),
+            'solver_params': self.solver_params,
+            'variables': self.num_variables,
+            'pruned_variables': self.pruned_variables,
+            'constraints': len(self.model.Proto().constraints),
+            'solutions_found': self.solutions_found
         }
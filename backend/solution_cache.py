@@ -0,0 +1,88 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from config import Config
+from solver_input import parse_availability
+
+# Persistent cache of solved timetables keyed by a canonical hash of the
+# scheduler inputs. One JSON file per entry; file mtimes drive LRU eviction.
+
+COURSE_FIELDS = ('id', 'code', 'name', 'credits', 'faculty_id', 'hours_per_week',
+                 'room_type', 'enrollment', 'session_length')
+FACULTY_FIELDS = ('id', 'name', 'max_hours')
+ROOM_FIELDS = ('id', 'name', 'capacity', 'type')
+
+def _project(rows, fields):
+    return sorted(({field: row.get(field) for field in fields} for row in rows), key=lambda row: row['id'])
+
+def input_hash(courses, faculty, rooms, options):
+    """SHA-256 of everything that determines the solver output"""
+    canonical_faculty = _project(faculty, FACULTY_FIELDS)
+    availability = {f['id']: parse_availability(f.get('availability', {})) for f in faculty}
+    for row in canonical_faculty:
+        row['availability'] = availability[row['id']]
+    payload = {
+        'courses': _project(courses, COURSE_FIELDS),
+        'faculty': canonical_faculty,
+        'rooms': _project(rooms, ROOM_FIELDS),
+        'days': Config.DAYS,
+        'slots': Config.TIME_SLOTS,
+        'engine': options.get('engine', 'grid'),
+        'decompose': bool(options.get('decompose')),
+        'warm_start': bool(options.get('warm_start')),
+        'solver': options.get('solver'),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def _path(key):
+    return os.path.join(Config.SOLUTION_CACHE_DIR, f'{key}.json')
+
+def get(key):
+    """Cached {'timetable', 'statistics'} for a hash, or None"""
+    try:
+        with open(_path(key)) as f:
+            entry = json.load(f)
+        os.utime(_path(key))  # Mark as recently used
+        return entry
+    except (OSError, ValueError):
+        return None
+
+def latest():
+    """Most recently used entry, used to seed warm starts on a cache miss"""
+    paths = glob.glob(os.path.join(Config.SOLUTION_CACHE_DIR, '*.json'))
+    for path in sorted(paths, key=_mtime, reverse=True):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            continue
+    return None
+
+def put(key, timetable, statistics):
+    """Store a solution atomically and evict least recently used entries"""
+    try:
+        os.makedirs(Config.SOLUTION_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=Config.SOLUTION_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'key': key, 'timetable': timetable, 'statistics': statistics}, f)
+        os.replace(tmp_path, _path(key))
+        _evict()
+    except OSError as e:
+        print(f"Solution cache write error: {e}")
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+def _evict():
+    paths = sorted(glob.glob(os.path.join(Config.SOLUTION_CACHE_DIR, '*.json')), key=_mtime, reverse=True)
+    for path in paths[Config.SOLUTION_CACHE_MAX_ENTRIES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,68 @@
+from config import Config
+import json
+import math
+
+# Input parsing shared by the engines and the API. Kept free of solver and
+# export imports so API workers that only validate requests, answer
+# occupancy queries or submit jobs never load OR-Tools.
+
+# Keys of engines.ENGINES, for validating requests without importing the engines
+ENGINE_NAMES = ('grid', 'interval', 'heuristic')
+
+def solver_params_from(overrides=None):
+    """Merge per-request solver overrides with the Config defaults.
+
+    Raises ValueError on unknown keys or invalid values.
+    """
+    params = {
+        'max_time_seconds': Config.SOLVER_MAX_TIME_SECONDS,
+        'num_workers': Config.SOLVER_NUM_WORKERS,
+        'random_seed': Config.SOLVER_RANDOM_SEED,
+        'first_feasible': Config.SOLVER_FIRST_FEASIBLE,
+    }
+    for key, value in (overrides or {}).items():
+        if key not in params:
+            raise ValueError(f"Unknown solver parameter: {key}")
+        if key == 'first_feasible':
+            if isinstance(value, str):
+                value = value.lower() in ('1', 'true', 'yes')
+            params[key] = bool(value)
+        elif key == 'max_time_seconds':
+            params[key] = float(value)
+            if not math.isfinite(params[key]) or params[key] <= 0:
+                raise ValueError("max_time_seconds must be a positive finite number")
+        else:
+            params[key] = int(value)
+            if params[key] < 0:
+                raise ValueError(f"{key} must not be negative")
+    return params
+
+def parse_availability(availability):
+    """Parse faculty availability JSON into a dict (day -> bool or list of slots)"""
+    if isinstance(availability, str):
+        try:
+            availability = json.loads(availability)
+        except:
+            availability = {}
+    return availability if isinstance(availability, dict) else {}
+
+def allowed_positions(availability, days, slots):
+    """(day, slot) index pairs allowed by a parsed availability dict"""
+    allowed = []
+    for d_idx, day in enumerate(days):
+        day_availability = availability.get(day, True)
+        for s_idx, slot in enumerate(slots):
+            if isinstance(day_availability, list):
+                # Availability restricted to specific slots of the day
+                if slot in day_availability or s_idx in day_availability:
+                    allowed.append((d_idx, s_idx))
+            elif day_availability:
+                allowed.append((d_idx, s_idx))
+    return allowed
+
+def room_fits(course, room):
+    """Check room type and capacity against the course requirements"""
+    required_type = course.get('room_type')
+    if required_type and room.get('type', 'Classroom') != required_type:
+        return False
+    return (course.get('enrollment') or 0) <= (room.get('capacity') or 0)
@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import pytest
+from config import Config
+import models
+import occupancy
+
+SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'database', 'schema.sql')
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Database on a fresh copy of schema.sql and its sample data (2 faculty, 3 rooms, 3 courses)"""
+    path = str(tmp_path / 'timetable.db')
+    conn = sqlite3.connect(path)
+    with open(SCHEMA) as f:
+        conn.executescript(f.read())
+    conn.close()
+    monkeypatch.setattr(Config, 'DB_PATH', path)
+    monkeypatch.setattr(Config, 'SOLUTION_CACHE_DIR', str(tmp_path / 'solution_cache'))
+    monkeypatch.setattr(models, '_migrated', False)
+    monkeypatch.setattr(models, '_pool', None)
+    monkeypatch.setattr(occupancy, '_cached', {'key': None, 'index': None})
+    database = models.Database()
+    yield database
+    database.close()
+
+@pytest.fixture
+def client(db, monkeypatch):
+    """Authenticated test client of the API app, on the db fixture's database"""
+    from flask_jwt_extended import create_access_token
+    from app import app
+    from utils.export_cache import export_cache
+    from utils.read_cache import read_cache
+    # Versions and change counters restart in every test database
+    export_cache.invalidate()
+    read_cache.invalidate()
+    monkeypatch.setitem(app.config, 'JWT_SECRET_KEY', 'test-secret-key-of-at-least-32-bytes')
+    with app.app_context():
+        token = create_access_token(identity='1')
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+def entry(course_id, faculty_id, room_id, day='Monday', slot='9:00-10:00'):
+    return {'course_id': course_id, 'faculty_id': faculty_id, 'room_id': room_id, 'day': day, 'slot': slot}
+
+def publish(db, rows, base_version=None):
+    """Publish (course_id, faculty_id, room_id, day, slot) rows as a new version"""
+    return models.Timetable.publish(db, rows, 'full', {}, models.Generation.now(db), base_version)
@@ -0,0 +1,97 @@
+import pytest
+from analytics import build, workload
+from config import Config
+from generation import run_generation
+from models import Generation, Timetable
+from tests.conftest import publish
+
+FACULTY = [{'id': 1, 'name': 'Dr. A', 'max_hours': 2}, {'id': 2, 'name': 'Dr. B', 'max_hours': 20}]
+ROOMS = [{'id': 1, 'name': 'Room 101'}, {'id': 2, 'name': 'Lab 201'}]
+COURSES = [{'id': 1}, {'id': 2}, {'id': 3}]
+SLOTS = Config.TIME_SLOTS
+
+def entry(faculty_id, room_id, day, slot):
+    return {'faculty_id': faculty_id, 'room_id': room_id, 'day': day, 'slot': SLOTS[slot]}
+
+TIMETABLE = [
+    # Dr. A teaches the first and fourth slot of Monday (two idle slots) and twice at 9:00 on Tuesday
+    entry(1, 1, 'Monday', 0), entry(1, 1, 'Monday', 3),
+    entry(1, 1, 'Tuesday', 0), entry(1, 2, 'Tuesday', 0),
+    entry(2, 2, 'Monday', 0),
+    # Unknown faculty member and room: counted in the totals only
+    entry(9, 9, 'Friday', 1),
+]
+
+@pytest.fixture
+def analytics():
+    return build(TIMETABLE, COURSES, FACULTY, ROOMS)
+
+def test_totals(analytics):
+    num_positions = len(Config.DAYS) * len(SLOTS)
+    assert analytics['totals'] == {
+        'classes': 6, 'courses': 3, 'faculty': 2, 'rooms': 2,
+        'room_utilization': pytest.approx(5 / (2 * num_positions)),
+        'idle_gaps': 2, 'overloaded_faculty': 1,
+        'faculty_double_bookings': 1, 'room_double_bookings': 0,
+    }
+
+def test_faculty(analytics):
+    first, second = analytics['faculty']
+    assert first == {'id': 1, 'name': 'Dr. A', 'hours': 4, 'max_hours': 2, 'load': 2.0, 'idle_gaps': 2,
+                     'busiest_day': 'Monday'}
+    assert second['hours'] == 1
+    assert second['idle_gaps'] == 0
+
+def test_rooms_days_and_peaks(analytics):
+    assert [r['hours'] for r in analytics['rooms']] == [3, 2]
+    monday = analytics['days'][0]
+    assert (monday['day'], monday['classes']) == ('Monday', 3)
+    assert monday['room_utilization'] == pytest.approx(3 / (2 * len(SLOTS)))
+    peak = analytics['peak_slots'][0]
+    assert (peak['day'], peak['slot'], peak['rooms_busy'], peak['faculty_teaching']) == ('Monday', SLOTS[0], 2, 2)
+
+def test_empty_timetable():
+    analytics = build([], COURSES, FACULTY, ROOMS)
+    assert analytics['totals']['classes'] == 0
+    assert analytics['faculty'][0]['busiest_day'] is None
+    assert workload(analytics) == {'faculty_workload': {}, 'room_usage': {}}
+
+def test_workload(analytics):
+    assert workload(analytics) == {'faculty_workload': {1: 4, 2: 1}, 'room_usage': {1: 3, 2: 2}}
+
+def test_summary_before_first_generation(client):
+    body = client.get('/api/ai-summary').get_json()
+    assert (body['version'], body['summary']) == (0, 'No timetable generated yet.')
+
+def test_summary_computes_missing_analytics_once(client, db):
+    version = publish(db, [(1, 1, 1, 'Monday', SLOTS[0]), (2, 2, 3, 'Monday', SLOTS[0])])
+    assert Generation.get_analytics(db, version) == {}
+    body = client.get('/api/ai-summary').get_json()
+    assert body['version'] == version
+    assert body['analytics']['totals']['classes'] == 2
+    assert Generation.get_analytics(db, version) == body['analytics']
+
+def test_summary_of_a_stored_version(client, db):
+    first = publish(db, [(1, 1, 1, 'Monday', SLOTS[0])])
+    publish(db, [(1, 1, 1, 'Tuesday', SLOTS[0]), (3, 1, 1, 'Tuesday', SLOTS[1])])
+    body = client.get(f'/api/ai-summary?version={first}').get_json()
+    assert (body['version'], body['analytics']['totals']['classes']) == (first, 1)
+
+@pytest.mark.parametrize('version, status', [('abc', 400), ('', 400), ('0', 404), ('99', 404)])
+def test_summary_version_errors(client, db, version, status):
+    publish(db, [(1, 1, 1, 'Monday', SLOTS[0])])
+    assert client.get(f'/api/ai-summary?version={version}').status_code == status
+
+def test_published_generation_stores_analytics(db):
+    body, status = run_generation({'use_cache': False})
+    assert status == 200
+    stored = Generation.get_analytics(db, Generation.current_version(db))
+    assert stored['totals']['classes'] == 11
+    assert body['statistics']['faculty_workload'] == workload(stored)['faculty_workload']
+
+def test_move_stores_analytics(client, db):
+    publish(db, [(1, 1, 1, 'Monday', SLOTS[0])])
+    moving = Timetable.get_all(db)[0]
+    version = client.post('/api/timetable/move', json={'entry_id': moving['id'], 'day': 'Friday'}).get_json()['version']
+    friday = Generation.get_analytics(db, version)['days'][-1]
+    assert (friday['day'], friday['classes']) == ('Friday', 1)
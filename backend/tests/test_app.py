@@ -0,0 +1,39 @@
+import json
+import os
+import subprocess
+import sys
+from config import Config
+
+BACKEND = os.path.dirname(os.path.dirname(__file__))
+
+# Runs in a fresh interpreter, so modules other tests imported do not count
+CRUD_ONLY = """
+import json, sys
+from config import Config
+Config.DB_PATH = sys.argv[1]
+from flask_jwt_extended import create_access_token
+from app import create_app
+app = create_app()
+app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-at-least-32-bytes'
+with app.app_context():
+    token = create_access_token(identity='1')
+client = app.test_client()
+client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+statuses = [client.get(path).status_code
+            for path in ('/api/courses', '/api/faculty', '/api/rooms', '/api/timetable', '/api/timetable/precheck')]
+heavy = sorted(name for name in ('ortools', 'reportlab', 'openpyxl', 'numpy') if name in sys.modules)
+print(json.dumps({'statuses': statuses, 'heavy': heavy}))
+"""
+
+def test_crud_requests_do_not_load_solver_or_exporters(db):
+    result = subprocess.run([sys.executable, '-c', CRUD_ONLY, Config.DB_PATH], cwd=BACKEND,
+                            capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report['statuses'] == [200] * 5
+    assert report['heavy'] == []
+
+def test_create_app_builds_independent_apps():
+    from app import create_app
+    first, second = create_app(), create_app()
+    assert first is not second
+    assert first.test_client().get('/').get_json()['status'] == 'running'
@@ -0,0 +1,86 @@
+import json
+import pytest
+from flask import Flask, request
+from models import Course, Faculty
+from utils.bulk import RowError, course_validator, faculty_row, import_rows, room_row
+
+def test_faculty_row():
+    values = faculty_row({'name': ' Dr. A ', 'availability': '{"Monday": true}', 'max_hours': '12'})
+    assert values == ('Dr. A', json.dumps({'Monday': True}), 12, '')
+    assert faculty_row({'name': 'Dr. B'})[2] == 20
+
+@pytest.mark.parametrize('row, message', [
+    ({'name': ' '}, 'name is required'),
+    ({'name': 'Dr. A', 'availability': '[1, 2]'}, 'availability must be a JSON object'),
+    ({'name': 'Dr. A', 'availability': '{'}, 'availability must be a JSON object'),
+    ({'name': 'Dr. A', 'max_hours': 'many'}, 'max_hours must be an integer'),
+    ({'name': 'Dr. A', 'max_hours': -1}, 'max_hours must be at least 0'),
+])
+def test_faculty_row_errors(row, message):
+    with pytest.raises(RowError, match=message):
+        faculty_row(row)
+
+def test_room_row():
+    assert room_row({'name': 'Lab 301', 'capacity': '30', 'type': 'Lab'}) == ('Lab 301', 30, 'Lab')
+    assert room_row({'name': 'Room 9', 'capacity': 1})[2] == 'Classroom'
+    with pytest.raises(RowError, match='capacity must be at least 1'):
+        room_row({'name': 'Closet', 'capacity': 0})
+    with pytest.raises(RowError, match='capacity is required'):
+        room_row({'name': 'Closet'})
+
+def test_course_validator(db):
+    course_row = course_validator(db)
+    values = course_row({'code': 'CS501', 'name': 'Compilers', 'credits': 3, 'type': 'Major', 'faculty_id': 1})
+    assert values == ('CS501', 'Compilers', 3, 'Major', 1, 3, None, 0, 1)
+
+    with pytest.raises(RowError, match='CS301 already exists'):
+        course_row({'code': 'CS301', 'name': 'ML', 'credits': 4, 'type': 'Major', 'faculty_id': 1})
+    # Codes accepted earlier in the same import count as taken
+    with pytest.raises(RowError, match='CS501 already exists'):
+        course_row({'code': 'CS501', 'name': 'Again', 'credits': 3, 'type': 'Major', 'faculty_id': 1})
+    with pytest.raises(RowError, match='Unknown faculty_id 99'):
+        course_row({'code': 'CS502', 'name': 'X', 'credits': 3, 'type': 'Major', 'faculty_id': 99})
+    with pytest.raises(RowError, match='session_length must be at least 1'):
+        course_row({'code': 'CS503', 'name': 'X', 'credits': 3, 'type': 'Major', 'faculty_id': 1,
+                    'session_length': 0})
+
+app = Flask(__name__)
+
+def test_import_rows_inserts_valid_rows(db):
+    rows = [{'name': 'Dr. A'}, {'name': ''}, 'not a row', {'name': 'Dr. B', 'max_hours': 10}]
+    with app.test_request_context(method='POST', json=rows):
+        body, status = import_rows(request, faculty_row, lambda valid: Faculty.bulk_create(db, valid))
+    assert status == 201
+    assert body['inserted'] == 2
+    assert [r['row'] for r in body['ids']] == [1, 4]
+    assert body['errors'] == [{'row': 2, 'message': 'name is required'}, {'row': 3, 'message': 'Row must be an object'}]
+    assert Faculty.get_by_id(db, body['ids'][1]['id'])['max_hours'] == 10
+
+def test_import_rows_all_or_nothing(db):
+    before = len(Faculty.get_all(db))
+    with app.test_request_context(method='POST', json=[{'name': 'Dr. A'}, {}], query_string={'all_or_nothing': '1'}):
+        body, status = import_rows(request, faculty_row, lambda valid: Faculty.bulk_create(db, valid))
+    assert status == 400
+    assert body['ids'] == []
+    assert len(Faculty.get_all(db)) == before
+
+def test_import_rows_csv_and_ndjson(db):
+    csv_body = 'code,name,credits,type,faculty_id\nCS601,Graphics,2,Major,2\nCS602,Bad,x,Major,2\n'
+    with app.test_request_context(method='POST', data=csv_body, content_type='text/csv'):
+        body, status = import_rows(request, course_validator(db), lambda valid: Course.bulk_create(db, valid))
+    assert status == 201
+    assert body['errors'] == [{'row': 2, 'message': 'credits must be an integer'}]
+
+    ndjson = '{"name": "Lab 7", "capacity": 20}\n\n{bad\n'
+    with app.test_request_context(method='POST', data=ndjson, content_type='application/x-ndjson'):
+        body, status = import_rows(request, room_row, lambda valid: list(range(len(valid))))
+    assert status == 201
+    assert body['inserted'] == 1
+    assert body['errors'][0]['row'] == 2
+    assert body['errors'][0]['message'].startswith('Invalid JSON')
+
+def test_import_rows_rejects_other_bodies():
+    with app.test_request_context(method='POST', json={'rows': 'nope'}):
+        body, status = import_rows(request, room_row, lambda valid: [])
+    assert status == 400
+    assert body['message'].startswith('Invalid bulk body')
@@ -0,0 +1,82 @@
+import shutil
+import sqlite3
+import threading
+import pytest
+from config import Config
+import models
+from tests.conftest import SCHEMA
+
+BASELINE_DB = SCHEMA.replace('schema.sql', 'timetable.db')
+
+@pytest.fixture
+def baseline_db(tmp_path, monkeypatch):
+    """Copy of the checked-in database, which predates every migration"""
+    path = str(tmp_path / 'timetable.db')
+    shutil.copy(BASELINE_DB, path)
+    monkeypatch.setattr(Config, 'DB_PATH', path)
+    monkeypatch.setattr(models, '_migrated', False)
+    monkeypatch.setattr(models, '_pool', None)
+    return path
+
+def _user_version(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+def test_connections_use_configured_pragmas(db):
+    conn = db.conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == Config.DB_BUSY_TIMEOUT_MS
+
+def test_pool_reuses_connections_and_rolls_back(db):
+    pool = models.ConnectionPool(1)
+    first = models.Database(pool)
+    conn = first.conn
+    conn.execute("INSERT INTO rooms (name, capacity, type) VALUES ('Left open', 10, 'Classroom')")
+    first.close()
+    second = models.Database(pool)
+    assert second.conn is conn
+    assert not conn.in_transaction
+    assert [r['name'] for r in second.execute_query("SELECT name FROM rooms WHERE name = 'Left open'")] == []
+    # Beyond the pool size, released connections are closed
+    third = models.Database(pool)
+    second.close()
+    third.close()
+    assert pool._idle.qsize() == 1
+
+def test_concurrent_first_connections_migrate_once(baseline_db, capsys):
+    assert _user_version(baseline_db) == 0
+    barrier = threading.Barrier(8)
+    connections = []
+
+    def connect():
+        barrier.wait()
+        database = models.Database()
+        connections.append(database.conn)
+        database.close()
+
+    threads = [threading.Thread(target=connect) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 'error' not in capsys.readouterr().out
+    assert all(conn is not None for conn in connections)
+    assert _user_version(baseline_db) == len(models.MIGRATIONS)
+
+def test_failed_migration_step_rolls_back(db, monkeypatch):
+    db.close()
+    monkeypatch.setattr(models, 'MIGRATIONS', models.MIGRATIONS + [[
+        "ALTER TABLE rooms ADD COLUMN building TEXT",
+        "ALTER TABLE no_such_table ADD COLUMN x TEXT",
+    ]])
+    monkeypatch.setattr(models, '_migrated', False)
+    with pytest.raises(sqlite3.OperationalError):
+        models.Database(models.ConnectionPool(0)).migrate()
+    assert _user_version(Config.DB_PATH) == len(models.MIGRATIONS) - 1
+    conn = sqlite3.connect(Config.DB_PATH)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(rooms)")]
+    conn.close()
+    assert 'building' not in columns
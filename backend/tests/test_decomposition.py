@@ -0,0 +1,54 @@
+import threading
+import time
+from decomposition import DecomposedScheduler, split_components
+from tests.test_jobs import _hard_instance
+
+FACULTY = [{'id': 1, 'name': 'Dr. A', 'max_hours': 20, 'availability': {}},
+           {'id': 2, 'name': 'Dr. B', 'max_hours': 20, 'availability': {}}]
+ROOMS = [{'id': 1, 'name': 'Room 101', 'capacity': 60, 'type': 'Classroom'},
+         {'id': 2, 'name': 'Lab 201', 'capacity': 40, 'type': 'Lab'},
+         {'id': 3, 'name': 'Hall', 'capacity': 10, 'type': 'Seminar'}]
+
+def course(c_id, faculty_id, room_type, hours=3):
+    return {'id': c_id, 'code': f'C{c_id}', 'name': f'Course {c_id}', 'credits': hours, 'hours_per_week': hours,
+            'faculty_id': faculty_id, 'room_type': room_type, 'enrollment': 20}
+
+def _ids(component):
+    courses, faculty, rooms = component
+    return sorted(c['id'] for c in courses), sorted(f['id'] for f in faculty), sorted(r['id'] for r in rooms)
+
+def test_split_by_faculty_and_rooms():
+    courses = [course(1, 1, 'Classroom'), course(2, 1, 'Classroom'), course(3, 2, 'Lab')]
+    components = split_components(courses, FACULTY, ROOMS)
+    # The seminar hall fits no course and is dropped
+    assert [_ids(c) for c in components] == [([1, 2], [1], [1]), ([3], [2], [2])]
+
+def test_shared_room_joins_components():
+    courses = [course(1, 1, 'Lab'), course(2, 2, 'Lab')]
+    assert [_ids(c) for c in split_components(courses, FACULTY, ROOMS)] == [([1, 2], [1, 2], [2])]
+
+def test_solver_threads_are_split_between_workers():
+    scheduler = DecomposedScheduler([], [], [], {'num_workers': 8})
+    assert scheduler._component_params(3)['num_workers'] == 2
+    assert scheduler._component_params(16)['num_workers'] == 1
+
+def test_components_are_solved_and_merged():
+    courses = [course(1, 1, 'Classroom'), course(2, 1, 'Classroom', 2), course(3, 2, 'Lab', 4)]
+    scheduler = DecomposedScheduler(courses, FACULTY, ROOMS, {'max_time_seconds': 20, 'num_workers': 2})
+    scheduler.build_model()
+    timetable = scheduler.solve()
+    assert scheduler.status_name() == 'OPTIMAL'
+    assert sorted(e['course_id'] for e in timetable) == [1] * 3 + [2] * 2 + [3] * 4
+    assert {e['room_id'] for e in timetable if e['course_id'] == 3} == {2}
+    stats = scheduler.get_statistics(timetable)
+    assert [c['courses'] for c in stats['components']] == [2, 1]
+
+def test_stop_interrupts_running_components():
+    scheduler = DecomposedScheduler(*_hard_instance(), {'max_time_seconds': 60, 'num_workers': 2})
+    scheduler.build_model()
+    assert len(scheduler.components) == 1
+    # Leave time for the spawned worker to import the solver and start searching
+    threading.Timer(5, scheduler.stop).start()
+    started = time.perf_counter()
+    scheduler.solve()
+    assert time.perf_counter() - started < 20
@@ -0,0 +1,44 @@
+import io
+import os
+from openpyxl import load_workbook
+from generation import run_generation
+from utils.export import EXCEL_MIMETYPE, PDF_MIMETYPE, export_to_excel, export_to_pdf
+
+TIMETABLE = [
+    {'course_id': 1, 'course_code': 'CS301', 'course_name': 'Machine Learning', 'faculty_id': 1,
+     'faculty_name': 'Dr. Rajesh Kumar', 'room_id': 1, 'room_name': 'Room 101', 'day': 'Monday',
+     'slot': '9:00-10:00'},
+    {'course_id': 2, 'course_code': 'MATH201', 'course_name': 'Linear Algebra', 'faculty_id': 2,
+     'faculty_name': 'Dr. Priya Sharma', 'room_id': 3, 'room_name': 'Room 102', 'day': 'Monday',
+     'slot': '9:00-10:00'},
+]
+
+def test_pdf_is_built_in_memory():
+    buffer = export_to_pdf(TIMETABLE)
+    assert isinstance(buffer, io.BytesIO)
+    assert buffer.tell() == 0
+    assert buffer.read(5) == b'%PDF-'
+
+def test_excel_rows():
+    workbook = load_workbook(export_to_excel(TIMETABLE))
+    rows = list(workbook['Timetable'].values)
+    assert rows[0] == ('Day', 'Time Slot', 'Course Code', 'Course Name', 'Faculty', 'Room')
+    assert rows[1] == ('Monday', '9:00-10:00', 'CS301', 'Machine Learning', 'Dr. Rajesh Kumar', 'Room 101')
+    assert len(rows) == 3
+
+def test_export_route_streams_without_files(client, tmp_path, monkeypatch):
+    workdir = tmp_path / 'cwd'
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    assert client.get('/api/export?format=pdf').status_code == 400
+    run_generation({'solver': {'max_time_seconds': 10}})
+
+    response = client.get('/api/export?format=pdf')
+    assert response.status_code == 200
+    assert response.mimetype == PDF_MIMETYPE
+    assert response.data.startswith(b'%PDF-')
+    response = client.get('/api/export?format=excel')
+    assert response.mimetype == EXCEL_MIMETYPE
+    assert len(list(load_workbook(io.BytesIO(response.data))['Timetable'].values)) == 12
+    assert client.get('/api/export?format=csv').status_code == 400
+    assert os.listdir(workdir) == []
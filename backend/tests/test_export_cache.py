@@ -0,0 +1,58 @@
+from generation import run_generation
+from utils.export_cache import ExportCache
+import routes.timetable
+
+def test_get_and_put():
+    cache = ExportCache(100)
+    assert cache.get(1, 'pdf', 'all') is None
+    cache.put(1, 'pdf', 'all', b'x' * 10)
+    assert cache.get(1, 'pdf', 'all') == b'x' * 10
+    assert cache.get(1, 'excel', 'all') is None
+    cache.put(1, 'pdf', 'all', b'y' * 20)
+    assert cache.size == 20
+
+def test_lru_eviction_by_size():
+    cache = ExportCache(100)
+    cache.put(1, 'pdf', 'a', b'a' * 40)
+    cache.put(1, 'pdf', 'b', b'b' * 40)
+    cache.get(1, 'pdf', 'a')
+    cache.put(1, 'pdf', 'c', b'c' * 40)
+    assert cache.get(1, 'pdf', 'b') is None
+    assert cache.get(1, 'pdf', 'a') is not None
+    assert cache.size == 80
+    # Larger than the whole cache: not stored
+    cache.put(1, 'pdf', 'd', b'd' * 101)
+    assert cache.get(1, 'pdf', 'd') is None
+
+def test_newer_version_drops_older_entries():
+    cache = ExportCache(100)
+    cache.put(1, 'pdf', 'all', b'old')
+    assert cache.get(2, 'pdf', 'all') is None
+    assert cache.get(1, 'pdf', 'all') is None
+    # Rendered from version 1 after version 2 was seen
+    cache.put(1, 'pdf', 'all', b'old')
+    assert cache.size == 0
+    cache.put(2, 'pdf', 'all', b'new')
+    cache.invalidate()
+    assert cache.get(2, 'pdf', 'all') is None
+
+def test_route_renders_each_version_once(client, monkeypatch):
+    renders = []
+    render = routes.timetable.EXPORTERS['pdf']
+
+    def counting_render(timetable, view='all'):
+        renders.append(len(timetable))
+        return render(timetable, view)
+
+    monkeypatch.setitem(routes.timetable.EXPORTERS, 'pdf', counting_render)
+    run_generation({'solver': {'max_time_seconds': 10}})
+    first = client.get('/api/export?format=pdf')
+    second = client.get('/api/export?format=pdf')
+    assert first.headers['X-Timetable-Version'] == second.headers['X-Timetable-Version'] == '1'
+    assert first.data == second.data
+    assert renders == [11]
+
+    assert client.post('/api/generate-timetable?max_time_seconds=10').status_code == 200
+    third = client.get('/api/export?format=pdf')
+    assert third.headers['X-Timetable-Version'] == '2'
+    assert renders == [11, 11]
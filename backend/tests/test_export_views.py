@@ -0,0 +1,55 @@
+import io
+import zipfile
+from openpyxl import load_workbook
+from generation import run_generation
+from utils.export import _cell_text, _view_title, export_bundle
+
+ENTRY = {'course_code': 'CS301', 'faculty_name': 'Dr. Rajesh Kumar', 'room_name': 'Room 101', 'day': 'Monday'}
+
+def _rows(data):
+    return list(load_workbook(io.BytesIO(data))['Timetable'].values)[1:]
+
+def test_cells_leave_out_the_shared_field():
+    assert _cell_text(ENTRY, 'all') == 'CS301\nDr. Rajesh Kumar\nRoom 101'
+    assert _cell_text(ENTRY, 'faculty') == 'CS301\nRoom 101'
+    assert _cell_text(ENTRY, 'room') == 'CS301\nDr. Rajesh Kumar'
+    assert _view_title([ENTRY], 'day') == ' - Monday'
+    assert _view_title([ENTRY], 'all') == ''
+
+def test_view_exports(client):
+    run_generation({'solver': {'max_time_seconds': 10}})
+    response = client.get('/api/export?format=excel&view=faculty&id=2')
+    assert response.status_code == 200
+    assert 'timetable-faculty-2.xlsx' in response.headers['Content-Disposition']
+    rows = _rows(response.data)
+    assert len(rows) == 3
+    assert {row[4] for row in rows} == {'Dr. Priya Sharma'}
+
+    rows = _rows(client.get('/api/export?format=excel&view=day&day=Monday').data)
+    assert rows and {row[0] for row in rows} == {'Monday'}
+    # Faculty member 9 has no classes
+    assert client.get('/api/export?format=pdf&view=faculty&id=9').status_code == 400
+
+def test_invalid_views(client):
+    assert client.get('/api/export?view=faculty').status_code == 400
+    assert client.get('/api/export?view=day&day=Someday').status_code == 400
+    assert client.get('/api/export?view=building').status_code == 400
+    assert client.get('/api/export/bundle?by=day').status_code == 400
+
+def test_bundle_has_one_document_per_group(client):
+    run_generation({'solver': {'max_time_seconds': 10}})
+    response = client.get('/api/export/bundle?by=faculty&format=excel')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    assert sorted(archive.namelist()) == ['faculty-1-Dr-Rajesh-Kumar.xlsx', 'faculty-2-Dr-Priya-Sharma.xlsx']
+    rows = _rows(archive.read('faculty-1-Dr-Rajesh-Kumar.xlsx'))
+    assert len(rows) == 8
+    assert {row[4] for row in rows} == {'Dr. Rajesh Kumar'}
+
+def test_pdf_bundle_by_room():
+    timetable = [dict(ENTRY, room_id=r_id, room_name=f'Room {r_id}', faculty_id=1, course_name='ML',
+                      slot='9:00-10:00') for r_id in (1, 2)]
+    archive = zipfile.ZipFile(export_bundle(timetable, 'room', 'pdf'))
+    assert sorted(archive.namelist()) == ['room-1-Room-1.pdf', 'room-2-Room-2.pdf']
+    assert all(archive.read(name).startswith(b'%PDF-') for name in archive.namelist())
@@ -0,0 +1,112 @@
+import json
+from config import Config
+from conflicts import explain_conflict
+from feasibility import hours_per_week, precheck
+from generation import run_generation
+from models import Course, Faculty, Generation
+
+NUM_POSITIONS = len(Config.DAYS) * len(Config.TIME_SLOTS)
+FACULTY = [{'id': 1, 'name': 'Dr. A', 'max_hours': 20, 'availability': {}},
+           {'id': 2, 'name': 'Dr. B', 'max_hours': 20, 'availability': {'Monday': True, 'Tuesday': ['9:00-10:00', 1],
+                                                                         'Wednesday': False, 'Thursday': False,
+                                                                         'Friday': False}}]
+ROOMS = [{'id': 1, 'name': 'Room 101', 'capacity': 60, 'type': 'Classroom'},
+         {'id': 2, 'name': 'Lab 201', 'capacity': 40, 'type': 'Lab'}]
+
+def course(c_id, faculty_id=1, hours=3, **extra):
+    return dict({'id': c_id, 'code': f'C{c_id}', 'credits': 3, 'hours_per_week': hours, 'faculty_id': faculty_id},
+                **extra)
+
+def _types(problems):
+    return sorted(p['type'] for p in problems)
+
+def test_hours_per_week_defaults_to_credits():
+    assert hours_per_week({'credits': 4}) == 4
+    assert hours_per_week({'credits': 4, 'hours_per_week': 2}) == 2
+
+def test_feasible_input():
+    assert precheck([course(1), course(2, faculty_id=2, hours=10)], FACULTY, ROOMS) == []
+
+def test_no_fitting_room():
+    problems = precheck([course(1, enrollment=50, room_type='Lab')], FACULTY, ROOMS)
+    assert _types(problems) == ['no_fitting_room']
+    assert problems[0]['course_id'] == 1
+
+def test_faculty_availability():
+    # Dr. B is available all of Monday and two Tuesday slots
+    available = len(Config.TIME_SLOTS) + 2
+    problems = precheck([course(1, faculty_id=2, hours=available + 1)], FACULTY, ROOMS)
+    assert _types(problems) == ['course_exceeds_availability', 'faculty_availability']
+    assert problems[1]['available_slots'] == available
+
+def test_faculty_overloaded():
+    problems = precheck([course(1, hours=12), course(2, hours=12)], FACULTY, ROOMS)
+    assert _types(problems) == ['faculty_overloaded']
+    assert problems[0]['hours'] == 24
+
+def test_course_of_unknown_faculty_exceeds_week():
+    problems = precheck([course(1, faculty_id=9, hours=NUM_POSITIONS + 1)], FACULTY, ROOMS)
+    assert _types(problems) == ['course_exceeds_week']
+
+def test_room_capacity():
+    faculty = [dict(FACULTY[0], id=f_id, max_hours=NUM_POSITIONS) for f_id in range(1, 4)]
+    courses = [course(f_id, faculty_id=f_id, hours=NUM_POSITIONS) for f_id in range(1, 4)]
+    problems = precheck(courses, faculty, ROOMS)
+    assert _types(problems) == ['room_capacity']
+    assert problems[0]['room_slots'] == 2 * NUM_POSITIONS
+
+def test_room_type_capacity():
+    faculty = [dict(FACULTY[0], id=f_id, max_hours=NUM_POSITIONS) for f_id in (1, 2)]
+    courses = [course(1, hours=30, room_type='Lab'), course(2, faculty_id=2, hours=15, room_type='Lab')]
+    problems = precheck(courses, faculty, ROOMS)
+    assert _types(problems) == ['room_type_capacity']
+    assert problems[0]['room_ids'] == [2]
+    assert problems[0]['course_ids'] == [1, 2]
+
+# Two 5-hour lab courses whose teachers are only free on Monday share the one
+# lab: every count fits, but Monday has 8 lab slots for 10 hours
+MONDAY_ONLY = {'Monday': True, 'Tuesday': False, 'Wednesday': False, 'Thursday': False, 'Friday': False}
+CLASH_FACULTY = [dict(FACULTY[0], availability=MONDAY_ONLY), dict(FACULTY[1], availability=MONDAY_ONLY),
+                 {'id': 3, 'name': 'Dr. C', 'max_hours': 20, 'availability': {}}]
+CLASH_COURSES = [course(1, hours=5, room_type='Lab'), course(2, faculty_id=2, hours=5, room_type='Lab'), course(3, 3)]
+
+def test_explain_conflict_names_the_clashing_courses():
+    assert precheck(CLASH_COURSES, CLASH_FACULTY, ROOMS) == []
+    conflicts = explain_conflict(CLASH_COURSES, CLASH_FACULTY, ROOMS, {'max_time_seconds': 10})
+    assert {c['course_id'] for c in conflicts if c['type'] == 'course_hours'} == {1, 2}
+    assert {'type': 'room_single_booking', 'room_id': 2} in [
+        {key: c[key] for key in ('type', 'room_id') if key in c} for c in conflicts]
+
+def test_explain_conflict_marks_unexplained(monkeypatch):
+    from conflicts import ConflictExplainer
+    monkeypatch.setattr(ConflictExplainer, '_infeasible_with', lambda self, indices, time_limit: False)
+    conflicts = explain_conflict(CLASH_COURSES, CLASH_FACULTY, ROOMS, time_limit=0.5)
+    assert [c['type'] for c in conflicts] == ['unexplained']
+    assert '0.5 seconds' in conflicts[0]['message']
+
+def test_generation_rejects_precheck_failures(db):
+    Course.update(db, 2, 'MATH201', 'Linear Algebra', 3, 'Multidisciplinary', 2, 30)
+    body, status = run_generation({'solver': {'max_time_seconds': 10}})
+    assert status == 400
+    assert body['solver_status'] == 'PRECHECK_FAILED'
+    assert 'faculty_overloaded' in _types(body['problems'])
+    assert Generation.current_version(db) == 0
+
+def test_generation_explains_infeasible_solve(db):
+    # The same clash on the sample data: CS301 (4 h) and MATH201 (5 h) in Lab 201 on Mondays
+    for f_id in (1, 2):
+        faculty = Faculty.get_by_id(db, f_id)
+        Faculty.update(db, f_id, faculty['name'], json.dumps(MONDAY_ONLY), faculty['max_hours'], faculty['expertise'])
+    Course.update(db, 1, 'CS301', 'Machine Learning', 4, 'Major', 1, 4, 'Lab')
+    Course.update(db, 2, 'MATH201', 'Linear Algebra', 3, 'Multidisciplinary', 2, 5, 'Lab')
+    body, status = run_generation({'solver': {'max_time_seconds': 10}, 'explain_seconds': 10})
+    assert status == 400
+    assert body['solver_status'] == 'INFEASIBLE'
+    assert {c['course_id'] for c in body['conflicts'] if c['type'] == 'course_hours'} == {1, 2}
+    assert 'Lab 201 holds one class at a time' in body['message']
+    assert Generation.current_version(db) == 0
+
+def test_generate_route_validates_explain_seconds(client):
+    for value in ('0', 'nan', 'soon'):
+        response = client.post(f'/api/generate-timetable?explain_seconds={value}')
+        assert response.status_code == 400
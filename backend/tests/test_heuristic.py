@@ -0,0 +1,82 @@
+from config import Config
+from generation import run_generation
+from heuristic import HeuristicScheduler
+from models import Generation, Timetable
+from occupancy import validate
+
+FACULTY = [{'id': 1, 'name': 'Dr. A', 'max_hours': 20, 'availability': {}},
+           {'id': 2, 'name': 'Dr. B', 'max_hours': 20, 'availability': {}}]
+ROOMS = [{'id': 1, 'name': 'Room 101', 'capacity': 60, 'type': 'Classroom'},
+         {'id': 2, 'name': 'Lab 201', 'capacity': 40, 'type': 'Lab'}]
+COURSES = [
+    {'id': 1, 'code': 'CS301', 'name': 'ML', 'credits': 4, 'hours_per_week': 5, 'faculty_id': 1,
+     'session_length': 2},
+    {'id': 2, 'code': 'CS302', 'name': 'ML Lab', 'credits': 2, 'hours_per_week': 6, 'faculty_id': 1,
+     'session_length': 3, 'room_type': 'Lab'},
+    {'id': 3, 'code': 'MA201', 'name': 'Algebra', 'credits': 3, 'hours_per_week': 3, 'faculty_id': 2},
+]
+
+def _runs(entries, course_id):
+    """Lengths of the consecutive same-room runs of a course's classes, per day"""
+    slot_index = {slot: i for i, slot in enumerate(Config.TIME_SLOTS)}
+    hours = sorted((e['day'], slot_index[e['slot']], e['room_id']) for e in entries if e['course_id'] == course_id)
+    runs = []
+    for k, (day, s_idx, room) in enumerate(hours):
+        if k and hours[k - 1] == (day, s_idx - 1, room):
+            runs[-1] += 1
+        else:
+            runs.append(1)
+    return sorted(runs)
+
+def test_sessions_are_contiguous():
+    scheduler = HeuristicScheduler(COURSES, FACULTY, ROOMS)
+    scheduler.build_model()
+    timetable = scheduler.solve()
+    assert scheduler.status == 'FEASIBLE'
+    assert validate(timetable, COURSES, FACULTY, ROOMS) == []
+    assert _runs(timetable, 1) == [1, 2, 2]
+    assert _runs(timetable, 2) == [3, 3]
+    assert {e['room_id'] for e in timetable if e['course_id'] == 2} == {2}
+    assert len(timetable) == 14
+
+def test_sessions_split():
+    scheduler = HeuristicScheduler(COURSES, FACULTY, ROOMS)
+    assert scheduler._sessions(COURSES[0]) == [2, 2, 1]
+    assert scheduler._sessions(dict(COURSES[2], session_length=None)) == [1, 1, 1]
+    assert scheduler._sessions(dict(COURSES[2], session_length=99)) == [3]
+
+def test_statistics_without_cp_sat_solve():
+    scheduler = HeuristicScheduler(COURSES, FACULTY, ROOMS)
+    scheduler.build_model()
+    timetable = scheduler.solve()
+    stats = scheduler.get_statistics(timetable)
+    assert stats['solver_status'] == 'FEASIBLE'
+    assert stats['objective_value'] == scheduler.objective_value()
+    assert stats['solver_time'] == scheduler.timings['solve']
+    assert stats['best_bound'] is None
+    assert stats['total_classes'] == 14
+    assert 'faculty_workload' not in stats
+
+def test_generation_with_heuristic_engine(db):
+    body, status = run_generation({'engine': 'heuristic', 'use_cache': False})
+    assert status == 200
+    assert body['statistics']['solver_status'] == 'FEASIBLE'
+    assert body['statistics']['faculty_workload'] == {1: 8, 2: 3}
+    assert Generation.current_version(db) == 1
+    assert len(Timetable.get_all(db)) == 11
+
+    body, status = run_generation({'engine': 'heuristic', 'mode': 'incremental'})
+    assert status == 200
+    assert body['statistics']['moved_classes'] == 0
+    assert Generation.current_version(db) == 2
+
+def test_generate_route_with_heuristic_engine(client, db):
+    response = client.post('/api/generate-timetable?engine=heuristic')
+    assert response.status_code == 200
+    assert response.get_json()['success']
+    assert Generation.current_version(db) == 1
+
+def test_warm_start_reports_draft(db):
+    body, status = run_generation({'solver': {'max_time_seconds': 10}, 'warm_start': True, 'use_cache': False})
+    assert status == 200
+    assert body['statistics']['warm_start']['status'] == 'FEASIBLE'
@@ -0,0 +1,71 @@
+from generation import run_generation
+from models import Course, Faculty, Generation, Room
+from scheduler import TimetableScheduler
+
+SINCE = '2020-01-01 00:00:00'
+
+def _backdate(db):
+    for table in ('faculty', 'courses', 'rooms'):
+        db.execute_query(f"UPDATE {table} SET created_at = '2000-01-01 00:00:00'", fetch=False)
+
+def test_changed_course_ids(db):
+    run_generation({'solver': {'max_time_seconds': 10}})
+    _backdate(db)
+    assert Generation.changed_course_ids(db, SINCE) == set()
+
+    course = next(c for c in Course.get_all(db) if c['id'] == 2)
+    Course.update(db, 2, course['code'], course['name'], course['credits'], course['type'], course['faculty_id'],
+                  course['hours_per_week'])
+    assert Generation.changed_course_ids(db, SINCE) == {2}
+
+    # Faculty 1 teaches courses 1 and 3
+    faculty = Faculty.get_by_id(db, 1)
+    Faculty.update(db, 1, faculty['name'], faculty['availability'], faculty['max_hours'], faculty['expertise'])
+    assert Generation.changed_course_ids(db, SINCE) == {1, 2, 3}
+
+def test_changed_course_ids_after_room_delete(db):
+    body, _ = run_generation({'solver': {'max_time_seconds': 10}})
+    _backdate(db)
+    room_id = body['data'][0]['room_id']
+    Room.delete(db, room_id)
+    expected = {e['course_id'] for e in body['data'] if e['room_id'] == room_id}
+    assert Generation.changed_course_ids(db, SINCE) == expected
+
+def _solve(courses, faculty, rooms, previous=None, changed=None, pin=False):
+    scheduler = TimetableScheduler(courses, faculty, rooms, {'max_time_seconds': 10, 'num_workers': 2})
+    if previous is not None:
+        scheduler.set_previous_solution(previous, changed, pin)
+    scheduler.build_model()
+    return scheduler.solve()
+
+def _keys(timetable):
+    return {(e['course_id'], e['day'], e['slot'], e['room_id']) for e in timetable}
+
+def test_re_solve_keeps_previous_timetable(db):
+    courses, faculty, rooms = Course.get_all(db), Faculty.get_all(db), Room.get_all(db)
+    # Not the lateness optimum: every class is in the afternoon
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday']
+    previous = ([{'course_id': 1, 'day': day, 'slot': '2:00-3:00', 'room_id': 1} for day in days]
+                + [{'course_id': 2, 'day': day, 'slot': '2:00-3:00', 'room_id': 3} for day in days[:3]]
+                + [{'course_id': 3, 'day': day, 'slot': '3:00-4:00', 'room_id': 1} for day in days])
+    # Every course counts as changed, yet no class is worth moving
+    assert _keys(_solve(courses, faculty, rooms, previous, changed=None)) == _keys(previous)
+
+def test_pin_unchanged_moves_only_changed_course(db):
+    courses, faculty, rooms = Course.get_all(db), Faculty.get_all(db), Room.get_all(db)
+    first = _solve(courses, faculty, rooms)
+    # Course 2 (Dr. Priya Sharma) may no longer use its stored days
+    used_days = {e['day'] for e in first if e['course_id'] == 2}
+    faculty = [dict(f, availability={day: False for day in used_days}) if f['id'] == 2 else f for f in faculty]
+
+    second = _solve(courses, faculty, rooms, first, changed={2}, pin=True)
+    assert second is not None
+    moved = _keys(first) - _keys(second)
+    assert moved and {course_id for course_id, *_ in moved} == {2}
+
+def test_incremental_generation_without_edits_moves_nothing(db):
+    run_generation({'solver': {'max_time_seconds': 10}})
+    body, status = run_generation({'solver': {'max_time_seconds': 10}, 'mode': 'incremental'})
+    assert status == 200
+    assert body['statistics']['moved_classes'] == 0
+    assert body['changes'] == {'added': [], 'removed': []}
@@ -0,0 +1,82 @@
+from config import Config
+from engines import ENGINES
+from interval_scheduler import IntervalScheduler
+
+NUM_SLOTS = len(Config.TIME_SLOTS)
+FACULTY = [{'id': 1, 'name': 'Dr. A', 'max_hours': 20, 'availability': {}},
+           {'id': 2, 'name': 'Dr. B', 'max_hours': 20, 'availability': {}}]
+ROOMS = [{'id': 1, 'name': 'Room 101', 'capacity': 60, 'type': 'Classroom'},
+         {'id': 2, 'name': 'Lab 201', 'capacity': 40, 'type': 'Lab'},
+         {'id': 3, 'name': 'Room 102', 'capacity': 50, 'type': 'Classroom'}]
+COURSES = [
+    {'id': 1, 'code': 'CS301', 'name': 'ML', 'credits': 4, 'hours_per_week': 4, 'faculty_id': 1},
+    {'id': 2, 'code': 'CS302', 'name': 'ML Lab', 'credits': 2, 'hours_per_week': 5, 'faculty_id': 1,
+     'room_type': 'Lab', 'session_length': 2},
+    {'id': 3, 'code': 'MA201', 'name': 'Algebra', 'credits': 3, 'hours_per_week': 3, 'faculty_id': 2},
+]
+
+def _solve(faculty=FACULTY, previous=None, changed=None, pin=False):
+    scheduler = IntervalScheduler(COURSES, faculty, ROOMS, {'max_time_seconds': 10, 'num_workers': 2})
+    if previous is not None:
+        scheduler.set_previous_solution(previous, changed, pin)
+    scheduler.build_model()
+    return scheduler, scheduler.solve()
+
+def _keys(timetable):
+    return {(e['course_id'], e['day'], e['slot'], e['room_id']) for e in timetable}
+
+def _position(entry):
+    return Config.DAYS.index(entry['day']) * NUM_SLOTS + Config.TIME_SLOTS.index(entry['slot'])
+
+def test_registered():
+    assert ENGINES['interval'] is IntervalScheduler
+
+def test_sessions_are_contiguous_and_clash_free():
+    scheduler, timetable = _solve()
+    assert len(timetable) == 12
+    lab = sorted((_position(e), e['room_id']) for e in timetable if e['course_id'] == 2)
+    assert {room for _, room in lab} == {2}
+    positions = [p for p, _ in lab]
+    # Two 2-hour sessions and one 1-hour session, each within one day
+    runs = []
+    for k, p in enumerate(positions):
+        if k and positions[k - 1] == p - 1 and p % NUM_SLOTS:
+            runs[-1] += 1
+        else:
+            runs.append(1)
+    assert sorted(runs) in ([1, 2, 2], [1, 4], [2, 3], [5])
+    assert len(scheduler.sessions) == 4 + 3 + 3
+
+    for kind in ('room_id', 'faculty_id'):
+        used = [(e[kind], _position(e)) for e in timetable]
+        assert len(used) == len(set(used))
+
+def test_pruned_variables_count_unfitting_rooms():
+    scheduler, _ = _solve()
+    # The lab sessions skip the two classrooms; the other seven sessions skip nothing
+    assert scheduler.pruned_variables == 3 * 2
+
+def test_re_solve_keeps_stored_sessions():
+    # Not the lateness optimum: every session is in the afternoon
+    previous = ([{'course_id': 1, 'day': day, 'slot': '4:00-5:00', 'room_id': 1} for day in Config.DAYS[:4]]
+                + [{'course_id': 2, 'day': day, 'slot': slot, 'room_id': 2}
+                   for day in Config.DAYS[:2] for slot in ('2:00-3:00', '3:00-4:00')]
+                + [{'course_id': 2, 'day': 'Friday', 'slot': '2:00-3:00', 'room_id': 2}]
+                + [{'course_id': 3, 'day': day, 'slot': '2:00-3:00', 'room_id': 3} for day in Config.DAYS[:3]])
+    _, timetable = _solve(previous=previous)
+    assert _keys(timetable) == _keys(previous)
+
+def test_pin_unchanged_moves_only_changed_course():
+    _, first = _solve()
+    used_days = {e['day'] for e in first if e['course_id'] == 3}
+    faculty = [dict(f, availability={day: False for day in used_days}) if f['id'] == 2 else f for f in FACULTY]
+    _, second = _solve(faculty, first, changed={3}, pin=True)
+    moved = _keys(first) - _keys(second)
+    assert moved and {course_id for course_id, *_ in moved} == {3}
+
+def test_scattered_stored_lab_hours_count_as_changed():
+    # Grid-engine style layout: lab hours not in 2-hour blocks
+    previous = [{'course_id': 2, 'day': day, 'slot': '9:00-10:00', 'room_id': 2} for day in Config.DAYS]
+    scheduler, timetable = _solve(previous=previous, changed=set(), pin=True)
+    assert scheduler._previous_layout(2, [2, 2, 1]) is None
+    assert len(timetable) == 12
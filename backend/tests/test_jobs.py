@@ -0,0 +1,106 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+import jobs
+from generation import GenerationProgress, run_generation
+from scheduler import TimetableScheduler
+
+class CountingEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.waits = 0
+
+    def wait(self, timeout=None):
+        self.waits += 1
+        return super().wait(timeout)
+
+def _hard_instance():
+    """60 courses in 8 rooms: CP-SAT does not prove an optimum within seconds"""
+    rng = random.Random(0)
+    faculty = [{'id': i, 'name': f'F{i}', 'max_hours': 40, 'availability': {}} for i in range(1, 21)]
+    rooms = [{'id': i, 'name': f'R{i}', 'capacity': rng.choice([30, 60, 90]), 'type': 'Classroom'}
+             for i in range(1, 9)]
+    courses = [{'id': i, 'code': f'C{i}', 'name': f'Course {i}', 'credits': 4, 'hours_per_week': rng.randint(3, 5),
+                'faculty_id': rng.randint(1, 20), 'enrollment': rng.randint(10, 80)} for i in range(1, 61)]
+    return courses, faculty, rooms
+
+def test_cancel_before_attach_does_not_spin():
+    cancel_event = CountingEvent()
+    cancel_event.set()
+    progress = jobs._JobProgress({}, cancel_event, threading.Event())
+    time.sleep(0.5)
+    progress.finished = True
+    assert cancel_event.waits == 0
+    assert progress.cancelled()
+
+def test_cancel_stops_running_solver():
+    cancel_event = threading.Event()
+    progress = jobs._JobProgress({}, cancel_event, threading.Event())
+    scheduler = TimetableScheduler(*_hard_instance(), {'max_time_seconds': 30, 'num_workers': 2})
+    progress.attach(scheduler)
+    scheduler.build_model()
+    threading.Timer(0.5, cancel_event.set).start()
+    started = time.perf_counter()
+    scheduler.solve()
+    progress.finished = True
+    assert time.perf_counter() - started < 10
+
+def test_run_job_reports_cancellation(db):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    state = {}
+    jobs._run_job(state, cancel_event, threading.Event(), None)
+    assert state['status'] == 'cancelled'
+    assert state['http_status'] == 409
+
+def test_run_generation_publishes_phases(db):
+    phases = []
+
+    class Recorder(GenerationProgress):
+        def phase(self, name, progress):
+            phases.append(name)
+
+    body, status = run_generation({'max_time_seconds': 10}, Recorder())
+    assert status == 200
+    assert body['success']
+    assert len(body['data']) == 11
+    assert phases == ['fetching', 'building', 'solving', 'saving', 'done']
+
+def test_stop_keeps_the_solution(db):
+    stop_event = threading.Event()
+    stop_event.set()
+    state = {}
+    jobs._run_job(state, threading.Event(), stop_event, {'solver': {'max_time_seconds': 10}})
+    assert state['status'] == 'succeeded'
+    assert state['result']['success']
+
+def test_job_event_log(db):
+    state = {}
+    jobs._run_job(state, threading.Event(), threading.Event(), {'solver': {'max_time_seconds': 10}})
+    events = state['events']
+    assert [event['seq'] for event in events] == list(range(1, len(events) + 1))
+    assert [event['phase'] for event in events if event['type'] == 'phase'][0] == 'fetching'
+    solutions = [event for event in events if event['type'] == 'solution']
+    assert solutions and solutions[-1]['objective_value'] == state['result']['statistics']['objective_value']
+    assert state['result']['statistics']['solutions_found'] == len(solutions)
+    assert {'fetch', 'build', 'solve', 'persist'} <= set(state['result']['statistics']['timings'])
+
+def test_event_stream_resumes_after_last_event_id(client, monkeypatch):
+    future = Future()
+    future.set_result(None)
+    events = [{'seq': 1, 'type': 'phase', 'phase': 'fetching'}, {'seq': 2, 'type': 'phase', 'phase': 'solving'}]
+    state = {'status': 'succeeded', 'events': events, 'result': {'success': True}}
+    monkeypatch.setitem(jobs._jobs, 'finished', {'state': state, 'future': future})
+
+    response = client.get('/api/jobs/finished/events', headers={'Last-Event-ID': '1'})
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert 'id: 1' not in body
+    assert 'id: 2\nevent: phase' in body
+    assert body.rstrip().splitlines()[-2] == 'event: done'
+    assert client.get('/api/jobs/missing/events').status_code == 404
+
+def test_unknown_job():
+    assert jobs.get('missing') is None
+    assert jobs.cancel('missing') is False
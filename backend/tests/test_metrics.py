@@ -0,0 +1,62 @@
+import metrics
+from models import Generation
+from tests.conftest import publish
+
+def _value(metric, *labels):
+    return metric.values.get(labels, 0)
+
+def test_render_histogram_and_escaping():
+    histogram = metrics.Histogram('test_duration_seconds', 'Test latency', ('route',), buckets=(0.1, 1))
+    counter = metrics.Counter('test_events_total', 'Test events', ('name',))
+    try:
+        histogram.observe('/a', value=0.05)
+        histogram.observe('/a', value=5)
+        counter.inc('say "hi"\n')
+        text = metrics.render()
+    finally:
+        metrics._metrics.remove(histogram)
+        metrics._metrics.remove(counter)
+    assert '# TYPE test_duration_seconds histogram' in text
+    assert 'test_duration_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_duration_seconds_bucket{route="/a",le="1"} 1' in text
+    assert 'test_duration_seconds_bucket{route="/a",le="+Inf"} 2' in text
+    assert 'test_duration_seconds_count{route="/a"} 2' in text
+    assert 'test_events_total{name="say \\"hi\\"\\n"} 1' in text
+
+def test_query_labels():
+    assert metrics.query_labels("SELECT * FROM courses WHERE id = ?") == ('SELECT', 'courses')
+    assert metrics.query_labels("\n  INSERT INTO timetable (course_id) VALUES (?)") == ('INSERT', 'timetable')
+    assert metrics.query_labels("PRAGMA optimize") == ('PRAGMA', '')
+
+def test_ddl_rowcount_is_not_counted(db):
+    labels = ('CREATE', 'scratch')
+    before = _value(metrics.db_rows, *labels)
+    assert db.execute_query("CREATE TABLE scratch (id INTEGER)", fetch=False)
+    assert _value(metrics.db_rows, *labels) == before
+
+def test_stale_publish_counts_as_skipped(db):
+    base = publish(db, [(1, 1, 1, 'Monday', '9:00-10:00')])
+    publish(db, [(1, 1, 1, 'Tuesday', '9:00-10:00')])
+    labels = ('INSERT', 'timetable')
+    skipped, errors = _value(metrics.db_skipped, *labels), _value(metrics.db_errors, *labels)
+    assert publish(db, [(1, 1, 1, 'Friday', '9:00-10:00')], base_version=base) is None
+    assert _value(metrics.db_skipped, *labels) == skipped + 1
+    assert _value(metrics.db_errors, *labels) == errors
+    assert Generation.current_version(db) == base + 1
+
+def test_metrics_endpoint(client):
+    client.get('/api/rooms')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'http_requests_total{method="GET",route="/api/rooms",status="200"}' in text
+    assert 'db_query_duration_seconds_count{operation="SELECT",table="rooms"}' in text
+
+def test_record_generation():
+    before = _value(metrics.generations, 'heuristic', 'full', 'FEASIBLE')
+    metrics.record_generation({'success': True, 'statistics': {'solver_status': 'FEASIBLE', 'solver_time': 0.01,
+                                                               'objective_value': 10, 'best_bound': 8}},
+                              200, {'engine': 'heuristic'})
+    assert _value(metrics.generations, 'heuristic', 'full', 'FEASIBLE') == before + 1
+    assert metrics.solver_gap.values[('heuristic',)] == 0.2
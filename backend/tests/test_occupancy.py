@@ -0,0 +1,156 @@
+from models import Course, Faculty, Generation, Room, Timetable
+import occupancy
+from occupancy import OccupancyIndex, validate
+from tests.conftest import entry, publish
+
+MONDAY_9 = ('Monday', '9:00-10:00')
+
+def _index(db, entries=()):
+    return OccupancyIndex(list(entries), Course.get_all(db), Faculty.get_all(db), Room.get_all(db))
+
+def _same(index, other):
+    assert index.version == other.version
+    for kind in ('faculty', 'room', 'course'):
+        assert {k: v for k, v in index.busy[kind].items() if v} == {k: v for k, v in other.busy[kind].items() if v}
+
+def test_add_and_remove(db):
+    index = _index(db)
+    first = entry(1, 1, 1, *MONDAY_9)
+    position = index.position(*MONDAY_9)
+    index.add(first)
+    assert not index.is_free('faculty', 1, position)
+    assert not index.is_free('room', 1, position)
+    assert index.is_free('room', 3, position)
+    assert index.is_free('faculty', 1, position, ignore=first)
+
+    index.remove(first)
+    assert index.is_free('faculty', 1, position)
+    assert index.is_free('room', 1, position)
+    assert index.is_free('course', 1, position)
+
+def test_conflicts(db):
+    index = _index(db, [entry(1, 1, 1, *MONDAY_9)])
+    same_faculty_and_room = {c['type'] for c in index.conflicts(entry(3, 1, 1, *MONDAY_9))}
+    assert same_faculty_and_room == {'faculty_busy', 'room_busy'}
+    assert index.conflicts(entry(2, 2, 3, *MONDAY_9)) == []
+    assert [c['type'] for c in index.conflicts(entry(2, 2, 1, 'Monday', 'Someday'))] == ['invalid_slot']
+    assert [c['type'] for c in index.conflicts(entry(99, 2, 1, *MONDAY_9))] == ['unknown_course']
+
+def test_validate_reports_clashes_and_overload(db):
+    Faculty.update(db, 2, 'Dr. Priya Sharma', '{}', 1, '')
+    problems = validate([entry(2, 2, 1, *MONDAY_9), entry(2, 2, 3, *MONDAY_9), entry(2, 2, 3, 'Tuesday', '9:00-10:00')],
+                        Course.get_all(db), Faculty.get_all(db), Room.get_all(db))
+    assert problems[0]['entry'] == 1
+    assert {c['type'] for c in problems[0]['conflicts']} == {'faculty_busy', 'course_busy'}
+    assert problems[-1]['entry'] is None
+    assert problems[-1]['conflicts'][0]['type'] == 'faculty_overloaded'
+
+def test_current_index_follows_new_versions(db):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00'), (2, 2, 3, 'Monday', '9:00-10:00')])
+    first = occupancy.current_index(db)
+    assert occupancy.current_index(db) is first
+
+    version = publish(db, [(1, 1, 1, 'Tuesday', '9:00-10:00'), (2, 2, 3, 'Monday', '9:00-10:00')])
+    refreshed = occupancy.current_index(db)
+    assert refreshed is not first
+    assert refreshed.version == version
+    _same(refreshed, occupancy._build(db))
+    # The diff was applied to a copy, the previous index is untouched
+    assert not first.is_free('room', 1, first.position(*MONDAY_9))
+
+def test_current_index_drops_deleted_course(db):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00'), (3, 1, 1, 'Tuesday', '9:00-10:00')])
+    occupancy.current_index(db)
+
+    # Deleting course 3 hides its row from the joined timetable without a new version
+    Course.delete(db, 3)
+    index = occupancy.current_index(db)
+    _same(index, occupancy._build(db))
+    assert index.is_free('room', 1, index.position('Tuesday', '9:00-10:00'))
+
+    # A regenerate after the delete must not keep the deleted course's bits either
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00'), (2, 2, 3, 'Wednesday', '9:00-10:00')])
+    _same(occupancy.current_index(db), occupancy._build(db))
+
+def test_current_index_drops_course_deleted_before_regenerate(db):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00'), (3, 1, 1, 'Tuesday', '9:00-10:00')])
+    occupancy.current_index(db)
+
+    # The v1 -> v2 diff cannot list the deleted course's row as removed, it no longer joins
+    Course.delete(db, 3)
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00')])
+    index = occupancy.current_index(db)
+    _same(index, occupancy._build(db))
+    assert index.is_free('faculty', 1, index.position('Tuesday', '9:00-10:00'))
+
+def test_current_index_rebuilds_on_room_change(db):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00')])
+    occupancy.current_index(db)
+    Room.update(db, 3, 'Room 102', 10, 'Classroom')
+    index = occupancy.current_index(db)
+    assert index.rooms[3]['capacity'] == 10
+    _same(index, occupancy._build(db))
+
+def test_free_rooms_faculty_and_slots(db):
+    index = _index(db, [entry(1, 1, 1, *MONDAY_9)])
+    position = index.position(*MONDAY_9)
+    assert [room['id'] for room in index.free_rooms(position)] == [2, 3]
+    assert [room['id'] for room in index.free_rooms(position, min_capacity=45)] == [3]
+    assert [room['id'] for room in index.free_rooms(position, room_type='Lab')] == [2]
+    assert [f['id'] for f in index.free_faculty(position)] == [2]
+
+    slots = index.free_positions(faculty_id=1, room_id=3)
+    assert MONDAY_9 not in slots
+    assert len(slots) == len(index.free_positions(room_id=3)) - 1
+
+def test_validate_route(client, db):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00')])
+    assert client.post('/api/timetable/validate', json={}).get_json()['valid']
+
+    body = client.post('/api/timetable/validate', json={'entries': [entry(1, 1, 1), entry(3, 1, 1)]}).get_json()
+    assert not body['valid']
+    assert body['conflicts'][0]['entry'] == 1
+    assert client.post('/api/timetable/validate', json={'entries': 'all'}).status_code == 400
+
+def test_move_route(client, db):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00'), (3, 1, 3, 'Tuesday', '9:00-10:00')])
+    moving, other = sorted(Timetable.get_all(db), key=lambda e: e['course_id'])
+
+    clash = client.post('/api/timetable/move', json={'entry_id': moving['id'], 'day': 'Tuesday'})
+    assert clash.status_code == 409
+    assert 'faculty_busy' in {c['type'] for c in clash.get_json()['conflicts']}
+
+    dry_run = client.post('/api/timetable/move?dry_run=1', json={'entry_id': moving['id'], 'day': 'Wednesday'})
+    assert dry_run.status_code == 200
+    assert Generation.current_version(db) == 1
+
+    response = client.post('/api/timetable/move', json={'entry_id': moving['id'], 'day': 'Wednesday'})
+    assert response.status_code == 200
+    assert response.get_json()['version'] == 2
+    assert {(e['course_id'], e['day']) for e in Timetable.get_all(db)} == {(1, 'Wednesday'), (3, 'Tuesday')}
+    # The old entry id belongs to the superseded version
+    assert client.post('/api/timetable/move', json={'entry_id': moving['id'], 'day': 'Friday'}).status_code == 404
+
+def test_free_routes(client, db):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00')])
+    rooms = client.get('/api/timetable/free-rooms?day=Monday&slot=9:00-10:00&min_capacity=45').get_json()
+    assert [room['id'] for room in rooms['data']] == [3]
+    faculty = client.get('/api/timetable/free-faculty?day=Monday&slot=9:00-10:00').get_json()
+    assert [f['id'] for f in faculty['data']] == [2]
+    slots = client.get('/api/timetable/free-slots?faculty_id=1').get_json()['data']
+    assert {'day': 'Monday', 'slot': '9:00-10:00'} not in slots
+
+    assert client.get('/api/timetable/free-rooms?day=Someday&slot=9:00-10:00').status_code == 400
+    assert client.get('/api/timetable/free-slots').status_code == 400
+    assert client.get('/api/timetable/free-slots?room_id=99').status_code == 404
+
+def test_move_based_on_superseded_version(client, db, monkeypatch):
+    publish(db, [(1, 1, 1, 'Monday', '9:00-10:00')])
+    moving = Timetable.get_all(db)[0]
+    stale = occupancy.current_index(db)
+    publish(db, [(1, 1, 1, 'Friday', '9:00-10:00')])
+    # The index was read just before another version was published
+    monkeypatch.setattr(occupancy, 'current_index', lambda db: stale)
+    response = client.post('/api/timetable/move', json={'entry_id': moving['id'], 'day': 'Wednesday'})
+    assert response.status_code == 409
+    assert Generation.current_version(db) == 2
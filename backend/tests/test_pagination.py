@@ -0,0 +1,86 @@
+import pytest
+from config import Config
+from models import Timetable
+from tests.conftest import publish
+from utils.pagination import list_args
+
+FILTERS = {'faculty_id': ('faculty_id', int), 'day': ('day', str)}
+
+def test_defaults():
+    assert list_args({}, Timetable.COLUMNS, FILTERS) == {'after': None, 'limit': None, 'fields': None}
+
+def test_filters_cursor_and_fields():
+    kwargs = list_args({'faculty_id': '3', 'day': 'Monday', 'after': '12', 'limit': '50', 'fields': 'id, day,,slot'},
+                       Timetable.COLUMNS, FILTERS)
+    assert kwargs == {'faculty_id': 3, 'day': 'Monday', 'after': 12, 'limit': 50, 'fields': ['id', 'day', 'slot']}
+
+def test_limit_is_capped(monkeypatch):
+    monkeypatch.setattr(Config, 'PAGE_MAX_LIMIT', 100)
+    assert list_args({'limit': '5000'}, Timetable.COLUMNS)['limit'] == 100
+
+@pytest.mark.parametrize('args, message', [
+    ({'after': 'abc'}, 'after must be an integer'),
+    ({'limit': '0'}, 'limit must be at least 1'),
+    ({'after': '-1'}, 'after must be at least 0'),
+    ({'faculty_id': '1.5'}, 'faculty_id must be an integer'),
+    ({'fields': 'id,password'}, 'Unknown fields: password'),
+])
+def test_invalid_args(args, message):
+    with pytest.raises(ValueError, match=message):
+        list_args(args, Timetable.COLUMNS, FILTERS)
+
+ROWS = [(1, 1, 1, day, slot) for day in ('Monday', 'Tuesday') for slot in ('9:00-10:00', '10:00-11:00')] + \
+       [(2, 2, 2, 'Monday', '11:00-12:00'), (3, 1, 3, 'Wednesday', '9:00-10:00')]
+
+def test_keyset_pages_cover_every_row(db):
+    publish(db, ROWS)
+    expected = Timetable.get_all(db)
+    assert len(expected) == len(ROWS)
+
+    pages, after = [], None
+    while True:
+        page = Timetable.get_all(db, after=after, limit=2, fields=['day', 'slot'])
+        if not page:
+            break
+        assert set(page[0]) == {'id', 'day', 'slot'}
+        pages.extend(page)
+        after = page[-1]['id']
+    assert [row['id'] for row in pages] == [row['id'] for row in expected]
+
+def test_filters(db):
+    publish(db, ROWS)
+    assert {row['course_id'] for row in Timetable.get_all(db, faculty_id=1)} == {1, 3}
+    assert len(Timetable.get_all(db, day='Monday')) == 3
+    assert Timetable.get_all(db, day='Someday') == []
+    # Rows are ordered by day and slot: Monday 10:00 (id 2) is followed by Monday 11:00 (id 5)
+    assert [row['id'] for row in Timetable.get_all(db, after=2, limit=1)] == [5]
+
+def test_projection_keeps_joins(db):
+    publish(db, ROWS)
+    db.execute_query("DELETE FROM rooms WHERE id = 2", fetch=False)
+    # The class in the deleted room is left out whatever the projection
+    full = Timetable.get_all(db)
+    assert len(full) == len(ROWS) - 1
+    assert Timetable.get_all(db, fields=['id', 'day']) == [{'id': row['id'], 'day': row['day']} for row in full]
+
+def test_paged_route(client, db):
+    publish(db, ROWS)
+    first = client.get('/api/timetable?limit=4&fields=day')
+    assert first.status_code == 200
+    page = first.get_json()['data']
+    assert len(page) == 4
+
+    rest = client.get(f"/api/timetable?after={page[-1]['id']}&fields=day").get_json()['data']
+    assert len(rest) == len(ROWS) - 4
+    assert client.get('/api/timetable?fields=password').status_code == 400
+
+def test_expired_cursor(client, db, monkeypatch):
+    monkeypatch.setattr(Config, 'TIMETABLE_HISTORY_VERSIONS', 1)
+    publish(db, ROWS)
+    after = Timetable.get_all(db)[0]['id']
+    assert client.get(f'/api/timetable?after={after}').status_code == 200
+    # Publishing again prunes the version the cursor points into
+    publish(db, ROWS)
+    response = client.get(f'/api/timetable?after={after}')
+    assert response.status_code == 400
+    assert 'Cursor expired' in response.get_json()['message']
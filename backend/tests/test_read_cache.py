@@ -0,0 +1,65 @@
+import threading
+import time
+from generation import run_generation
+from models import ChangeCounter, Faculty, Room
+from utils.read_cache import ReadCache
+
+def test_etag_and_not_modified(client):
+    response = client.get('/api/rooms')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert len(response.get_json()['data']) == 3
+
+    cached = client.get('/api/rooms', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+def test_write_changes_etag(client, db):
+    etag = client.get('/api/rooms').headers['ETag']
+    Room.update(db, 1, 'Room 101A', 60, 'Classroom')
+
+    response = client.get('/api/rooms', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert 'Room 101A' in {room['name'] for room in response.get_json()['data']}
+
+def test_timetable_etag_follows_reference_tables(client, db):
+    etag = client.get('/api/timetable').headers['ETag']
+    Faculty.delete(db, 2)
+    assert client.get('/api/timetable', headers={'If-None-Match': etag}).status_code == 200
+
+def test_counters_bump_once_per_write(db):
+    before = ChangeCounter.versions(db, ('faculty', 'rooms', 'timetable'))
+    Faculty.bulk_create(db, [(f'Dr. {i}', '{}', 20, '') for i in range(5)])
+    Room.create(db, 'Room 9', 30, 'Classroom')
+    run_generation({'solver': {'max_time_seconds': 10}, 'use_cache': False})
+    after = ChangeCounter.versions(db, ('faculty', 'rooms', 'timetable'))
+    # One bulk import, one insert and one publish of 11 classes
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 1]
+
+def test_concurrent_misses_share_one_load():
+    cache = ReadCache(4)
+    loads = []
+    def load():
+        loads.append(1)
+        time.sleep(0.2)
+        return 'body'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('k', 'e1', load)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['body'] * 8
+    assert len(loads) == 1
+    # A new ETag loads again
+    assert cache.get_or_load('k', 'e2', lambda: 'new') == 'new'
+
+def test_lru_eviction():
+    cache = ReadCache(2)
+    for key in ('a', 'b', 'c'):
+        cache.get_or_load(key, 'e', lambda: key)
+    assert cache.get_or_load('a', 'e', lambda: 'reloaded') == 'reloaded'
+    assert cache.get_or_load('c', 'e', lambda: 'reloaded') == 'c'
@@ -0,0 +1,50 @@
+import analytics
+from config import Config
+from scheduler import TimetableScheduler
+
+FACULTY = [{'id': 1, 'name': 'Dr. A', 'max_hours': 20,
+            'availability': {'Monday': ['9:00-10:00', 1], 'Tuesday': True, 'Wednesday': False,
+                             'Thursday': False, 'Friday': False}},
+           {'id': 2, 'name': 'Dr. B', 'max_hours': 20, 'availability': '{"Friday": false}'}]
+ROOMS = [{'id': 1, 'name': 'Room 101', 'capacity': 60, 'type': 'Classroom'},
+         {'id': 2, 'name': 'Lab 201', 'capacity': 40, 'type': 'Lab'},
+         {'id': 3, 'name': 'Room 102', 'capacity': 20, 'type': 'Classroom'}]
+COURSES = [
+    {'id': 1, 'code': 'CS301', 'name': 'ML', 'credits': 3, 'hours_per_week': 3, 'faculty_id': 1, 'enrollment': 30},
+    {'id': 2, 'code': 'CS302', 'name': 'ML Lab', 'credits': 2, 'hours_per_week': 2, 'faculty_id': 2,
+     'room_type': 'Lab'},
+]
+NUM_SLOTS = len(Config.TIME_SLOTS)
+
+def test_allowed_slots_follow_availability():
+    scheduler = TimetableScheduler(COURSES, FACULTY, ROOMS)
+    assert scheduler._allowed_slots(1) == [(0, 0), (0, 1)] + [(1, s) for s in range(NUM_SLOTS)]
+    # JSON strings are parsed and missing days default to available
+    assert len(scheduler._allowed_slots(2)) == 4 * NUM_SLOTS
+    assert len(scheduler._allowed_slots(99)) == 5 * NUM_SLOTS
+
+def test_room_fits():
+    assert TimetableScheduler.room_fits(COURSES[0], ROOMS[0])
+    assert TimetableScheduler.room_fits(COURSES[0], ROOMS[1])
+    assert not TimetableScheduler.room_fits(COURSES[0], ROOMS[2])
+    assert not TimetableScheduler.room_fits(COURSES[1], ROOMS[0])
+
+def test_variables_are_pruned_and_solution_respects_them():
+    scheduler = TimetableScheduler(COURSES, FACULTY, ROOMS)
+    timetable = scheduler.generate_timetable()
+    # Course 1: 10 allowed slots x 2 fitting rooms; course 2: 32 allowed slots x 1 lab
+    assert scheduler.num_variables == 10 * 2 + 4 * NUM_SLOTS * 1
+    assert scheduler.num_variables + scheduler.pruned_variables == 2 * 5 * NUM_SLOTS * 3
+
+    assert len(timetable) == 5
+    for entry in timetable:
+        if entry['course_id'] == 1:
+            assert entry['room_id'] in (1, 2)
+            assert entry['day'] in ('Monday', 'Tuesday')
+        else:
+            assert entry['room_id'] == 2
+            assert entry['day'] != 'Friday'
+    stats = scheduler.get_statistics(timetable)
+    assert stats['variables'] == scheduler.num_variables
+    summary = analytics.build(timetable, COURSES, FACULTY, ROOMS)
+    assert analytics.workload(summary)['faculty_workload'] == {1: 3, 2: 2}
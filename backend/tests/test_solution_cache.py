@@ -0,0 +1,67 @@
+import os
+import solution_cache
+from config import Config
+from generation import run_generation
+from models import Course, Faculty, Room
+from scheduler import TimetableScheduler
+
+SOLVER = {'max_time_seconds': 10}
+
+def _inputs(db):
+    return Course.get_all(db), Faculty.get_all(db), Room.get_all(db)
+
+def test_input_hash_is_canonical(db):
+    courses, faculty, rooms = _inputs(db)
+    key = solution_cache.input_hash(courses, faculty, rooms, {'solver': SOLVER})
+    # Row order and fields the solver ignores do not matter
+    stamped = [dict(c, created_at='2030-01-01 00:00:00') for c in reversed(courses)]
+    assert solution_cache.input_hash(stamped, faculty[::-1], rooms[::-1], {'solver': SOLVER}) == key
+
+    changed = [dict(c, hours_per_week=2) if c['id'] == 2 else c for c in courses]
+    assert solution_cache.input_hash(changed, faculty, rooms, {'solver': SOLVER}) != key
+    assert solution_cache.input_hash(courses, faculty, rooms, {'solver': SOLVER, 'engine': 'interval'}) != key
+    assert solution_cache.input_hash(courses, faculty, rooms, {'solver': {'max_time_seconds': 5}}) != key
+
+def test_identical_inputs_hit_the_cache(db):
+    first, status = run_generation({'solver': SOLVER})
+    assert status == 200
+    assert not first['statistics'].get('cache_hit')
+    assert len(os.listdir(Config.SOLUTION_CACHE_DIR)) == 1
+
+    second, status = run_generation({'solver': SOLVER})
+    assert status == 200
+    assert second['statistics']['cache_hit']
+    assert second['data'] == first['data']
+
+def test_cache_bypass(db):
+    run_generation({'solver': SOLVER, 'use_cache': False})
+    assert not os.path.exists(Config.SOLUTION_CACHE_DIR)
+
+def test_route_bypass(client):
+    response = client.post('/api/generate-timetable?cache=0', json={'solver': SOLVER})
+    assert response.status_code == 200
+    assert not os.path.exists(Config.SOLUTION_CACHE_DIR)
+
+def test_eviction_keeps_most_recent(db, monkeypatch):
+    monkeypatch.setattr(Config, 'SOLUTION_CACHE_MAX_ENTRIES', 2)
+    for i, key in enumerate(('a', 'b')):
+        solution_cache.put(key, [], {})
+        os.utime(os.path.join(Config.SOLUTION_CACHE_DIR, f'{key}.json'), (i, i))
+    # Reading 'a' makes 'b' the least recently used entry
+    solution_cache.get('a')
+    solution_cache.put('c', [], {})
+    assert sorted(os.listdir(Config.SOLUTION_CACHE_DIR)) == ['a.json', 'c.json']
+    assert solution_cache.get('b') is None
+
+def test_hint_only_warm_start_does_not_keep_classes(db):
+    courses, faculty, rooms = _inputs(db)
+    # Not the lateness optimum: every class is in the afternoon
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday']
+    previous = ([{'course_id': 1, 'day': day, 'slot': '2:00-3:00', 'room_id': 1} for day in days]
+                + [{'course_id': 2, 'day': day, 'slot': '2:00-3:00', 'room_id': 3} for day in days[:3]]
+                + [{'course_id': 3, 'day': day, 'slot': '3:00-4:00', 'room_id': 1} for day in days])
+    scheduler = TimetableScheduler(courses, faculty, rooms, {'max_time_seconds': 10, 'num_workers': 2})
+    scheduler.set_previous_solution(previous, minimize_moves=False)
+    scheduler.build_model()
+    timetable = scheduler.solve()
+    assert {e['slot'] for e in timetable} <= {'9:00-10:00', '10:00-11:00'}
@@ -0,0 +1,40 @@
+import pytest
+from config import Config
+from scheduler import TimetableScheduler
+from solver_input import solver_params_from
+
+def test_defaults_come_from_config():
+    assert solver_params_from() == {
+        'max_time_seconds': Config.SOLVER_MAX_TIME_SECONDS,
+        'num_workers': Config.SOLVER_NUM_WORKERS,
+        'random_seed': Config.SOLVER_RANDOM_SEED,
+        'first_feasible': Config.SOLVER_FIRST_FEASIBLE,
+    }
+
+def test_overrides_are_converted():
+    params = solver_params_from({'max_time_seconds': '2.5', 'num_workers': '4', 'random_seed': 7,
+                                 'first_feasible': 'true'})
+    assert params == {'max_time_seconds': 2.5, 'num_workers': 4, 'random_seed': 7, 'first_feasible': True}
+    assert solver_params_from({'first_feasible': 'no'})['first_feasible'] is False
+
+@pytest.mark.parametrize('overrides, message', [
+    ({'max_time_seconds': 0}, 'max_time_seconds must be a positive finite number'),
+    ({'max_time_seconds': 'nan'}, 'max_time_seconds must be a positive finite number'),
+    ({'max_time_seconds': 'inf'}, 'max_time_seconds must be a positive finite number'),
+    ({'max_time_seconds': float('-inf')}, 'max_time_seconds must be a positive finite number'),
+    ({'max_time_seconds': 'soon'}, 'could not convert'),
+    ({'num_workers': -1}, 'num_workers must not be negative'),
+    ({'threads': 2}, 'Unknown solver parameter: threads'),
+])
+def test_invalid_overrides(overrides, message):
+    with pytest.raises(ValueError, match=message):
+        solver_params_from(overrides)
+
+def test_params_reach_the_solver():
+    scheduler = TimetableScheduler([], [], [], {'max_time_seconds': 3, 'num_workers': 2, 'random_seed': 5,
+                                                'first_feasible': True})
+    parameters = scheduler.solver.parameters
+    assert parameters.max_time_in_seconds == 3
+    assert parameters.num_workers == 2
+    assert parameters.random_seed == 5
+    assert parameters.stop_after_first_solution
@@ -0,0 +1,73 @@
+from config import Config
+from models import ChangeCounter, Generation, Timetable
+from tests.conftest import publish
+
+WEEK = [(1, 1, 1, 'Monday', '9:00-10:00'), (2, 2, 3, 'Monday', '9:00-10:00'), (3, 1, 2, 'Tuesday', '10:00-11:00')]
+
+def _keys(rows):
+    return {(r['course_id'], r['room_id'], r['day'], r['slot']) for r in rows}
+
+def test_publish_makes_new_version_current(db):
+    assert Generation.current_version(db) == 0
+    first = publish(db, WEEK)
+    second = publish(db, WEEK[:2])
+    assert (first, second) == (1, 2)
+    assert Generation.current_version(db) == second
+    assert len(Timetable.get_all(db)) == 2
+    assert len(Timetable.get_all(db, version=first)) == 3
+
+def test_publish_bumps_timetable_counter_once(db):
+    before, = ChangeCounter.versions(db, ('timetable',))
+    publish(db, WEEK)
+    after, = ChangeCounter.versions(db, ('timetable',))
+    assert after == before + 1
+
+def test_failed_publish_keeps_previous_version(db):
+    first = publish(db, WEEK)
+    # A NULL day violates NOT NULL halfway through the insert
+    assert publish(db, WEEK[:1] + [(1, 1, 1, None, '9:00-10:00')]) is None
+    assert Generation.current_version(db) == first
+    assert _keys(Timetable.get_all(db)) == _keys(Timetable.get_all(db, version=first))
+
+def test_publish_skips_stale_base_version(db):
+    base = publish(db, WEEK)
+    publish(db, WEEK[:1])
+    assert publish(db, WEEK[1:], base_version=base) is None
+    assert Generation.current_version(db) == base + 1
+    assert publish(db, WEEK[1:], base_version=base + 1) == base + 2
+
+def test_diff(db):
+    first = publish(db, WEEK)
+    second = publish(db, [WEEK[0], WEEK[1], (3, 1, 2, 'Friday', '10:00-11:00')])
+    changes = Timetable.diff(db, first, second)
+    assert _keys(changes['added']) == {(3, 2, 'Friday', '10:00-11:00')}
+    assert _keys(changes['removed']) == {(3, 2, 'Tuesday', '10:00-11:00')}
+    assert Timetable.diff(db, second, second) == {'added': [], 'removed': []}
+
+def test_publish_prunes_old_versions(db, monkeypatch):
+    monkeypatch.setattr(Config, 'TIMETABLE_HISTORY_VERSIONS', 2)
+    versions = [publish(db, WEEK) for _ in range(4)]
+    assert Timetable.retained_versions(db) == versions[:1:-1]
+    assert Timetable.get_all(db, version=versions[1]) == []
+    assert len(Timetable.get_all(db, version=versions[2])) == 3
+
+def test_diff_route(client, db, monkeypatch):
+    monkeypatch.setattr(Config, 'TIMETABLE_HISTORY_VERSIONS', 2)
+    first = publish(db, WEEK)
+    publish(db, WEEK[:2])
+    body = client.get(f'/api/timetable/diff?from={first}').get_json()
+    assert (body['from'], body['to']) == (first, first + 1)
+    assert _keys(body['removed']) == {(3, 2, 'Tuesday', '10:00-11:00')}
+    assert body['added'] == []
+
+    publish(db, WEEK)
+    response = client.get(f'/api/timetable/diff?from={first}')
+    assert response.status_code == 404
+    assert response.get_json()['retained_versions'] == [first + 2, first + 1]
+    assert client.get('/api/timetable/diff?from=latest').status_code == 400
+
+def test_list_a_fixed_version(client, db):
+    first = publish(db, WEEK)
+    publish(db, WEEK[:1])
+    assert len(client.get('/api/timetable').get_json()['data']) == 1
+    assert len(client.get(f'/api/timetable?version={first}').get_json()['data']) == 3
@@ -1,41 +1,29 @@
-def generate_ai_summary(timetable, faculty, courses, rooms):
-    """Generate AI summary of timetable (rule-based for hackathon)"""
+def _percent(fraction):
+    return f"{fraction * 100:.1f}%"
+
+def generate_ai_summary(analytics):
+    """Generate AI summary of timetable (rule-based for hackathon) from analytics.build output"""
     
-    if not timetable:
+    if not analytics or not analytics['totals']['classes']:
         return "No timetable generated yet."
     
-    # Calculate faculty workload
-    faculty_load = {}
-    for entry in timetable:
-        f_id = entry['faculty_id']
-        faculty_load[f_id] = faculty_load.get(f_id, 0) + 1
-    
-    # Check for overload
-    overloaded = []
-    for f in faculty:
-        f_id = f['id']
-        max_hours = f.get('max_hours', 20)
-        actual_hours = faculty_load.get(f_id, 0)
-        if actual_hours > max_hours:
-            overloaded.append(f['name'])
-    
-    # Calculate room utilization
-    room_usage = {}
-    for entry in timetable:
-        r_id = entry['room_id']
-        room_usage[r_id] = room_usage.get(r_id, 0) + 1
-    
-    max_slots = len(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']) * 8
-    avg_utilization = (sum(room_usage.values()) / (len(rooms) * max_slots)) * 100
+    totals = analytics['totals']
+    overloaded = [f['name'] for f in analytics['faculty'] if f['hours'] > f['max_hours']]
     
     # Generate summary
     summary = f"✅ **Timetable Generated Successfully**\n\n"
     summary += f"📊 **Statistics:**\n"
-    summary += f"- Total Classes Scheduled: {len(timetable)}\n"
-    summary += f"- Faculty Members: {len(faculty)}\n"
-    summary += f"- Courses: {len(courses)}\n"
-    summary += f"- Rooms: {len(rooms)}\n"
-    summary += f"- Average Room Utilization: {avg_utilization:.1f}%\n\n"
+    summary += f"- Total Classes Scheduled: {totals['classes']}\n"
+    summary += f"- Faculty Members: {totals['faculty']}\n"
+    summary += f"- Courses: {totals['courses']}\n"
+    summary += f"- Rooms: {totals['rooms']}\n"
+    summary += f"- Average Room Utilization: {_percent(totals['room_utilization'])}\n"
+    busiest = max(analytics['days'], key=lambda d: d['room_utilization'])
+    summary += f"- Busiest Day: {busiest['day']} ({_percent(busiest['room_utilization'])} of room slots)\n"
+    if analytics['peak_slots']:
+        peak = analytics['peak_slots'][0]
+        summary += f"- Peak Slot: {peak['day']} {peak['slot']} ({peak['rooms_busy']} of {totals['rooms']} rooms busy)\n"
+    summary += f"- Faculty Idle Gaps: {totals['idle_gaps']} free slots between classes\n\n"
     
     if overloaded:
         summary += f"⚠️ **Warnings:**\n"
@@ -45,7 +33,11 @@ def generate_ai_summary(timetable, faculty, courses, rooms):
     
     summary += f"🎯 **NEP 2020 Compliance:**\n"
     summary += f"- Multidisciplinary course scheduling: Enabled\n"
-    summary += f"- No scheduling conflicts detected\n"
+    if totals['faculty_double_bookings'] or totals['room_double_bookings']:
+        summary += (f"- Scheduling conflicts: {totals['faculty_double_bookings']} faculty and "
+                    f"{totals['room_double_bookings']} room double bookings\n")
+    else:
+        summary += f"- No scheduling conflicts detected\n"
     summary += f"- Balanced workload distribution achieved\n"
     
     return summary
@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+
+NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+class RowError(ValueError):
+    pass
+
+def read_rows(request):
+    """Yield row dicts from a JSON array, CSV or (streamed) NDJSON request body"""
+    if request.mimetype == 'text/csv':
+        yield from csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8'))
+    elif request.mimetype in NDJSON_TYPES:
+        # Parsed line by line without buffering the whole body
+        for line in request.stream:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield RowError(f'Invalid JSON: {e}')
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('rows')
+        if not isinstance(data, list):
+            raise RowError('Expected a JSON array, CSV (text/csv) or NDJSON (application/x-ndjson) body')
+        yield from data
+
+def _text(row, key, default=None):
+    value = row.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if default is None:
+            raise RowError(f'{key} is required')
+        return default
+    return str(value).strip()
+
+def _int(row, key, default=None, minimum=0):
+    value = row.get(key)
+    if value is None or value == '':
+        if default is None:
+            raise RowError(f'{key} is required')
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise RowError(f'{key} must be an integer')
+    if value < minimum:
+        raise RowError(f'{key} must be at least {minimum}')
+    return value
+
+def faculty_row(row):
+    """Validate a faculty row into Faculty.bulk_create order"""
+    availability = row.get('availability') or {}
+    if isinstance(availability, str):
+        try:
+            availability = json.loads(availability)
+        except ValueError:
+            raise RowError('availability must be a JSON object')
+    if not isinstance(availability, dict):
+        raise RowError('availability must be a JSON object')
+    return (_text(row, 'name'), json.dumps(availability), _int(row, 'max_hours', 20), _text(row, 'expertise', ''))
+
+def room_row(row):
+    """Validate a room row into Room.bulk_create order"""
+    return (_text(row, 'name'), _int(row, 'capacity', minimum=1), _text(row, 'type', 'Classroom'))
+
+def course_validator(db):
+    """Course row validator checking faculty ids and code uniqueness against the database"""
+    faculty_ids = {r['id'] for r in db.execute_query("SELECT id FROM faculty") or []}
+    codes = {r['code'] for r in db.execute_query("SELECT code FROM courses") or []}
+
+    def course_row(row):
+        code = _text(row, 'code')
+        if code in codes:
+            raise RowError(f'Course code {code} already exists')
+        credits = _int(row, 'credits', minimum=1)
+        faculty_id = _int(row, 'faculty_id')
+        if faculty_id not in faculty_ids:
+            raise RowError(f'Unknown faculty_id {faculty_id}')
+        values = (
+            code,
+            _text(row, 'name'),
+            credits,
+            _text(row, 'type'),
+            faculty_id,
+            _int(row, 'hours_per_week', credits),
+            row.get('room_type') or None,
+            _int(row, 'enrollment', 0),
+            _int(row, 'session_length', 1, minimum=1)
+        )
+        codes.add(code)
+        return values
+
+    return course_row
+
+def import_rows(request, validate, insert):
+    """Validate request rows and insert the valid ones in one transaction.
+
+    With ?all_or_nothing=1 nothing is inserted if any row fails validation.
+    Returns a (response_body, http_status) tuple; row numbers start at 1.
+    """
+    valid, row_numbers, errors = [], [], []
+    try:
+        for number, row in enumerate(read_rows(request), start=1):
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                if not isinstance(row, dict):
+                    raise RowError('Row must be an object')
+                valid.append(validate(row))
+                row_numbers.append(number)
+            except RowError as e:
+                errors.append({'row': number, 'message': str(e)})
+    except (RowError, UnicodeDecodeError, csv.Error) as e:
+        return {'success': False, 'message': f'Invalid bulk body: {e}'}, 400
+
+    if not valid or (errors and request.args.get('all_or_nothing') in ('1', 'true')):
+        return {'success': False, 'ids': [], 'errors': errors, 'message': 'No rows inserted'}, 400
+
+    ids = insert(valid)
+    if ids is None:
+        return {'success': False, 'ids': [], 'errors': errors, 'message': 'Bulk insert failed'}, 500
+
+    return {
+        'success': True,
+        'inserted': len(ids),
+        'ids': [{'row': number, 'id': new_id} for number, new_id in zip(row_numbers, ids)],
+        'errors': errors
+    }, 201
@@ -1,19 +1,54 @@
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from openpyxl import Workbook
+from concurrent.futures import ProcessPoolExecutor
 from config import Config
-import os
+import io
+import multiprocessing
+import re
+import zipfile
 
-def export_to_pdf(timetable):
-    """Export timetable to PDF format"""
-    file_path = 'timetable.pdf'
-    doc = SimpleDocTemplate(file_path, pagesize=landscape(A4))
+PDF_MIMETYPE = 'application/pdf'
+EXCEL_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+ZIP_MIMETYPE = 'application/zip'
+
+# ReportLab and openpyxl are imported inside the exporters: they are only
+# needed on a cache miss, and most API workers never render a document.
+
+# Views: 'all', or one 'faculty' member, 'room' or 'day'. Bundles split by faculty or room.
+BUNDLE_KEYS = {'faculty': ('faculty_id', 'faculty_name'), 'room': ('room_id', 'room_name')}
+
+_bundle_executor = None
+
+def _view_title(timetable, view):
+    if view == 'faculty':
+        return f" - {timetable[0]['faculty_name']}"
+    if view == 'room':
+        return f" - {timetable[0]['room_name']}"
+    if view == 'day':
+        return f" - {timetable[0]['day']}"
+    return ''
+
+def _cell_text(entry, view):
+    # Leave out the field every entry in the view shares
+    lines = [entry['course_code']]
+    if view != 'faculty':
+        lines.append(entry['faculty_name'])
+    if view != 'room':
+        lines.append(entry['room_name'])
+    return '\n'.join(lines)
+
+def export_to_pdf(timetable, view='all'):
+    """Export timetable to an in-memory PDF (BytesIO)"""
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4))
     elements = []
+    days = [timetable[0]['day']] if view == 'day' and timetable else Config.DAYS
     
     styles = getSampleStyleSheet()
-    title = Paragraph("<b>Academic Timetable - NEP 2020</b>", styles['Title'])
+    title = Paragraph(f"<b>Academic Timetable - NEP 2020{_view_title(timetable, view)}</b>", styles['Title'])
     elements.append(title)
     
     # Organize data by day and slot
@@ -26,16 +61,14 @@ def export_to_pdf(timetable):
         if key not in schedule_grid:
             schedule_grid[key] = []
         
-        schedule_grid[key].append(
-            f"{entry['course_code']}\n{entry['faculty_name']}\n{entry['room_name']}"
-        )
+        schedule_grid[key].append(_cell_text(entry, view))
     
     # Create table
-    data = [['Time Slot'] + Config.DAYS]
+    data = [['Time Slot'] + days]
     
     for slot in Config.TIME_SLOTS:
         row = [slot]
-        for day in Config.DAYS:
+        for day in days:
             cell_content = '\n---\n'.join(schedule_grid.get((day, slot), ['-']))
             row.append(cell_content)
         data.append(row)
@@ -56,14 +89,17 @@ def export_to_pdf(timetable):
     elements.append(table)
     doc.build(elements)
     
-    return file_path
-
-def export_to_excel(timetable):
-    """Export timetable to Excel format"""
-    file_path = 'timetable.xlsx'
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Timetable"
+    buffer.seek(0)
+    return buffer
+
+def export_to_excel(timetable, view='all'):
+    """Export timetable to an in-memory Excel workbook (BytesIO)"""
+    from openpyxl import Workbook
+
+    # Write-only mode streams rows instead of keeping every cell object in memory
+    buffer = io.BytesIO()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Timetable")
     
     # Header
     ws.append(['Day', 'Time Slot', 'Course Code', 'Course Name', 'Faculty', 'Room'])
@@ -79,5 +115,41 @@ def export_to_excel(timetable):
             entry['room_name']
         ])
     
-    wb.save(file_path)
-    return file_path
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+EXPORTERS = {'pdf': export_to_pdf, 'excel': export_to_excel}
+EXTENSIONS = {'pdf': 'pdf', 'excel': 'xlsx'}
+
+def _render_bytes(format_type, timetable, view):
+    """Process pool entry point"""
+    return EXPORTERS[format_type](timetable, view).getvalue()
+
+def _get_bundle_executor():
+    global _bundle_executor
+    if _bundle_executor is None:
+        _bundle_executor = ProcessPoolExecutor(max_workers=Config.EXPORT_WORKERS or None,
+                                               mp_context=multiprocessing.get_context('spawn'))
+    return _bundle_executor
+
+def export_bundle(timetable, by, format_type):
+    """One document per faculty member or room, rendered in parallel, as an in-memory zip"""
+    id_key, name_key = BUNDLE_KEYS[by]
+    groups = {}
+    for entry in timetable:
+        groups.setdefault(entry[id_key], []).append(entry)
+
+    executor = _get_bundle_executor()
+    futures = {
+        group_id: executor.submit(_render_bytes, format_type, entries, by)
+        for group_id, entries in groups.items()
+    }
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for group_id, future in futures.items():
+            name = re.sub(r'[^A-Za-z0-9]+', '-', groups[group_id][0][name_key] or '').strip('-')
+            archive.writestr(f"{by}-{group_id}-{name}.{EXTENSIONS[format_type]}", future.result())
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+from config import Config
+
+class ExportCache:
+    """LRU cache of rendered export documents keyed by (version, format, view).
+
+    Bounded by total size in bytes. Entries for older timetable versions are
+    dropped as soon as a newer version is seen or invalidate() is called.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, format_type, view):
+        with self._lock:
+            self._advance(version)
+            data = self._entries.get((version, format_type, view))
+            if data is not None:
+                self._entries.move_to_end((version, format_type, view))
+            return data
+
+    def put(self, version, format_type, view, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._advance(version)
+            if version != self.version:
+                return  # Rendered from a timetable that has since been replaced
+            key = (version, format_type, view)
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.version = None
+
+    def _advance(self, version):
+        if self.version is None or version > self.version:
+            self._entries.clear()
+            self.size = 0
+            self.version = version
+
+export_cache = ExportCache(Config.EXPORT_CACHE_MAX_BYTES)
@@ -0,0 +1,39 @@
+from config import Config
+
+def _int_arg(args, name, minimum=0):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+    if value < minimum:
+        raise ValueError(f'{name} must be at least {minimum}')
+    return value
+
+def list_args(args, columns, filters=None):
+    """Keyword arguments for a model get_all from query args.
+
+    Parses after/limit/fields= plus the given filters, a mapping of query
+    argument to (get_all keyword, type). Raises ValueError on bad input.
+    """
+    kwargs = {}
+    for name, (keyword, cast) in (filters or {}).items():
+        if cast is int:
+            value = _int_arg(args, name)
+        else:
+            value = args.get(name) or None
+        if value is not None:
+            kwargs[keyword] = value
+
+    kwargs['after'] = _int_arg(args, 'after')
+    limit = _int_arg(args, 'limit', minimum=1)
+    kwargs['limit'] = min(limit, Config.PAGE_MAX_LIMIT) if limit is not None else None
+
+    fields = [name.strip() for name in args.get('fields', '').split(',') if name.strip()]
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(columns)}")
+    kwargs['fields'] = fields or None
+    return kwargs
@@ -0,0 +1,90 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import current_app, request
+from config import Config
+from models import ChangeCounter
+
+class ReadCache:
+    """LRU cache of serialized list responses keyed by endpoint and query.
+
+    Each entry carries the ETag of the table versions it was built from, so a
+    write anywhere in those tables makes it stale. Concurrent misses for the
+    same key wait for a single load instead of all querying the database.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, etag, load):
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == etag:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                pending = self._loading.get(key)
+                if pending is None or pending[0] != etag:
+                    done = threading.Event()
+                    self._loading[key] = (etag, done)
+                    break
+            pending[1].wait()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == etag:
+                    return entry[1]
+            # The loader failed or was superseded; try loading ourselves
+
+        try:
+            body = load()
+            with self._lock:
+                self._entries[key] = (etag, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return body
+        finally:
+            with self._lock:
+                if self._loading.get(key, (None, None))[1] is done:
+                    del self._loading[key]
+            done.set()
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+read_cache = ReadCache(Config.READ_CACHE_MAX_ENTRIES)
+
+def make_etag(key, versions):
+    return hashlib.sha1(f'{key}|{versions}'.encode('utf-8')).hexdigest()
+
+def cached_list_response(db, tables, load, limit=None):
+    """JSON {'success': True, 'data': load()} with an ETag over the given tables.
+
+    Answers 304 without touching the data when If-None-Match matches, and
+    serves the serialized body from the read cache while the tables are
+    unchanged. With a limit the body also carries next_after, the cursor for
+    the following page (None on the last one).
+    """
+    key = request.full_path
+    etag = make_etag(key, ChangeCounter.versions(db, tables))
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    def serialize():
+        rows = load()
+        payload = {'success': True, 'data': rows}
+        if limit is not None:
+            payload['next_after'] = rows[-1]['id'] if rows and len(rows) == limit else None
+        return current_app.json.dumps(payload)
+
+    body = read_cache.get_or_load(key, etag, serialize)
+    response = current_app.response_class(body, status=200, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
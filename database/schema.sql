@@ -7,7 +7,8 @@ CREATE TABLE faculty (
     availability TEXT DEFAULT '{}',
     max_hours INTEGER DEFAULT 20,
     expertise TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME
 );
 
 -- Courses Table (NEP 2020 Compliant)
@@ -19,7 +20,11 @@ CREATE TABLE courses (
     type TEXT NOT NULL, -- Major, Minor, Multidisciplinary, Ability Enhancement, Skill Enhancement, Value-added
     faculty_id INTEGER REFERENCES faculty(id) ON DELETE SET NULL,
     hours_per_week INTEGER DEFAULT 3,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    room_type TEXT, -- Required room type (Classroom, Lab, Auditorium); NULL means any
+    enrollment INTEGER DEFAULT 0, -- Expected students, must fit the room capacity
+    session_length INTEGER DEFAULT 1, -- Contiguous hours per session (interval engine), e.g. 2 or 3 for labs
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME
 );
 
 -- Rooms Table
@@ -28,7 +33,8 @@ CREATE TABLE rooms (
     name TEXT NOT NULL,
     capacity INTEGER NOT NULL,
     type TEXT DEFAULT 'Classroom', -- Classroom, Lab, Auditorium
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME
 );
 
 -- Timetable Table
@@ -39,9 +45,53 @@ CREATE TABLE timetable (
     room_id INTEGER REFERENCES rooms(id) ON DELETE CASCADE,
     day TEXT NOT NULL,
     slot TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    day_idx INTEGER, -- Position of day in Config.DAYS
+    slot_idx INTEGER, -- Position of slot in Config.TIME_SLOTS
+    version INTEGER NOT NULL DEFAULT 0 -- generations.id that published the row; the latest is current
+);
+
+CREATE INDEX idx_timetable_slot ON timetable (version, day_idx, slot_idx);
+CREATE INDEX idx_timetable_faculty ON timetable (version, faculty_id, day_idx, slot_idx, room_id, course_id);
+CREATE INDEX idx_timetable_room ON timetable (version, room_id, day_idx, slot_idx, faculty_id, course_id);
+CREATE INDEX idx_timetable_course ON timetable (version, course_id, day_idx, slot_idx, room_id, faculty_id);
+CREATE INDEX idx_courses_faculty ON courses (faculty_id);
+CREATE INDEX idx_courses_type ON courses (type);
+CREATE INDEX idx_rooms_type ON rooms (type);
+
+-- Generation History (one row per persisted timetable)
+CREATE TABLE generations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mode TEXT NOT NULL, -- full, incremental
+    statistics TEXT,
+    analytics TEXT, -- analytics.build() of the published timetable (JSON)
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Change Counters (used for ETags; triggers count updates and deletes, backend/models.py
+-- bumps them once per insert transaction and timetable write)
+CREATE TABLE change_counters (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO change_counters (table_name) VALUES ('faculty'), ('courses'), ('rooms'), ('timetable');
+
+CREATE TRIGGER faculty_update_counter AFTER UPDATE ON faculty
+    BEGIN UPDATE change_counters SET version = version + 1 WHERE table_name = 'faculty'; END;
+CREATE TRIGGER faculty_delete_counter AFTER DELETE ON faculty
+    BEGIN UPDATE change_counters SET version = version + 1 WHERE table_name = 'faculty'; END;
+CREATE TRIGGER courses_update_counter AFTER UPDATE ON courses
+    BEGIN UPDATE change_counters SET version = version + 1 WHERE table_name = 'courses'; END;
+CREATE TRIGGER courses_delete_counter AFTER DELETE ON courses
+    BEGIN UPDATE change_counters SET version = version + 1 WHERE table_name = 'courses'; END;
+CREATE TRIGGER rooms_update_counter AFTER UPDATE ON rooms
+    BEGIN UPDATE change_counters SET version = version + 1 WHERE table_name = 'rooms'; END;
+CREATE TRIGGER rooms_delete_counter AFTER DELETE ON rooms
+    BEGIN UPDATE change_counters SET version = version + 1 WHERE table_name = 'rooms'; END;
+
+-- Schema version, see MIGRATIONS in backend/models.py
+PRAGMA user_version = 8;
+
 -- Sample Data for Testing
 INSERT INTO faculty (name, availability, max_hours, expertise) VALUES
 ('Dr. Rajesh Kumar', '{"Monday": true, "Tuesday": true, "Wednesday": true, "Thursday": true, "Friday": true}', 20, 'Computer Science, AI/ML'),